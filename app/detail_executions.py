@@ -1,150 +1,455 @@
-from datetime import datetime
-from functools import lru_cache, partial
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from functools import partial
 
+from loguru import logger as log
 from manager import StepFunctionManager
 from new_run import NewRunViewer
-from nicegui import ui
+from nicegui import background_tasks, ui
 from show_input import InputViewer
 from utils.app_storage import (
     get_selected_step_function_config_name,
 )
+from utils.async_aws_manager import async_aws_manager
 from utils.aws_manager import aws_manager
 from utils.config_loader import SFC
-from utils.date_utils import format_duration
+from utils.date_utils import format_duration, format_seconds, format_size
+from utils.execution_history import TERMINAL_STATUSES
+from utils.execution_poller import ExecutionSnapshot, execution_poller
+from utils.map_runs import MAP_RUN_COUNT_STATUSES, aggregate_counts, get_map_run_label
+from utils.metrics import timed
 from utils.nicegui_utils import show_notification
+from utils.state_timeline import StateTiming, render_gantt
+
+FILES_BUCKET = "wf-nlp-tasks"
+CHILD_EXECUTIONS_PAGE_SIZE = 100
 
 
 class ExecutionViewer(StepFunctionManager):
     def __init__(self, execution_id: str):
         super().__init__()
         self.execution_id = execution_id
-        self.execution_arn = aws_manager.get_execution_arn(self.step_function_name, self.execution_id)
+        self.execution_arn = aws_manager.get_execution_arn(self.step_function_arn_selected, self.execution_id)
         self.step_function_config_name = get_selected_step_function_config_name()
 
         # Initialize with empty values
+        self.snapshot = None
         self.execution_details = None
-        self.definition = None
+        self.graph = None
         self.states_status = None
+        self.state_timings = ()
         self.mermaid_graph = None
         self.status = None
         self.files = []
+        self.files_loading = False
+        self.files_task = None
+        self.files_grid = None
+        self.map_runs = []
+        self.map_runs_loading = False
+        self.map_runs_task = None
+        self.selected_map_run = None
+        self.child_executions = {}  # status filter -> (rows, whether more are listed)
+        self.child_status = None
 
     async def initialize(self):
         """Async initialization of data"""
-        self.execution_details = self.get_execution_details()
-        self.definition, self.states_status = self.get_states_info()
+        self.snapshot = await execution_poller.get_snapshot(self.execution_arn)
+        self.execution_details = self.snapshot.details
+        self.status = self.snapshot.status
+        self.graph, self.states_status = self.snapshot.graph, self.snapshot.states_status
+        self.state_timings = self.snapshot.state_timings
         self.mermaid_graph = self.create_mermaid_graph()
-        self.status = self.execution_details.get("status")
-        self.files = self.list_created_files()
-
-    @lru_cache(maxsize=128)
-    def get_execution_details(self):
-        return aws_manager.get_execution_details(self.execution_arn)
 
-    def _abort_step_function(self):
-        return aws_manager.stop_execution(self.execution_arn)
+    async def _abort_step_function(self):
+        response = await async_aws_manager.stop_execution(self.execution_arn)
+        execution_poller.invalidate(self.execution_arn)
+        return response
 
-    def _redrive_step_function(self):
-        return aws_manager.redrive_execution(self.execution_arn)
+    async def _redrive_step_function(self):
+        # Polls stopped at the terminal status: the invalidated snapshot makes them resume
+        response = await async_aws_manager.redrive_execution(self.execution_arn)
+        execution_poller.invalidate(self.execution_arn)
+        return response
 
-    @lru_cache(maxsize=128)
     def create_mermaid_graph(self):
-        mermaid_graph = [
-            "graph TD",
-            "    %% Graph configuration",
-            "    classDef default fill:#f9f9f9,stroke:#333,stroke-width:2px;",
-            "    classDef running fill:#fff7e6,stroke:#ffab00,stroke-width:2px;",
-            "    classDef completed fill:#e6f4ea,stroke:#34a853,stroke-width:2px;",
-            "    classDef failed fill:#fce8e6,stroke:#ea4335,stroke-width:2px;",
-            "    classDef notStarted fill:#f8f9fa,stroke:#dadce0,stroke-width:2px;",
-            "    classDef aborted fill:#e0e0e0,stroke:#666666,stroke-width:2px;",
-        ]
+        return self.graph.render(self.states_status, self.status)
+
+    def create_gantt_chart(self):
+        """Render the state timings, with the states still open ending now or when the execution stopped"""
+        end = self.execution_details.get("stopDate") or datetime.now(UTC)
+        return render_gantt(self.state_timings, end)
+
+    @staticmethod
+    def timing_row(timing: StateTiming) -> dict:
+        last_failure = timing.failures[-1] if timing.failures else None
+        return {
+            "name": timing.name,
+            "type": timing.state_type,
+            "status": timing.status,
+            "entered": timing.entered_at.strftime("%H:%M:%S"),
+            "exited": timing.exited_at.strftime("%H:%M:%S") if timing.exited_at else "-",
+            "duration": format_seconds(timing.duration),
+            "entries": timing.entries,
+            "retries": timing.retries,
+            "failures": f"{len(timing.failures)}: {last_failure.error or last_failure.event_type}" if last_failure else "-",
+        }
 
-        states = self.definition["States"]
+    def list_created_files(self):
+        """Iterate over the pages of generated files; listings of terminal executions are cached"""
+        return async_aws_manager.iter_s3_object_pages(
+            FILES_BUCKET,
+            SFC.get_files_prefix(self.step_function_config_name, self.execution_id),
+            terminal_execution_arn=self.execution_arn if self.status in TERMINAL_STATUSES else None,
+        )
 
-        # Define status to class mapping
-        status_class_map = {
-            "NOT_STARTED": "notStarted",
-            "RUNNING": "running",
-            "COMPLETED": "completed",
-            "FAILED": "failed",
-            "ABORTED": "aborted",
+    @staticmethod
+    def map_run_row(label: str, map_run: dict) -> dict:
+        execution_counts = map_run["executionCounts"]
+        start_date = map_run.get("startDate")
+        return {
+            "arn": map_run.get("mapRunArn", label),
+            "label": label,
+            "status": map_run.get("status", "-"),
+            "started": start_date.strftime("%Y-%m-%d %H:%M:%S") if start_date else "-",
+            "duration": format_duration(start_date, map_run.get("stopDate") or datetime.now(UTC)),
+            "items": map_run["itemCounts"]["total"],
+            **{key: execution_counts[key] for key in MAP_RUN_COUNT_STATUSES},
         }
 
-        # Helper function to create node ID
-        def create_node_id(state_name):
-            return state_name.replace(" ", "_").replace("-", "_").replace(")", "").replace("(", "")
-
-        # Helper function to create node class
-        def get_node_class(state_name):
-            status = self.states_status.get(state_name, "NOT_STARTED")
-            return status_class_map.get(status, "notStarted")
+    @staticmethod
+    def child_execution_row(execution: dict) -> dict:
+        return {
+            "arn": execution["executionArn"],
+            "name": execution["name"],
+            "status": execution["status"],
+            "started": execution["startDate"].strftime("%Y-%m-%d %H:%M:%S"),
+            "duration": format_duration(execution["startDate"], execution.get("stopDate") or datetime.now(UTC)),
+            "url": aws_manager.get_execution_url(execution["executionArn"]),
+        }
 
-        # Process each state
-        for state_name, state_data in states.items():
-            node_id = create_node_id(state_name)
-            node_class = get_node_class(state_name)
+    @staticmethod
+    def file_row(file: dict) -> dict:
+        return {
+            "key": file["Key"],
+            "name": "/".join(file["Key"].split("/")[2:]),
+            "size": format_size(file["Size"]),
+            "modifiedAt": file["LastModified"].isoformat(),
+            "modified": file["LastModified"].strftime("%Y-%m-%d %H:%M:%S"),
+            "download": '<i class="material-icons">download</i>',
+        }
 
-            if self.get_execution_details().get("status") in ["TIMED_OUT", "ABORTED"] and node_class in ["running"]:
-                node_class = "aborted"
+    async def _download_file(self, file):
+        link = await async_aws_manager.get_presigned_url(FILES_BUCKET, file)
 
-            # Add state type indicator to the label
-            label = f"{state_name}"
+        ui.download(link)
 
-            if state_data["Type"] == "Choice":
-                # Diamond shape for Choice states
-                mermaid_graph.append(f'    {node_id}{{"{label}"}}:::{node_class}')
-            else:
-                # Rounded rectangle for all other states
-                mermaid_graph.append(f'    {node_id}("{label}"):::{node_class}')
-
-            # Handle transitions
-            if state_data["Type"] == "Choice":
-                if "Choices" in state_data:
-                    for _idx, choice in enumerate(state_data["Choices"]):
-                        if "Next" in choice:
-                            next_id = create_node_id(choice["Next"])
-                            # Add condition label to choice transitions
-                            mermaid_graph.append(f"    {node_id} --> {next_id}")
-
-                if "Default" in state_data:
-                    default_id = create_node_id(state_data["Default"])
-                    mermaid_graph.append(f"    {node_id} --> {default_id}")
-
-            if "Next" in state_data:
-                next_id = create_node_id(state_data["Next"])
-                mermaid_graph.append(f"    {node_id} --> {next_id}")
-
-        # Add some styling configurations
-        mermaid_graph.insert(1, "    %% Node and edge styling")
-        mermaid_graph.insert(2, "    linkStyle default stroke:#333,stroke-width:2px;")
-
-        return "\n".join(mermaid_graph)
-
-    @lru_cache(maxsize=128)
-    def get_states_info(self):
-        """
-        Gets step function definition and states status with minimal API calls.
-        Returns step function definition and current status of all states.
-        """
-
-        return aws_manager.get_states_info(
-            self.execution_details["stateMachineArn"],
-            self.execution_details["executionArn"],
+    @ui.refreshable
+    def graph_panel(self):
+        self.mermaid_graph = self.create_mermaid_graph()
+        ui.mermaid(self.mermaid_graph).classes("w-full flex justify-center")
+
+    @ui.refreshable
+    def state_timeline(self):
+        if not self.state_timings:
+            ui.label("No state entered yet").classes("text-gray-600")
+            return
+
+        ui.mermaid(self.create_gantt_chart()).classes("w-full")
+        ui.table(
+            columns=[
+                {"name": "name", "label": "State", "field": "name", "align": "left", "sortable": True},
+                {"name": "type", "label": "Type", "field": "type", "align": "left"},
+                {"name": "status", "label": "Status", "field": "status", "align": "left"},
+                {"name": "entered", "label": "Entered", "field": "entered"},
+                {"name": "exited", "label": "Exited", "field": "exited"},
+                {"name": "duration", "label": "Duration", "field": "duration"},
+                {"name": "entries", "label": "Entries", "field": "entries", "sortable": True},
+                {"name": "retries", "label": "Retries", "field": "retries", "sortable": True},
+                {"name": "failures", "label": "Failures", "field": "failures", "align": "left"},
+            ],
+            rows=[self.timing_row(timing) for timing in self.state_timings],
+            row_key="name",
+            pagination=0,
+        ).props("dense flat").classes("w-full")
+
+    @ui.refreshable
+    def map_runs_panel(self):
+        with ui.row().classes("w-full items-center"):
+            ui.label(f"{len(self.map_runs)} map runs").classes("text-sm text-gray-700")
+            if self.map_runs_loading:
+                ui.spinner(size="sm")
+            ui.space()
+            ui.button(icon="refresh", on_click=self.reload_map_runs).props("flat dense")
+
+        if not self.map_runs:
+            if not self.map_runs_loading:
+                ui.label(f"No map run started yet by {', '.join(self.graph.distributed_maps)}").classes("text-gray-600")
+            return
+
+        rows = [self.map_run_row(get_map_run_label(map_run["mapRunArn"]), map_run) for map_run in self.map_runs]
+        if len(self.map_runs) > 1:
+            rows.append(
+                self.map_run_row(
+                    "All map runs",
+                    {
+                        "itemCounts": aggregate_counts(self.map_runs, "itemCounts"),
+                        "executionCounts": aggregate_counts(self.map_runs),
+                    },
+                )
+            )
+        count_columns = [
+            {"name": key, "label": key[0].upper() + key[1:], "field": key, "sortable": True}
+            for key in MAP_RUN_COUNT_STATUSES
+        ]
+        map_runs_table = (
+            ui.table(
+                columns=[
+                    {"name": "label", "label": "Map Run", "field": "label", "align": "left"},
+                    {"name": "status", "label": "Status", "field": "status", "align": "left"},
+                    {"name": "started", "label": "Started", "field": "started"},
+                    {"name": "duration", "label": "Duration", "field": "duration"},
+                    {"name": "items", "label": "Items", "field": "items"},
+                    *count_columns,
+                ],
+                rows=rows,
+                row_key="arn",
+                pagination=0,
+            )
+            .props("dense flat")
+            .classes("w-full cursor-pointer")
         )
-
-    @lru_cache(maxsize=128)
-    def list_created_files(self):
-        return aws_manager.list_s3_objects(
-            "wf-nlp-tasks",
-            SFC.get_files_prefix(self.step_function_config_name, self.execution_id),
+        map_runs_table.on("rowClick", self.handle_map_run_click)
+        self.child_executions_panel()
+
+    async def handle_map_run_click(self, event):
+        map_run_arn = event.args[1]["arn"]
+        if any(map_run["mapRunArn"] == map_run_arn for map_run in self.map_runs):
+            self.selected_map_run = map_run_arn
+            await self.load_child_executions()
+
+    @ui.refreshable
+    def child_executions_panel(self):
+        map_run = next((map_run for map_run in self.map_runs if map_run["mapRunArn"] == self.selected_map_run), None)
+        if map_run is None:
+            ui.label("Select a map run to list its child executions").classes("text-sm text-gray-600")
+            return
+
+        ui.label(f"Child executions of {get_map_run_label(map_run['mapRunArn'])}").classes("font-bold")
+        if not self.child_executions:
+            ui.spinner(size="sm")
+            return
+
+        ui.toggle(
+            {
+                status: f"{status.replace('_', ' ').capitalize()} ({map_run['executionCounts'][key]})"
+                for key, status in MAP_RUN_COUNT_STATUSES.items()
+                if status in self.child_executions
+            },
+            value=self.child_status,
+            on_change=lambda event: self.select_child_status(event.value),
+        ).props("dense no-caps")
+
+        rows, has_more = self.child_executions.get(self.child_status, ([], False))
+        children_table = (
+            ui.table(
+                columns=[
+                    {"name": "name", "label": "Name", "field": "name", "align": "left"},
+                    {"name": "status", "label": "Status", "field": "status", "align": "left"},
+                    {"name": "started", "label": "Started", "field": "started"},
+                    {"name": "duration", "label": "Duration", "field": "duration"},
+                ],
+                rows=rows,
+                row_key="arn",
+                pagination=0,
+            )
+            .props("dense flat virtual-scroll")
+            .classes("w-full max-h-[400px] cursor-pointer")
+        )
+        children_table.on("rowClick", lambda event: ui.navigate.to(event.args[1]["url"], new_tab=True))
+        if has_more:
+            ui.button("Load more", on_click=self.load_more_child_executions).props("flat dense no-caps")
+
+    def select_child_status(self, status):
+        self.child_status = status
+        self.child_executions_panel.refresh()
+
+    async def load_child_executions(self):
+        """List the first child executions of every status the selected map run has children in, concurrently"""
+        map_run = next(map_run for map_run in self.map_runs if map_run["mapRunArn"] == self.selected_map_run)
+        status_filters = [
+            status for key, status in MAP_RUN_COUNT_STATUSES.items() if status and map_run["executionCounts"][key]
+        ]
+        self.child_executions = {}
+        self.child_executions_panel.refresh()
+        try:
+            slices = await async_aws_manager.list_map_run_executions_per_status(
+                self.selected_map_run, status_filters, CHILD_EXECUTIONS_PAGE_SIZE
+            )
+        except Exception as e:
+            error_msg = f"Error listing the child executions of {self.selected_map_run}: {e!s}"
+            log.error(error_msg)
+            return
+
+        self.child_executions = {
+            status: ([self.child_execution_row(execution) for execution in executions], has_more)
+            for status, (executions, has_more) in slices.items()
+        }
+        if self.child_status not in self.child_executions:
+            # Failed children are what a map run is usually inspected for
+            self.child_status = "FAILED" if "FAILED" in self.child_executions else next(iter(self.child_executions), None)
+        self.child_executions_panel.refresh()
+
+    async def load_more_child_executions(self):
+        rows, _ = self.child_executions[self.child_status]
+        try:
+            executions, has_more = await async_aws_manager.list_map_run_executions(
+                self.selected_map_run, len(rows), CHILD_EXECUTIONS_PAGE_SIZE, self.child_status
+            )
+        except Exception as e:
+            error_msg = f"Error listing the child executions of {self.selected_map_run}: {e!s}"
+            log.error(error_msg)
+            return
+
+        self.child_executions[self.child_status] = (
+            rows + [self.child_execution_row(execution) for execution in executions],
+            has_more,
+        )
+        self.child_executions_panel.refresh()
+
+    async def load_map_runs(self):
+        """Describe the map runs of the execution, then list again the child executions whose counts changed"""
+        previous_counts = {map_run["mapRunArn"]: map_run["executionCounts"] for map_run in self.map_runs}
+        self.map_runs_loading = True
+        self.map_runs_panel.refresh()
+        try:
+            self.map_runs = await async_aws_manager.get_map_runs(self.execution_arn)
+        except Exception as e:
+            error_msg = f"Error listing the map runs of {self.execution_arn}: {e!s}"
+            log.error(error_msg)
+        finally:
+            self.map_runs_loading = False
+            self.map_runs_panel.refresh()
+
+        selected = next((map_run for map_run in self.map_runs if map_run["mapRunArn"] == self.selected_map_run), None)
+        if selected and selected["executionCounts"] != previous_counts.get(self.selected_map_run):
+            await self.load_child_executions()
+
+    def reload_map_runs(self):
+        if self.map_runs_task:
+            self.map_runs_task.cancel()
+        self.map_runs_task = background_tasks.create(self.load_map_runs(), name=f"map runs {self.execution_id}")
+
+    def handle_transition_tab_change(self, event):
+        # Map runs are only listed once their tab is opened
+        if event.value == "Map Runs" and self.map_runs_task is None:
+            self.reload_map_runs()
+
+    def state_transitions_card(self):
+        """Create the card of the state transitions, as a graph, a timeline and the Distributed Map runs"""
+        with ui.card().classes("n-card flex-1 h-full"):
+            with ui.row().classes("w-full items-center mb-4"):
+                ui.label("State Transitions").classes("text-xl font-bold")
+                ui.space()
+                with ui.tabs().props("dense no-caps") as transition_tabs:
+                    graph_tab = ui.tab("Graph")
+                    timeline_tab = ui.tab("Timeline")
+                    if self.graph.distributed_maps:
+                        map_runs_tab = ui.tab("Map Runs")
+            with ui.tab_panels(transition_tabs, value=graph_tab, on_change=self.handle_transition_tab_change).classes(
+                "w-full h-full -mt-4"
+            ):
+                with ui.tab_panel(graph_tab).classes("p-0"):
+                    with ui.scroll_area().classes("w-full h-full flex items-center justify-center"):
+                        self.graph_panel()
+                with ui.tab_panel(timeline_tab).classes("p-0"):
+                    self.state_timeline()
+                if self.graph.distributed_maps:
+                    with ui.tab_panel(map_runs_tab).classes("p-0"):
+                        self.map_runs_panel()
+
+    @ui.refreshable
+    def files_summary(self):
+        if self.files_loading:
+            with ui.row().classes("items-center gap-2"):
+                ui.spinner(size="sm")
+                ui.label(f"{len(self.files)} files, loading...").classes("text-sm text-gray-700")
+        elif not self.files:
+            ui.label().classes("text-sm text-gray-700 flex items-center gap-2").add_slot(
+                "default",
+                '<i class="material-icons">warning</i> Any files generated',
+            )
+        else:
+            ui.label(f"{len(self.files)} files").classes("text-sm text-gray-700")
+
+    def generated_files(self):
+        """Create the table of generated files, filled by stream_files"""
+        self.files_summary()
+        self.files_grid = ui.aggrid(
+            {
+                "columnDefs": [
+                    {"headerName": "File", "field": "name", "flex": 4},
+                    {"headerName": "Size", "field": "size", "flex": 1},
+                    {"headerName": "Modified", "field": "modified", "flex": 2},
+                    {"field": "modifiedAt", "hide": True, "sort": "desc"},
+                    {"headerName": "", "field": "download", "width": 60, "cellClass": "cursor-pointer"},
+                ],
+                "rowData": [],
+                ":getRowId": "(params) => params.data.key",
+                "suppressCellFocus": True,
+            },
+            html_columns=[4],
+            auto_size_columns=False,
+        ).classes("w-full h-[300px]")
+        self.files_grid.on("cellClicked", self.handle_file_cell_clicked)
+
+    async def handle_file_cell_clicked(self, event):
+        if event.args.get("colId") == "download":
+            await self._download_file(event.args["data"]["key"])
+
+    async def stream_files(self):
+        """Append each page of generated files to the table as soon as it is fetched"""
+        self.files = []
+        self.files_loading = True
+        self.files_summary.refresh()
+        try:
+            async for page in self.list_created_files():
+                rows = [self.file_row(file) for file in page]
+                self.files.extend(rows)
+                self.files_grid.run_grid_method("applyTransaction", {"add": rows})
+                self.files_summary.refresh()
+        except Exception as e:
+            error_msg = f"Error listing generated files: {e!s}"
+            log.error(error_msg)
+        finally:
+            self.files_loading = False
+            self.files_summary.refresh()
+
+    def reload_files(self):
+        if self.files_task:
+            self.files_task.cancel()
+        self.files_grid.options["rowData"] = []
+        self.files_grid.update()
+        self.files_task = background_tasks.create(self.stream_files(), name=f"files {self.execution_id}")
+
+    def watch_execution(self, on_update: Callable[[ExecutionSnapshot], Awaitable[None]]):
+        """Subscribe the page to the watcher shared with every other tab open on this execution, paused while hidden"""
+        client = ui.context.client
+
+        async def push_updates(snapshot: ExecutionSnapshot):
+            with client:
+                await on_update(snapshot)
+
+        unsubscribe = execution_poller.subscribe(self.execution_arn, client, push_updates, self.snapshot)
+        client.on_disconnect(unsubscribe)
+
+        ui.add_body_html(
+            "<script>document.addEventListener('visibilitychange', "
+            "() => emitEvent('visibility_change', document.visibilityState));</script>"
+        )
+        ui.on(
+            "visibility_change",
+            lambda event: execution_poller.set_visible(self.execution_arn, client, event.args == "visible"),
         )
-
-    @lru_cache(maxsize=128)
-    def _download_file(self, file):
-        link = aws_manager.get_presigned_url("wf-nlp-tasks", file)
-
-        ui.download(link)
 
     async def create_ui(self):
         @ui.refreshable
@@ -182,42 +487,11 @@ class ExecutionViewer(StepFunctionManager):
             else:
                 self.abort.disable()
 
-        @ui.refreshable
-        def mermaid_graph():
-            self.mermaid_graph = self.create_mermaid_graph()
-            ui.mermaid(self.mermaid_graph).classes("w-full flex justify-center")
-
-        @ui.refreshable
-        def generated_files():
-            self.files = self.list_created_files()
-
-            if not self.files:
-                ui.label().classes("text-sm text-gray-700 flex items-center gap-2").add_slot(
-                    "default",
-                    '<i class="material-icons">warning</i> Any files generated',
-                )
-
-            for file in self.files:
-                tfile = "/".join(file.split("/")[2:])
-                with (
-                    ui.grid(columns=2)
-                    .classes("w-full items-center -px-5 -my-1 hover:bg-gray-100 rounded gap-2 -ml-2")
-                    .style("grid-template-columns: 80% 20%")
-                ):
-                    ui.label(tfile).classes("text-sm break-all w-full")
-                    ui.button(icon="download", on_click=partial(self._download_file, tfile)).props("flat dense").classes(
-                        "justify-self-end aspect-square w-8 h-8 min-w-0 transition-colors bg-red text-white"
-                    )
-
-        async def check_for_updates():
-            # Get fresh data, bypassing cache
-            self.get_execution_details.cache_clear()
-            self.get_states_info.cache_clear()
-
-            current_details = self.get_execution_details()
-            current_status = current_details.get("status")
-
-            _, current_states_status = self.get_states_info()
+        @timed("page")
+        async def check_for_updates(snapshot: ExecutionSnapshot):
+            current_details = snapshot.details
+            current_status = snapshot.status
+            current_states_status = snapshot.states_status
 
             needs_refresh = False
 
@@ -232,21 +506,23 @@ class ExecutionViewer(StepFunctionManager):
                 self.states_status = current_states_status
                 needs_refresh = True
 
+            # Timings also change on retries and failures, without any state changing status
+            if snapshot.state_timings != self.state_timings:
+                self.state_timings = snapshot.state_timings
+                self.execution_details = current_details
+                self.state_timeline.refresh()
+
             # Only refresh if there were changes
             if needs_refresh:
-                # Clear mermaid graph cache since it depends on updated data
-                self.create_mermaid_graph.cache_clear()
-                self.list_created_files.cache_clear()
-
                 # Refresh all UI components that depend on the changed data
                 execution_status.refresh()
                 action_buttons.refresh()
-                mermaid_graph.refresh()
-                generated_files.refresh()
+                self.graph_panel.refresh()
+                self.reload_files()
+                if self.map_runs_task:
+                    self.reload_map_runs()
 
-        # Update timer interval to a more reasonable value (e.g., 10 seconds)
-
-        ui.timer(5, check_for_updates)
+        self.watch_execution(check_for_updates)
 
         with ui.card().classes("main-container p-4 h-full w-full -mt-2"):
             ui.label(f"Execution Details for {self.execution_id}").classes("text-2xl font-bold text-gray-800")
@@ -309,9 +585,9 @@ class ExecutionViewer(StepFunctionManager):
                                 )
                                 raise
 
-                            def abort_execution():
+                            async def abort_execution():
                                 try:
-                                    self._abort_step_function()
+                                    await self._abort_step_function()
                                     ui.run_javascript("location.reload();")
 
                                 except Exception as e:
@@ -327,9 +603,9 @@ class ExecutionViewer(StepFunctionManager):
                                 .props("icon=cancel")
                             )
 
-                            def redrive_execution():
+                            async def redrive_execution():
                                 try:
-                                    self._redrive_step_function()
+                                    await self._redrive_step_function()
                                     ui.run_javascript("location.reload();")
 
                                 except Exception as e:
@@ -350,17 +626,17 @@ class ExecutionViewer(StepFunctionManager):
                     # Files card
                     with ui.card().classes("n-card flex-1"):
                         ui.label("Files").classes("text-xl font-bold -mb-2 -mt-2")
-                        with ui.scroll_area().classes("w-full gap-0 flex h-full items-center justify-center -mt-2"):
-                            generated_files()
+                        with ui.element("div").classes("w-full gap-0 flex flex-col h-full -mt-2"):
+                            self.generated_files()
 
                 # Left column - State Transitions
-                with ui.card().classes("n-card flex-1 h-full"):
-                    ui.label("State Transitions").classes("text-xl font-bold mb-4")
-                    with ui.scroll_area().classes("w-full h-full flex items-center justify-center -mt-4"):
-                        mermaid_graph()
+                self.state_transitions_card()
+
+        self.files_task = background_tasks.create(self.stream_files(), name=f"files {self.execution_id}")
 
 
 @ui.page("/execution/{step_function_name}/{execution_id}")
+@timed("page")
 async def show_execution(execution_id):
     ui.page_title(execution_id)
 
@@ -0,0 +1,57 @@
+import hmac
+
+from loguru import logger as log
+from nicegui import app, background_tasks
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from utils.async_aws_manager import async_aws_manager
+from utils.execution_events import EXECUTION_EVENTS_TOKEN, execution_events, parse_status_change_event
+from utils.execution_poller import execution_poller
+from utils.metrics import metrics
+
+EVENTS = metrics.counter("sfm_execution_events_total", "Execution status change events received, by outcome", ("outcome",))
+
+
+@app.post("/events/executions")
+async def receive_execution_events(request: Request) -> JSONResponse:
+    """
+    Apply Step Functions execution status change events and push them to the open pages right away
+
+    The body is one EventBridge event or a list of them, so an EventBridge API destination or a local script can post
+    them. Events of other types, and events older than the known status of their execution, are ignored. Requests are
+    rejected unless EXECUTION_EVENTS_TOKEN is set and sent as a bearer token.
+    """
+    if not EXECUTION_EVENTS_TOKEN:
+        return JSONResponse({"error": "Status change events are disabled, set EXECUTION_EVENTS_TOKEN"}, status_code=403)
+    if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {EXECUTION_EVENTS_TOKEN}"):
+        return JSONResponse({"error": "Invalid or missing token"}, status_code=401)
+
+    try:
+        body = await request.json()
+        events = body if isinstance(body, list) else [body]
+        executions = [parse_status_change_event(event) for event in events]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        error_msg = f"Invalid execution status change event: {e!s}"
+        log.error(error_msg)
+        EVENTS.inc("invalid")
+        return JSONResponse({"error": error_msg}, status_code=400)
+
+    applied = 0
+    for execution in filter(None, executions):
+        execution_events.mark_received()
+        try:
+            merged = await async_aws_manager.apply_execution_event(execution)
+        except Exception as e:
+            error_msg = f"Error applying status change of {execution['executionArn']}: {e!s}"
+            log.error(error_msg)
+            continue
+        if merged is None:
+            continue
+
+        applied += 1
+        execution_poller.notify(merged["executionArn"])
+        background_tasks.create(execution_events.publish(merged), name=f"push {merged['executionArn']}")
+
+    EVENTS.inc("applied", amount=applied)
+    EVENTS.inc("ignored", amount=len(events) - applied)
+    return JSONResponse({"applied": applied, "ignored": len(events) - applied})
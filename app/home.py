@@ -1,22 +1,36 @@
 import os
+import time
+from datetime import datetime, timedelta
 from enum import Enum
 from functools import partial
 
-from detail_executions import show_execution  # noqa
+import pytz
+from detail_executions import show_execution  # noqa: F401
+from events_endpoint import receive_execution_events  # noqa: F401
 from loguru import logger as log
 from manager import StepFunctionManager
-from new_run import NewRunViewer
-from nicegui import app, ui
+from metrics_endpoint import get_metrics  # noqa: F401
+from new_run import BatchRunViewer, NewRunViewer
+from nicegui import app, background_tasks, ui
 from utils.app_storage import (
     get_selected_step_function_config_name,
     set_selected_environment,
     set_selected_step_function_arn,
     set_selected_step_function_config_name,
 )
+from utils.async_aws_manager import async_aws_manager
 from utils.aws_manager import aws_manager
+from utils.bulk_actions import BULK_ACTION_STATUSES, BulkActionRunner, BulkProgress
 from utils.config_loader import SFC
-from utils.date_utils import format_duration
+from utils.date_utils import format_duration, format_seconds
+from utils.execution_analytics import ANALYTICS_WINDOWS, WindowStats
+from utils.execution_events import execution_events
+from utils.execution_index import EXECUTION_STATUSES
+from utils.execution_store_sync import execution_store_sync
+from utils.home_snapshots import HomeSnapshot, home_snapshots
+from utils.metrics import timed
 from utils.nicegui_utils import button_disable_context, show_notification
+from utils.row_model import KeyedRowModel
 
 
 class Environment(str, Enum):
@@ -28,6 +42,7 @@ class Environment(str, Enum):
 class Home(StepFunctionManager):
     def __init__(self):
         super().__init__()
+        self.unsubscribe_events = None
 
     async def create_ui(self):
         """Create the main UI layout."""
@@ -128,14 +143,29 @@ class Home(StepFunctionManager):
                         "text-gray-600"
                     )
 
+        # Status changes of the previously selected state machine are no longer shown
+        if self.unsubscribe_events:
+            self.unsubscribe_events()
+            self.unsubscribe_events = None
+
         if not self.step_function_selected:
             show_empty_state()
             return
 
         with ui.scroll_area().classes("w-full h-full"):
             viewer = StepFunctionViewer()
+            # Render the last snapshot of the state machine right away, if any, then revalidate it in the background
+            from_snapshot = viewer.load_snapshot()
+            if not from_snapshot:
+                await viewer.refresh_data()
             await viewer.create_ui()
 
+        self.unsubscribe_events = execution_events.subscribe(
+            self.step_function_arn_selected, ui.context.client, viewer.handle_execution_event
+        )
+        if from_snapshot:
+            background_tasks.create(viewer.revalidate(), name=f"revalidate {self.step_function_arn_selected}")
+
 
 class StepFunctionViewer(StepFunctionManager):
     def __init__(self):
@@ -143,39 +173,154 @@ class StepFunctionViewer(StepFunctionManager):
         self.executions = None
         self.execution_counts = None
         self.step_function_details = None
-        self.max_executions = 20
+        self.page_size = 100
+        self.next_token = None
+        self.first_page_complete = False
+        self.pages_loaded = 0
+        self.loading_rows = False
+        self.filters = {"status": "", "started_from": None, "started_to": None, "name": ""}
+        self.rows = KeyedRowModel(key="executionArn")
+        self.grid = None
         self.executions_card = None
         self.stats_card = None
+        self.stat_labels: dict[str, ui.label] = {}
+        self.analytics_window = "24h"
+        self.window_stats: WindowStats | None = None
+        self.analytics_card = None
+        self.analytics_labels: dict[str, ui.label] = {}
+        self.bulk_action = "redrive"
+        self.bulk_runner = None
+        self.bulk_reported_errors: set[str] = set()
+        self.bulk_action_select = None
+        self.bulk_matching_label = None
+        self.bulk_progress_bar = None
+        self.bulk_progress_label = None
+        self.bulk_errors_log = None
+        self.bulk_run_button = None
         self.exists = False
-        self.refresh_data()
+        self.fetched_at: float | None = None
+        self.from_snapshot = False
+        self.revalidating = False
+        self.age_label = None
 
-    def refresh_data(self):
+    async def refresh_data(self):
         """Refresh all data from AWS"""
         try:
-            self.step_function_details = aws_manager.get_step_function_details(self.step_function_arn_selected)
+            self.step_function_details = await async_aws_manager.get_step_function_details(self.step_function_arn_selected)
             if self.step_function_details:
                 self.exists = True
-                self.execution_counts = aws_manager.get_execution_counts(self.step_function_arn_selected)
-                self.executions = aws_manager.list_executions(self.step_function_arn_selected, self.max_executions)
+                self.execution_counts = await self.fetch_execution_counts()
+                self.window_stats = await async_aws_manager.get_execution_stats(
+                    self.step_function_arn_selected, self.analytics_window
+                )
+                executions, next_token = await self.fetch_executions_page()
+                self.executions = executions
+                self.first_page_complete = next_token is None
+                # Keep the cursor of deeper pages once the table has been scrolled past the first one
+                if self.pages_loaded <= 1:
+                    self.next_token = next_token
+                    self.pages_loaded = 1
+                self.save_snapshot(next_token)
             else:
                 self.exists = False
                 self.execution_counts = {}
+                self.window_stats = None
                 self.executions = []
+                home_snapshots.forget(self.step_function_arn_selected)
+            self.fetched_at = time.time()
+            self.from_snapshot = False
 
         except Exception as e:
             error_msg = f"Error refreshing data: {e!s}"
             log.error(error_msg)
 
+            # Keep showing the data of the last refresh rather than an empty page, e.g. while the API is throttled
+            if self.exists:
+                return
+
             self.exists = False
             self.step_function_details = None
             self.execution_counts = {}
+            self.window_stats = None
             self.executions = []
 
+    def load_snapshot(self) -> bool:
+        """Load the data of the last snapshot of the state machine, if any, to render it until it is revalidated."""
+        snapshot = home_snapshots.get(self.step_function_arn_selected)
+        if snapshot is None:
+            return False
+
+        self.exists = True
+        self.step_function_details = snapshot.step_function_details
+        self.execution_counts = snapshot.execution_counts
+        self.window_stats = snapshot.window_stats
+        self.analytics_window = snapshot.analytics_window
+        self.executions = snapshot.executions
+        self.next_token = snapshot.next_token
+        self.first_page_complete = snapshot.first_page_complete
+        self.pages_loaded = 1
+        self.fetched_at = snapshot.fetched_at
+        self.from_snapshot = True
+        self.revalidating = True
+        return True
+
+    def save_snapshot(self, next_token: str | None) -> None:
+        """Keep the data of the first page for the next panel opened on the state machine, which starts unfiltered."""
+        if any(self.filters.values()):
+            return
+
+        home_snapshots.put(
+            self.step_function_arn_selected,
+            HomeSnapshot(
+                step_function_details=self.step_function_details,
+                execution_counts=self.execution_counts,
+                window_stats=self.window_stats,
+                analytics_window=self.analytics_window,
+                executions=self.executions,
+                next_token=next_token,
+                first_page_complete=self.first_page_complete,
+            ),
+        )
+
+    async def revalidate(self) -> None:
+        """Replace the data rendered from a snapshot with fresh data, patching the page in place."""
+        await self.refresh_data()
+        self.revalidating = False
+
+        # Another state machine may have been selected meanwhile
+        if self.age_label is None or self.age_label.is_deleted:
+            return
+        self.update_ui()
+
+    def update_age_label(self) -> None:
+        """Mark the data rendered from a snapshot with its age, until fresh data replaces it."""
+        if self.age_label is None:
+            return
+
+        self.age_label.set_visibility(self.from_snapshot)
+        if self.from_snapshot:
+            age = format_seconds(time.time() - self.fetched_at)
+            state = "refreshing..." if self.revalidating else "refresh failed"
+            self.age_label.set_text(f"Cached data from {age} ago, {state}")
+
+    @timed("page")
     async def refresh_all(self) -> None:
         """Refresh all data and UI components."""
-        self.refresh_data()
-        self.stats_card.refresh()
-        self.executions_card.refresh()
+        await self.refresh_data()
+        self.update_ui()
+
+    def update_ui(self) -> None:
+        """Patch the UI components with the current data, or rebuild those whose layout changed."""
+        self.update_age_label()
+        if not self.exists or self.grid is None:
+            self.stats_card.refresh()
+            self.analytics_card.refresh()
+            self.executions_card.refresh()
+            return
+
+        self.update_stats()
+        self.update_analytics()
+        self.update_rows(self.executions)
 
     async def slow_refresh(self, sender: ui.button) -> None:
         """Perform a slow refresh with button disable animation."""
@@ -190,6 +335,7 @@ class StepFunctionViewer(StepFunctionManager):
     def stats_table(self):
         @ui.refreshable
         def stats_table():
+            self.stat_labels = {}
             if not self.exists:
                 return
 
@@ -203,15 +349,370 @@ class StepFunctionViewer(StepFunctionManager):
                                     ui.label(status if status != "TIMED_OUT" else "TIMED OUT").classes(
                                         "font-semibold text-sm text-gray-600"
                                     )
-                                    ui.label(str(count)).classes("text-2xl font-bold mt-2 text-gray-800")
+                                    self.stat_labels[status] = ui.label(str(count)).classes(
+                                        "text-2xl font-bold mt-2 text-gray-800"
+                                    )
                     else:
                         ui.label("Step function not found").classes("text-red-500")
 
         return stats_table
 
+    def update_stats(self) -> None:
+        """Update only the stat counters whose value changed."""
+        if self.stat_labels.keys() != (self.execution_counts or {}).keys():
+            self.stats_card.refresh()
+            return
+
+        for status, count in self.execution_counts.items():
+            label = self.stat_labels[status]
+            if label.text != str(count):
+                label.set_text(str(count))
+
+    def analytics_values(self) -> dict[str, str]:
+        """Format the duration and throughput stats of the selected window."""
+        stats = self.window_stats
+        if stats is None:
+            return {}
+
+        def duration(seconds: float | None) -> str:
+            return format_seconds(seconds) if seconds is not None else "-"
+
+        return {
+            "Runs": str(stats.runs),
+            "Runs per hour": f"{stats.runs_per_hour:.1f}",
+            "Failure rate": f"{stats.failure_rate:.1%}" if stats.failure_rate is not None else "-",
+            "p50 duration": duration(stats.duration_p50),
+            "p90 duration": duration(stats.duration_p90),
+            "p99 duration": duration(stats.duration_p99),
+        }
+
+    def analytics_panel(self):
+        @ui.refreshable
+        def analytics_panel():
+            self.analytics_labels = {}
+            if not self.exists or self.window_stats is None:
+                return
+
+            with ui.card().classes("w-full flex no-shadow"):
+                with ui.row().classes("w-full items-center"):
+                    ui.label("Duration and Throughput").classes("text-lg font-bold")
+                    ui.space()
+                    ui.toggle(
+                        list(ANALYTICS_WINDOWS),
+                        value=self.analytics_window,
+                        on_change=self.handle_analytics_window_change,
+                    ).props("dense no-caps")
+                with ui.element("div").classes("grid grid-cols-6 w-full gap-3"):
+                    for name, value in self.analytics_values().items():
+                        with ui.element("div").classes("p-3 text-center w-full"):
+                            ui.label(name).classes("font-semibold text-sm text-gray-600")
+                            self.analytics_labels[name] = ui.label(value).classes("text-2xl font-bold mt-2 text-gray-800")
+
+        return analytics_panel
+
+    def update_analytics(self) -> None:
+        """Update only the duration and throughput stats whose value changed."""
+        values = self.analytics_values()
+        if self.analytics_labels.keys() != values.keys():
+            self.analytics_card.refresh()
+            return
+
+        for name, value in values.items():
+            label = self.analytics_labels[name]
+            if label.text != value:
+                label.set_text(value)
+
+    async def handle_analytics_window_change(self, event) -> None:
+        """Show the duration and throughput stats of another window."""
+        self.analytics_window = event.value
+        try:
+            self.window_stats = await async_aws_manager.get_execution_stats(
+                self.step_function_arn_selected, self.analytics_window
+            )
+        except Exception as e:
+            error_msg = f"Error computing execution stats: {e!s}"
+            log.error(error_msg)
+            return
+        self.update_analytics()
+
+    def execution_row(self, execution: dict) -> dict:
+        """Format an execution as a row of the executions table."""
+        status = execution.get("status", "")
+        start_date = execution.get("startDate")
+        stop_date = execution.get("stopDate")
+
+        execution_url = aws_manager.get_execution_url(execution.get("executionArn", ""))
+        execution_id = execution.get("executionArn", "").split(":")[-1]
+
+        return {
+            "executionArn": execution.get("executionArn", ""),
+            # In UTC with microseconds, as start dates from boto, the execution store and events have other offsets
+            "startedAt": start_date.astimezone(pytz.UTC).isoformat(timespec="microseconds") if start_date else "",
+            "name": execution.get("name", ""),
+            "status": status,
+            # Format dates for display
+            "start": start_date.strftime("%Y-%m-%d %H:%M:%S") if start_date else "-",
+            "stop": stop_date.strftime("%Y-%m-%d %H:%M:%S") if stop_date else "-",
+            # Calculate duration
+            "duration": format_duration(start_date, stop_date) if start_date and stop_date else "-",
+            "details": f"""<button onclick="window.location.href='/execution/{self.step_function_name}/{execution_id}'" """
+            """class="details-button">View</button>""",
+            "aws": f'<a href="{execution_url}" target="_blank" class="action-link">AWS</a>',
+        }
+
+    def matches_filters(self, execution: dict) -> bool:
+        """Check whether an execution matches the filters selected for the executions table."""
+        filters = self.execution_filters()
+        name_contains = (filters["name_contains"] or "").lower()
+        return (
+            (filters["status_filter"] is None or execution["status"] == filters["status_filter"])
+            and (filters["started_after"] is None or execution["startDate"] >= filters["started_after"])
+            and (filters["started_before"] is None or execution["startDate"] < filters["started_before"])
+            and name_contains in execution["name"].lower()
+        )
+
+    async def handle_execution_event(self, execution: dict) -> None:
+        """Patch the executions table and the stats with an execution changed by a status change event."""
+        if not self.exists or self.grid is None:
+            return
+
+        if self.matches_filters(execution):
+            changes = self.rows.apply([self.execution_row(execution)])
+            if changes:
+                self.grid.run_grid_method("applyTransaction", changes.as_transaction())
+        elif removed := self.rows.remove(execution["executionArn"]):
+            # No longer matches the status filter
+            self.grid.run_grid_method("applyTransaction", {"remove": [removed]})
+
+        # Served from the execution index and store, already updated by the event
+        self.execution_counts = await self.fetch_execution_counts(refresh=False)
+        self.window_stats = await async_aws_manager.get_execution_stats(
+            self.step_function_arn_selected, self.analytics_window
+        )
+        self.update_stats()
+        self.update_analytics()
+
+    def execution_filters(self) -> dict:
+        """Get the filters selected for the executions table, as list_executions_page arguments."""
+        started_after = self.parse_filter_date(self.filters["started_from"])
+        started_before = self.parse_filter_date(self.filters["started_to"])
+        return {
+            "status_filter": self.filters["status"] or None,
+            "started_after": started_after,
+            "started_before": started_before + timedelta(days=1) if started_before else None,
+            "name_contains": self.filters["name"] or None,
+        }
+
+    @staticmethod
+    def parse_filter_date(value: str | None) -> datetime | None:
+        """Parse a YYYY-MM-DD filter value as the start of that day in UTC."""
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=pytz.UTC) if value else None
+        except ValueError:
+            return None
+
+    async def fetch_execution_counts(self, refresh: bool = True) -> dict[str, int]:
+        """Fetch the execution counts by status in the selected start date range."""
+        filters = self.execution_filters()
+        return await async_aws_manager.get_execution_counts(
+            self.step_function_arn_selected,
+            refresh,
+            started_after=filters["started_after"],
+            started_before=filters["started_before"],
+        )
+
+    async def fetch_executions_page(self, next_token: str | None = None) -> tuple[list[dict], str | None]:
+        """Fetch a page of executions matching the selected filters, from the execution store once synced."""
+        return await async_aws_manager.search_executions(
+            self.step_function_arn_selected,
+            max_results=self.page_size,
+            next_token=next_token,
+            **self.execution_filters(),
+        )
+
+    def update_rows(self, executions: list[dict]) -> None:
+        """Patch the executions table with the rows inserted, changed or removed since the last refresh."""
+        rows = [self.execution_row(execution) for execution in executions]
+
+        # Fresh rows cover every row started after the oldest of them, or everything if the first page is complete
+        oldest_start = executions[-1]["startDate"] if executions and not self.first_page_complete else None
+
+        def in_window(row: dict) -> bool:
+            if oldest_start is None:
+                return True
+            return bool(row["startedAt"]) and datetime.fromisoformat(row["startedAt"]) > oldest_start
+
+        changes = self.rows.apply(rows, in_window=in_window)
+        if changes:
+            self.grid.run_grid_method("applyTransaction", changes.as_transaction())
+
+    async def load_more_rows(self) -> None:
+        """Append the next page of executions to the executions table."""
+        if not self.next_token or self.loading_rows:
+            return
+
+        self.loading_rows = True
+        try:
+            executions, self.next_token = await self.fetch_executions_page(self.next_token)
+            self.pages_loaded += 1
+        except Exception as e:
+            error_msg = f"Error loading executions: {e!s}"
+            log.error(error_msg)
+            return
+        finally:
+            self.loading_rows = False
+
+        rows = self.rows.extend([self.execution_row(execution) for execution in executions])
+        if rows:
+            self.grid.run_grid_method("applyTransaction", {"add": rows})
+
+    async def handle_viewport_changed(self, event) -> None:
+        """Load the next page when the table is scrolled close to its last loaded row."""
+        last_row = event.args.get("lastRow")
+        if last_row is not None and last_row >= len(self.rows) - self.page_size // 4:
+            await self.load_more_rows()
+
+    async def handle_filter_change(self, key: str, event) -> None:
+        """Reload the executions table from the first page with the new filters."""
+        self.filters[key] = event.value
+        try:
+            self.executions, self.next_token = await self.fetch_executions_page()
+            self.first_page_complete = self.next_token is None
+            self.pages_loaded = 1
+        except Exception as e:
+            error_msg = f"Error loading executions: {e!s}"
+            log.error(error_msg)
+            return
+
+        self.rows.reset([self.execution_row(execution) for execution in self.executions])
+        self.grid.options["rowData"] = self.rows.values()
+        self.grid.update()
+
+        if key in ("started_from", "started_to"):
+            try:
+                self.execution_counts = await self.fetch_execution_counts(refresh=False)
+            except Exception as e:
+                error_msg = f"Error counting executions: {e!s}"
+                log.error(error_msg)
+                return
+            self.update_stats()
+
+    async def select_bulk_executions(self) -> list[dict]:
+        """Select the executions matching the table filters that the selected bulk action applies to."""
+        statuses = BULK_ACTION_STATUSES[self.bulk_action]
+        filters = self.execution_filters()
+        if filters["status_filter"]:
+            statuses = tuple(status for status in statuses if status == filters["status_filter"])
+        return await async_aws_manager.select_executions(
+            self.step_function_arn_selected,
+            statuses,
+            started_after=filters["started_after"],
+            started_before=filters["started_before"],
+            name_contains=filters["name_contains"],
+        )
+
+    async def run_bulk_action(self, on_progress) -> BulkProgress:
+        """Run the selected bulk action on every matching execution."""
+        executions = await self.select_bulk_executions()
+        action = {
+            "stop": async_aws_manager.stop_execution,
+            "redrive": async_aws_manager.redrive_execution,
+        }[self.bulk_action]
+
+        self.bulk_runner = BulkActionRunner()
+        try:
+            return await self.bulk_runner.run(
+                [execution["executionArn"] for execution in executions], action, on_progress=on_progress
+            )
+        finally:
+            self.bulk_runner = None
+
+    async def bulk_actions_dialog(self) -> ui.dialog:
+        """Create the dialog to stop or redrive every execution matching the table filters."""
+        with ui.dialog() as dialog, ui.card().style("width: 700px; max-width: none"):
+            ui.label("Bulk actions").classes("text-lg font-bold")
+            ui.label("Applies to every execution matching the filters of the executions table.").classes(
+                "text-sm text-gray-600"
+            )
+            self.bulk_action_select = ui.select(
+                options={"redrive": "Redrive failed, timed out and aborted executions", "stop": "Stop running executions"},
+                value=self.bulk_action,
+                label="Action",
+                on_change=self.handle_bulk_action_change,
+            ).classes("w-full")
+            self.bulk_matching_label = ui.label().classes("text-sm text-gray-700")
+            self.bulk_progress_bar = ui.linear_progress(value=0, show_value=False).classes("w-full")
+            self.bulk_progress_label = ui.label().classes("text-sm text-gray-700")
+            self.bulk_errors_log = ui.log(max_lines=500).classes("w-full h-40")
+
+            with ui.row().classes("justify-end w-full gap-4"):
+                ui.button("Close", on_click=dialog.close).classes("bg-red text-white").props("icon=close")
+                ui.button("Cancel", on_click=self.cancel_bulk_action).classes("bg-red text-white").props("icon=stop")
+                self.bulk_run_button = (
+                    ui.button("Run", on_click=self.start_bulk_action)
+                    .classes("bg-red text-white")
+                    .props("icon=playlist_play")
+                )
+
+        dialog.on("show", self.count_bulk_matching)
+        return dialog
+
+    async def count_bulk_matching(self) -> None:
+        """Show how many executions the selected bulk action applies to."""
+        try:
+            executions = await self.select_bulk_executions()
+            self.bulk_matching_label.set_text(f"{len(executions)} matching executions")
+        except Exception as e:
+            error_msg = f"Error selecting executions: {e!s}"
+            log.error(error_msg)
+            self.bulk_matching_label.set_text(error_msg)
+
+    async def handle_bulk_action_change(self, event) -> None:
+        self.bulk_action = event.value
+        await self.count_bulk_matching()
+
+    def show_bulk_progress(self, progress: BulkProgress) -> None:
+        self.bulk_progress_bar.set_value(progress.done / progress.total if progress.total else 1)
+        self.bulk_progress_label.set_text(f"{progress.done}/{progress.total} done, {progress.failed} failed")
+
+    def report_bulk_progress(self, progress: BulkProgress) -> None:
+        """Show the progress of the running bulk action and log the errors not reported yet."""
+        self.show_bulk_progress(progress)
+        for execution_arn in progress.errors.keys() - self.bulk_reported_errors:
+            self.bulk_errors_log.push(f"{execution_arn.split(':')[-1]}: {progress.errors[execution_arn]}")
+            self.bulk_reported_errors.add(execution_arn)
+
+    async def start_bulk_action(self) -> None:
+        """Run the selected bulk action, then refresh the page and the matching count."""
+        self.bulk_reported_errors.clear()
+        self.bulk_errors_log.clear()
+        async with button_disable_context(self.bulk_run_button):
+            self.bulk_action_select.disable()
+            try:
+                progress = await self.run_bulk_action(self.report_bulk_progress)
+                self.show_bulk_progress(progress)
+                show_notification(
+                    f"Bulk {self.bulk_action}: {progress.succeeded} succeeded, {progress.failed} failed"
+                    + (" (cancelled)" if progress.cancelled else ""),
+                    notification_type="warning" if progress.failed or progress.cancelled else "success",
+                )
+            except Exception as e:
+                error_msg = f"Error running bulk {self.bulk_action}: {e!s}"
+                log.error(error_msg)
+                show_notification(error_msg, notification_type="error")
+            finally:
+                self.bulk_action_select.enable()
+        await self.refresh_all()
+        await self.count_bulk_matching()
+
+    def cancel_bulk_action(self) -> None:
+        if self.bulk_runner:
+            self.bulk_runner.cancel()
+
     def executions_table(self):
         @ui.refreshable
         def executions_table():
+            self.grid = None
             if not self.exists:
                 return
             ui.add_head_html("""
@@ -219,72 +720,57 @@ class StepFunctionViewer(StepFunctionManager):
             """)
 
             with ui.card().classes("w-full no-shadow"):
-                if self.executions:
-                    ui.label(f"Last {self.max_executions} executions").classes("text-lg font-bold mb-2")
-
-                    with ui.element("div").classes("overflow-x-auto -mb-6"):
-                        table_html = """
-                            <table class="q-table">
-                                <thead>
-                                    <tr>
-                                        <th style="text-align: left;">Execution Name</th>
-                                        <th>Status</th>
-                                        <th>Start Time</th>
-                                        <th>End Time</th>
-                                        <th>Duration</th>
-                                        <th>Details</th>
-                                        <th>Nerdy</th>
-                                    </tr>
-                                </thead>
-                                <tbody>
-                        """
-
-                        for execution in self.executions:
-                            status = execution.get("status", "")
-                            start_date = execution.get("startDate")
-                            stop_date = execution.get("stopDate")
-
-                            # Format dates for display
-                            start_date_str = start_date.strftime("%Y-%m-%d %H:%M:%S") if start_date else "-"
-                            stop_date_str = stop_date.strftime("%Y-%m-%d %H:%M:%S") if stop_date else "-"
-
-                            # Calculate duration
-                            duration = format_duration(start_date, stop_date) if start_date and stop_date else "-"
-
-                            execution_url = aws_manager.get_execution_url(execution.get("executionArn", ""))
-                            execution_id = execution.get("executionArn", "").split(":")[-1]
-
-                            table_html += f"""
-                                    <tr class="status-{status}">
-                                        <td class="text-left">{execution.get('name', '')}</td>
-                                        <td class="text-center status-cell">{status}</td>  <!-- Add status-cell class here -->
-                                        <td class="text-center">{start_date_str}</td>
-                                        <td class="text-center">{stop_date_str}</td>
-                                        <td class="text-center">{duration}</td>
-                                        <td class="text-center">
-                                            <button onclick="window.location.href='/execution/{self.step_function_name}/{execution_id}'" class="details-button">
-                                                View
-                                            </button>
-                                        </td>
-                                        <td class="text-center">
-                                            <a href="{execution_url}" target="_blank" class="action-link">
-                                                AWS
-                                            </a>
-                                        </td>
-                                    </tr>
-                                """
-
-                    table_html += """
-                            </tbody>
-                        </table>
-                    """
-
-                    ui.html(table_html).classes("w-full n-card")
-
-                else:
-                    with ui.row().classes("w-full justify-center items-center mt-20"):
-                        ui.icon("warning", size="2em").classes("text-red-500")
-                        ui.label("Any executions found").classes("text-red-500 text-lg")
+                with ui.row().classes("w-full items-center gap-4 mb-2"):
+                    ui.label("Executions").classes("text-lg font-bold")
+                    ui.space()
+                    ui.input(
+                        "Search name",
+                        value=self.filters["name"],
+                        on_change=partial(self.handle_filter_change, "name"),
+                    ).props("debounce=300 clearable").classes("w-48")
+                    ui.select(
+                        options={"": "All statuses", **{status: status.replace("_", " ") for status in EXECUTION_STATUSES}},
+                        value=self.filters["status"],
+                        label="Status",
+                        on_change=partial(self.handle_filter_change, "status"),
+                    ).classes("w-40")
+                    ui.input(
+                        "Started from",
+                        value=self.filters["started_from"],
+                        on_change=partial(self.handle_filter_change, "started_from"),
+                    ).props("type=date stack-label clearable").classes("w-40")
+                    ui.input(
+                        "Started to",
+                        value=self.filters["started_to"],
+                        on_change=partial(self.handle_filter_change, "started_to"),
+                    ).props("type=date stack-label clearable").classes("w-40")
+
+                self.rows.reset([self.execution_row(execution) for execution in self.executions])
+                self.grid = ui.aggrid(
+                    {
+                        "columnDefs": [
+                            {"field": "startedAt", "hide": True, "sort": "desc"},
+                            {"headerName": "Execution Name", "field": "name", "flex": 3},
+                            {"headerName": "Status", "field": "status", "cellClass": "status-cell", "flex": 1},
+                            {"headerName": "Start Time", "field": "start", "flex": 2},
+                            {"headerName": "End Time", "field": "stop", "flex": 2},
+                            {"headerName": "Duration", "field": "duration", "flex": 1},
+                            {"headerName": "Details", "field": "details", "flex": 1},
+                            {"headerName": "Nerdy", "field": "aws", "flex": 1},
+                        ],
+                        "rowData": self.rows.values(),
+                        ":getRowId": "(params) => params.data.executionArn",
+                        "rowClassRules": {
+                            f":status-{status}": f"(params) => params.data.status === '{status}'"
+                            for status in EXECUTION_STATUSES
+                        },
+                        "overlayNoRowsTemplate": "Any executions found",
+                        "suppressCellFocus": True,
+                    },
+                    html_columns=[6, 7],
+                    auto_size_columns=False,
+                ).classes("w-full h-[600px]")
+                self.grid.on("viewportChanged", self.handle_viewport_changed)
 
         return executions_table
 
@@ -302,6 +788,8 @@ class StepFunctionViewer(StepFunctionManager):
 
             with ui.element("div").classes("flex-3 w-3/4  overflow-auto"):
                 ui.label(f"Information for {self.step_function_selected}").classes("text-lg font-bold mb-2")
+                self.age_label = ui.label().classes("text-sm text-gray-500 -mt-2 mb-2")
+                self.update_age_label()
                 with ui.grid().classes("grid-cols-[100px_1fr] gap-2"):
                     ui.label("Name:").classes("font-bold")
                     ui.label(self.step_function_name).classes("truncate")
@@ -331,16 +819,43 @@ class StepFunctionViewer(StepFunctionManager):
                         "w-40 h-10 max-w-full break-words overflow-x-auto bg-red text-white"
                     ).props("icon=rocket_launch")
 
+                    with ui.dialog() as batch_dialog, ui.card().style("width: 1200px; max-width: none"):
+                        batch_run = BatchRunViewer()
+                        await batch_run.create_ui()
+                        with ui.row().classes("justify-end w-full gap-4"):
+                            ui.button("Close", on_click=batch_dialog.close).classes(
+                                "max-w-full break-words overflow-x-auto bg-red text-white"
+                            ).props("icon=close")
+                            ui.button("Cancel", on_click=batch_run.cancel).classes(
+                                "max-w-full break-words overflow-x-auto bg-red text-white"
+                            ).props("icon=stop")
+                            ui.button(
+                                "Launch",
+                                on_click=partial(batch_run.launch, self.refresh_all),
+                            ).classes("max-w-full break-words overflow-x-auto bg-red text-white").props("icon=rocket_launch")
+
+                    ui.button("Batch", on_click=batch_dialog.open).classes(
+                        "w-40 h-10 max-w-full break-words overflow-x-auto bg-red text-white"
+                    ).props("icon=dynamic_feed")
+
+                    bulk_dialog = await self.bulk_actions_dialog()
+                    ui.button("Bulk", on_click=bulk_dialog.open).classes(
+                        "w-40 h-10 max-w-full break-words overflow-x-auto bg-red text-white"
+                    ).props("icon=playlist_play")
+
         # Create refreshable components
         self.stats_card = self.stats_table()
+        self.analytics_card = self.analytics_panel()
         self.executions_card = self.executions_table()
 
         # Display the components
         self.stats_card()
+        self.analytics_card()
         self.executions_card()
 
 
 @ui.page("/")
+@timed("page")
 async def main():
     # Add Google Fonts
     ui.add_head_html("""
@@ -370,6 +885,8 @@ async def main():
 
 if __name__ == "__main__":
     app.add_static_files("/assets", "./assets")
+    app.on_startup(lambda: async_aws_manager.warm_up(SFC.list_state_machine_arns()))
+    app.on_startup(execution_store_sync.start)
 
     ui.run(
         title="Step Functions Manager",
@@ -0,0 +1,24 @@
+from nicegui import Client, app, background_tasks
+from starlette.responses import PlainTextResponse
+from utils.execution_poller import execution_poller
+from utils.metrics import metrics
+
+metrics.gauge("sfm_clients", "NiceGUI clients, connected or not", lambda: len(Client.instances))
+metrics.gauge(
+    "sfm_connected_clients",
+    "NiceGUI clients with an open socket connection",
+    lambda: sum(client.has_socket_connection for client in list(Client.instances.values())),
+)
+metrics.gauge("sfm_execution_watchers", "Executions polled for open detail pages", lambda: len(execution_poller.watchers))
+metrics.gauge(
+    "sfm_polling_execution_watchers",
+    "Execution watchers not paused by hidden detail pages",
+    lambda: sum(not watcher.paused for watcher in list(execution_poller.watchers.values())),
+)
+metrics.gauge("sfm_background_tasks", "Running NiceGUI background tasks", lambda: len(background_tasks.running_tasks))
+
+
+@app.get("/metrics")
+def get_metrics() -> PlainTextResponse:
+    """Expose the metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
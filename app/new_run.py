@@ -1,14 +1,18 @@
+import hashlib
 import json
 import re
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
 import pytz
+from botocore.exceptions import ClientError
 from manager import StepFunctionManager
-from nicegui import ui
-from utils.aws_manager import aws_manager
+from nicegui import events, ui
+from utils.async_aws_manager import async_aws_manager
+from utils.batch_launch import parse_parameter_sets, sweep_parameter_sets, validate_parameter_sets
+from utils.bulk_actions import BulkActionRunner, BulkItemSkipped, BulkProgress
 from utils.config_loader import SFC
 from utils.nicegui_utils import show_notification
 
@@ -23,7 +27,8 @@ class FormElement:
         return self.ui_element.value if self.ui_element else self.default_value
 
 
-def create_valid_name(user_input: str) -> str:
+def create_valid_name(user_input: str, suffix: str | None = None) -> str:
+    """Create an execution name from user input, ending with the suffix or, by default, the current timestamp"""
     MAX_NAME_LENGTH = 80
     TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
 
@@ -31,16 +36,22 @@ def create_valid_name(user_input: str) -> str:
     cleaned_name = re.sub(r"_+", "_", cleaned_name)
     cleaned_name = cleaned_name.strip("_")
 
-    timestamp = datetime.now(tz=pytz.UTC).strftime(TIMESTAMP_FORMAT)
-    execution_name = f"{cleaned_name}_{timestamp}"
+    suffix = suffix or datetime.now(tz=pytz.UTC).strftime(TIMESTAMP_FORMAT)
+    execution_name = f"{cleaned_name}_{suffix}"
 
     if len(execution_name) > MAX_NAME_LENGTH:
-        max_name_length = MAX_NAME_LENGTH - len(timestamp) - 1
-        execution_name = f"{cleaned_name[:max_name_length]}_{timestamp}"
+        max_name_length = MAX_NAME_LENGTH - len(suffix) - 1
+        execution_name = f"{cleaned_name[:max_name_length]}_{suffix}"
 
     return execution_name
 
 
+def create_batch_name(user_input: str, parameter_set: dict[str, Any]) -> str:
+    """Create a deterministic execution name from user input and a hash of the parameter set"""
+    digest = hashlib.sha256(json.dumps(parameter_set, sort_keys=True).encode()).hexdigest()
+    return create_valid_name(user_input, suffix=digest[:16])
+
+
 class NewRunViewer(StepFunctionManager):
     def __init__(self, initial_values: dict[str, Any] | None = None):
         super().__init__()
@@ -140,7 +151,7 @@ class NewRunViewer(StepFunctionManager):
             execution_params["execution_name"] = execution_name
 
         try:
-            response = aws_manager.start_execution(**execution_params)
+            response = await async_aws_manager.start_execution(**execution_params)
             execution_arn = response["executionArn"]
             execution_id = execution_arn.split(":")[-1]
 
@@ -159,3 +170,168 @@ class NewRunViewer(StepFunctionManager):
 
         if refresh_f:
             await refresh_f()
+
+
+class BatchRunViewer(NewRunViewer):
+    """
+    Launch one execution per parameter set, from an uploaded CSV/JSONL file or from a sweep over select options.
+
+    Execution names are derived from the parameter sets, so launching the same batch again skips the sets
+    that already have an execution.
+    """
+
+    def __init__(self, initial_values: dict[str, Any] | None = None):
+        super().__init__(initial_values)
+        self.source = "Sweep"
+        self.uploaded_sets: list[dict[str, Any]] = []
+        self.upload_error = None
+        self.runner = None
+
+    async def create_ui(self) -> None:
+        ui.label(f"Batch run for {self.step_function_name}").classes(self.UI_CLASSES["title"])
+        self.create_execution_name_card()
+
+        with ui.tabs().classes("w-full") as tabs:
+            ui.tab("Sweep")
+            ui.tab("Upload")
+
+        with ui.tab_panels(tabs, value=self.source).classes("w-full"):
+            with ui.tab_panel("Sweep").classes("gap-2"):
+                ui.label("One run per combination of the selected options.").classes(self.UI_CLASSES["description"])
+                if self.parameters:
+                    for param_name, param_config in self.parameters.items():
+                        self.create_parameter_card(param_name, param_config)
+
+            with ui.tab_panel("Upload").classes("gap-2"):
+                ui.label(
+                    "One run per CSV row or JSONL line. Columns or keys are parameter names; "
+                    "missing values take the parameter default."
+                ).classes(self.UI_CLASSES["description"])
+                ui.upload(on_upload=self.handle_upload, auto_upload=True).props('accept=".csv,.jsonl"').classes("w-full")
+
+        self.summary_label = ui.label().classes("text-sm text-gray-700")
+        self.progress_bar = ui.linear_progress(value=0, show_value=False).classes("w-full")
+        self.errors_log = ui.log(max_lines=500).classes("w-full h-40")
+        tabs.on_value_change(self.handle_source_change)
+        self.update_summary()
+
+    def create_input_element(self, param_type: str, default_value: Any, param_config: dict[str, Any]) -> Any:
+        if param_type != "select" or param_config.get("multiple"):
+            return super().create_input_element(param_type, default_value, param_config)
+
+        # Single-value selects are swept over every selected option
+        element = ui.select(
+            value=[default_value] if default_value is not None else [],
+            multiple=True,
+            options=param_config.get("options"),
+            on_change=self.update_summary,
+        )
+        return element.classes(self.UI_CLASSES["input_element"]).props(self.UI_PROPS["input"])
+
+    def swept_parameters(self) -> list[str]:
+        return [
+            name for name, config in self.parameters.items() if config.get("type") == "select" and not config.get("multiple")
+        ]
+
+    def get_parameter_sets(self) -> tuple[list[dict[str, Any]], list[str]]:
+        """Get the validated parameter sets of the batch, and the errors of the invalid ones."""
+        if self.source == "Upload":
+            if self.upload_error:
+                return [], [self.upload_error]
+            return validate_parameter_sets(self.parameters, self.uploaded_sets)
+
+        form_values = self.get_form_values()
+        form_values.pop("execution_name", None)
+        sweep = {name: form_values.pop(name) or [None] for name in self.swept_parameters()}
+        return validate_parameter_sets(self.parameters, sweep_parameter_sets(form_values, sweep))
+
+    def update_summary(self) -> None:
+        parameter_sets, errors = self.get_parameter_sets()
+        summary = f"{len(parameter_sets)} runs"
+        if errors:
+            summary += f", {len(errors)} invalid parameter sets"
+        self.summary_label.set_text(summary)
+
+    def handle_source_change(self, event: events.ValueChangeEventArguments) -> None:
+        self.source = event.value
+        self.update_summary()
+
+    def handle_upload(self, event: events.UploadEventArguments) -> None:
+        try:
+            self.uploaded_sets = parse_parameter_sets(event.name, event.content.read())
+            self.upload_error = None
+        except (ValueError, UnicodeDecodeError) as e:
+            self.uploaded_sets = []
+            self.upload_error = f"{event.name}: {e!s}"
+        self.update_summary()
+
+    async def start_execution(self, execution_name: str, parameter_set: dict[str, Any], batch_started_at: datetime) -> None:
+        """
+        Start the execution of a parameter set, skipping it if it was already launched.
+
+        StartExecution raises ExecutionAlreadyExists for a name already used, except while the execution is still
+        running with the same input: it then succeeds and returns its original start date, older than the batch.
+        """
+        try:
+            response = await async_aws_manager.start_execution(
+                self.step_function_arn_selected, json.dumps(parameter_set), execution_name
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ExecutionAlreadyExists":
+                raise BulkItemSkipped from e
+            raise
+        if response["startDate"] < batch_started_at:
+            raise BulkItemSkipped
+
+    async def handle_submit(self) -> None:
+        parameter_sets, errors = self.get_parameter_sets()
+        self.errors_log.clear()
+        for error in errors:
+            self.errors_log.push(error)
+        if errors or not parameter_sets:
+            show_notification("Fix the parameter sets before launching the batch.", notification_type="error")
+            return
+
+        name_prefix = self.get_form_values().get("execution_name") or ""
+        runs = {create_batch_name(name_prefix, parameter_set): parameter_set for parameter_set in parameter_sets}
+        executions = await async_aws_manager.select_executions(self.step_function_arn_selected)
+        launched = {execution["name"] for execution in executions}
+
+        def report_progress(progress: BulkProgress) -> None:
+            self.progress_bar.set_value(progress.done / progress.total if progress.total else 1)
+            self.summary_label.set_text(
+                f"{progress.done}/{progress.total} done: {progress.succeeded} launched, "
+                f"{progress.skipped} already launched, {progress.failed} failed"
+            )
+            for execution_name in progress.errors.keys() - reported_errors:
+                self.errors_log.push(f"{execution_name}: {progress.errors[execution_name]}")
+                reported_errors.add(execution_name)
+
+        reported_errors = set()
+        batch_started_at = datetime.now(UTC)
+        self.runner = BulkActionRunner()
+        try:
+            progress = await self.runner.run(
+                runs,
+                lambda execution_name: self.start_execution(execution_name, runs[execution_name], batch_started_at),
+                on_progress=report_progress,
+                skip=launched.__contains__,
+            )
+        finally:
+            self.runner = None
+
+        report_progress(progress)
+        show_notification(
+            f"Batch run: {progress.succeeded} launched, {progress.skipped} already launched, {progress.failed} failed",
+            notification_type="warning" if progress.failed else "success",
+        )
+
+    def cancel(self) -> None:
+        if self.runner:
+            self.runner.cancel()
+
+    async def launch(self, refresh_f: Callable | None = None) -> None:
+        await self.handle_submit()
+
+        if refresh_f:
+            await refresh_f()
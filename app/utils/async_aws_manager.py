@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import os
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from utils.aws_manager import AWSManager, aws_manager
+from utils.execution_analytics import WindowStats
+from utils.rate_limiter import BACKGROUND, call_priority
+
+
+class AsyncAWSManager:
+    """
+    Async facade over AWSManager.
+
+    Every call runs in a bounded thread pool, so a slow pagination never blocks the NiceGUI event loop
+    and concurrent users don't wait for each other. Background calls, which sleep in their worker while they are
+    throttled, run in a smaller pool of their own, so they never hold the workers of page loads.
+    """
+
+    def __init__(self, manager: AWSManager, max_workers: int = 10, background_workers: int = 4):
+        self.manager = manager
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aws-manager")
+        self.background_executor = ThreadPoolExecutor(
+            max_workers=background_workers, thread_name_prefix="aws-manager-background"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function in the AWS thread pool of its priority, preserving the caller's context variables"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        executor = self.background_executor if call_priority.get() == BACKGROUND else self.executor
+        return await loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+
+    async def warm_up(self, step_function_arns: list[str]) -> None:
+        """Create the clients of the given state machines and open their connections"""
+        await self.run(self.manager.warm_up, step_function_arns)
+
+    async def get_execution_details(self, execution_arn: str) -> dict:
+        """Get details of a Step Function execution"""
+        return await self.run(self.manager.get_execution_details, execution_arn)
+
+    async def get_step_function_details(self, step_function_arn: str) -> dict:
+        """Get details of a Step Function state machine"""
+        return await self.run(self.manager.get_step_function_details, step_function_arn)
+
+    async def list_executions(self, step_function_arn: str, max_results: int = 20, refresh: bool = True) -> list[dict]:
+        """List the most recent executions for a state machine"""
+        return await self.run(self.manager.list_executions, step_function_arn, max_results, refresh)
+
+    async def list_executions_page(
+        self,
+        step_function_arn: str,
+        max_results: int = 100,
+        next_token: str | None = None,
+        *,
+        status_filter: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List a page of executions for a state machine, newest first"""
+        return await self.run(
+            self.manager.list_executions_page,
+            step_function_arn,
+            max_results,
+            next_token,
+            status_filter=status_filter,
+            started_after=started_after,
+            started_before=started_before,
+            name_contains=name_contains,
+        )
+
+    async def search_executions(
+        self,
+        step_function_arn: str,
+        max_results: int = 100,
+        next_token: str | None = None,
+        *,
+        status_filter: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Search a page of executions in the execution store, newest first"""
+        return await self.run(
+            self.manager.search_executions,
+            step_function_arn,
+            max_results,
+            next_token,
+            status_filter=status_filter,
+            started_after=started_after,
+            started_before=started_before,
+            name_contains=name_contains,
+        )
+
+    async def sync_execution_store(self, step_function_arn: str) -> None:
+        """Sync the stored executions of a state machine with AWS"""
+        await self.run(self.manager.sync_execution_store, step_function_arn)
+
+    async def apply_execution_event(self, execution: dict) -> dict | None:
+        """Apply an execution status change pushed by an event"""
+        return await self.run(self.manager.apply_execution_event, execution)
+
+    async def select_executions(
+        self,
+        step_function_arn: str,
+        statuses: tuple[str, ...] | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        refresh: bool = True,
+        *,
+        name_contains: str | None = None,
+    ) -> list[dict]:
+        """Select executions of a state machine from its execution index"""
+        return await self.run(
+            self.manager.select_executions,
+            step_function_arn,
+            statuses,
+            started_after,
+            started_before,
+            refresh,
+            name_contains=name_contains,
+        )
+
+    async def get_states_info(self, step_function_arn: str, execution_id: str, execution_status: str | None = None) -> tuple:
+        """Get state machine graph, current status of all states and timings of the entered ones"""
+        return await self.run(self.manager.get_states_info, step_function_arn, execution_id, execution_status)
+
+    async def start_execution(self, step_function_arn: str, input_data: dict, execution_name: str | None = None) -> dict:
+        """Start a new state machine execution"""
+        return await self.run(self.manager.start_execution, step_function_arn, input_data, execution_name)
+
+    async def stop_execution(self, execution_arn: str) -> dict:
+        """Stop a running execution"""
+        return await self.run(self.manager.stop_execution, execution_arn)
+
+    async def redrive_execution(self, execution_arn: str) -> dict:
+        """Redrive a failed execution"""
+        return await self.run(self.manager.redrive_execution, execution_arn)
+
+    async def get_map_runs(self, execution_arn: str) -> list[dict]:
+        """List the map runs of an execution and describe them concurrently"""
+        map_runs = await self.run(self.manager.list_map_runs, execution_arn)
+        return list(
+            await asyncio.gather(*(self.run(self.manager.describe_map_run, map_run["mapRunArn"]) for map_run in map_runs))
+        )
+
+    async def list_map_run_executions(
+        self,
+        map_run_arn: str,
+        offset: int = 0,
+        limit: int = 100,
+        status_filter: str | None = None,
+    ) -> tuple[list[dict], bool]:
+        """List a slice of the child executions of a map run"""
+        return await self.run(self.manager.list_map_run_executions, map_run_arn, offset, limit, status_filter)
+
+    async def list_map_run_executions_per_status(
+        self,
+        map_run_arn: str,
+        status_filters: list[str],
+        limit: int = 100,
+    ) -> dict[str, tuple[list[dict], bool]]:
+        """List the first child executions of a map run for each status, paging through the statuses concurrently"""
+        slices = await asyncio.gather(
+            *(self.run(self.manager.list_map_run_executions, map_run_arn, 0, limit, status) for status in status_filters)
+        )
+        return dict(zip(status_filters, slices, strict=True))
+
+    async def list_s3_objects(self, bucket: str, prefix: str, sort_by_date: bool = True) -> list[str]:
+        """List objects in S3 bucket with given prefix"""
+        return await self.run(self.manager.list_s3_objects, bucket, prefix, sort_by_date)
+
+    async def iter_s3_object_pages(
+        self, bucket: str, prefix: str, terminal_execution_arn: str | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Iterate over the pages of objects in S3 bucket with given prefix, fetching each page in the thread pool"""
+        pages = self.manager.iter_s3_object_pages(bucket, prefix, terminal_execution_arn)
+        while (page := await self.run(next, pages, None)) is not None:
+            yield page
+
+    async def get_execution_counts(
+        self,
+        step_function_arn: str,
+        refresh: bool = True,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+    ) -> dict[str, int]:
+        """Get counts of executions by status"""
+        return await self.run(self.manager.get_execution_counts, step_function_arn, refresh, started_after, started_before)
+
+    async def get_execution_stats(self, step_function_arn: str, window: str = "24h", refresh: bool = False) -> WindowStats:
+        """Get duration and throughput stats of the executions started in a rolling window"""
+        return await self.run(self.manager.get_execution_stats, step_function_arn, window, refresh)
+
+    async def get_presigned_url(self, bucket_name: str, object_key: str, expiration: int = 5) -> str:
+        """Generate presigned URL for S3 object"""
+        return await self.run(self.manager.get_presigned_url, bucket_name, object_key, expiration)
+
+    async def get_secret(self, secret_name: str, key_to_extract: str) -> str:
+        """Get a secret value from AWS Secrets Manager"""
+        return await self.run(self.manager.get_secret, secret_name, key_to_extract)
+
+
+async_aws_manager = AsyncAWSManager(
+    aws_manager,
+    max_workers=int(os.environ.get("AWS_MAX_WORKERS", "10")),
+    background_workers=int(os.environ.get("AWS_BACKGROUND_WORKERS", "4")),
+)
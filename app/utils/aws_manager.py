@@ -1,62 +1,429 @@
+import hashlib
 import json
-import os
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
+from loguru import logger as log
+from utils.client_pool import client_pool
+from utils.config_loader import SFC
+from utils.execution_analytics import ExecutionAnalytics, WindowStats
+from utils.execution_detail_cache import DETAILS, FILES, HISTORY, ExecutionDetailCache, execution_detail_cache
+from utils.execution_history import TERMINAL_STATUSES, ExecutionHistory
+from utils.execution_index import ExecutionIndex
+from utils.execution_store import ExecutionStore, execution_store, hash_input
+from utils.map_runs import MAP_RUN_TERMINAL_STATUSES, ChildExecutionListing
+from utils.metrics import instrument_methods
+from utils.singleflight import SingleFlight, coalesced
+from utils.state_machine_graph import StateMachineGraph
+
+
+@instrument_methods("aws")
+class AWSManager:
+    """
+    Centralized manager for AWS operations
 
+    Concurrent identical reads, e.g. of every user opening the same state machine after a deploy, share one call
+    to AWS whose result is reused for a couple of seconds; writes drop these results.
+    """
 
-class AWSManager:
-    """Centralized manager for AWS operations"""
+    MAX_TRACKED_HISTORIES = 1024
+    MAX_CACHED_GRAPHS = 64
+    MAX_CACHED_LISTINGS = 256
+    MAX_CACHED_MAP_RUNS = 256
+    CHILD_EXECUTIONS_PAGE_SIZE = 1000
+    LIST_EXECUTIONS_PAGE_SIZE = 1000
+    INPUT_HASHES_PER_SYNC = 100
 
     @staticmethod
-    @lru_cache(maxsize=64)
-    def get_client(service_name: str):
-        """Get cached boto3 client for specified service"""
-        return boto3.client(service_name)
+    def get_client(service_name: str, account_id: str | None = None, region_name: str | None = None):
+        """Get pooled boto3 client for specified service, with the default credentials"""
+        return client_pool.get_client(service_name, account_id, region_name)
 
-    def __init__(self):
-        self.sfn_client = self.get_client("stepfunctions")
+    def __init__(
+        self,
+        store: ExecutionStore | None = execution_store,
+        detail_cache: ExecutionDetailCache | None = execution_detail_cache,
+    ):
         self.s3_client = self.get_client("s3")
+        self.single_flight = SingleFlight()
         self.secret_client = self.get_client("secretsmanager")
+        self.execution_store = store
+        self.detail_cache = detail_cache
+        self.execution_indexes: dict[str, ExecutionIndex] = {}
+        self.stored_versions: dict[str, int] = {}  # index version last written to the execution store
+        self.execution_analytics: dict[str, ExecutionAnalytics] = {}
+        self.execution_histories: OrderedDict[str, ExecutionHistory] = OrderedDict()
+        self._histories_lock = threading.Lock()
+        self.state_machine_graphs: OrderedDict[tuple[str, str], StateMachineGraph] = OrderedDict()  # by ARN, revision
+        self._graphs_lock = threading.Lock()
+        self.s3_listings: OrderedDict[tuple[str, str, str], list[dict]] = OrderedDict()  # by bucket, prefix, execution
+        self._listings_lock = threading.Lock()
+        self.map_runs: OrderedDict[str, dict] = OrderedDict()  # last description of each map run
+        self.child_listings: OrderedDict[tuple[str, str | None], ChildExecutionListing] = OrderedDict()
+        self._map_runs_lock = threading.Lock()
+
+    def get_sfn_client(self, arn: str):
+        """Get the Step Functions client for the account, region and role of a state machine or execution ARN"""
+        region_name, account_id = arn.split(":")[3:5]
+        return client_pool.get_client(
+            "stepfunctions",
+            account_id or None,
+            region_name or None,
+            SFC.get_role_arn(self.get_state_machine_arn(arn)),
+        )
 
-    def get_execution_details(self, execution_arn: str) -> dict:
-        """Get details of a Step Function execution"""
-        return self.sfn_client.describe_execution(executionArn=execution_arn)
+    def warm_up(self, step_function_arns: list[str]) -> None:
+        """Create the clients of the given state machines and open their connections ahead of the first page load"""
+        for step_function_arn in step_function_arns:
+            try:
+                self.get_step_function_details(step_function_arn)
+            except Exception as e:
+                error_msg = f"Error warming up the client of {step_function_arn}: {e!s}"
+                log.error(error_msg)
 
+    @coalesced
+    def get_execution_details(self, execution_arn: str) -> dict:
+        """Get details of a Step Function execution; those of terminal executions are served from the detail cache"""
+        cached = self.get_cached_detail(execution_arn, DETAILS)
+        if cached is not None:
+            return cached
+
+        details = self.get_sfn_client(execution_arn).describe_execution(executionArn=execution_arn)
+        if self.detail_cache and details["status"] in TERMINAL_STATUSES:
+            self.detail_cache.put(execution_arn, DETAILS, {k: v for k, v in details.items() if k != "ResponseMetadata"})
+        return details
+
+    def get_cached_detail(self, execution_arn: str, kind: str) -> dict | None:
+        """Get cached detail data of a terminal execution, dropped if the execution index shows it running again"""
+        content = self.detail_cache.get(execution_arn, kind) if self.detail_cache else None
+        if content is None or self.running_again(execution_arn):
+            return None
+        return content
+
+    def running_again(self, execution_arn: str) -> bool:
+        """Check whether the execution index shows a terminal execution running again, and drop its cached data if so"""
+        # Redriven outside this app without any status change event: the syncs of the index still see it
+        index = self.execution_indexes.get(self.get_state_machine_arn(execution_arn))
+        indexed = index.get(execution_arn) if index else None
+        if indexed and indexed["status"] not in TERMINAL_STATUSES:
+            self.forget_execution_detail(execution_arn)
+            return True
+        return False
+
+    def forget_execution_detail(self, execution_arn: str) -> None:
+        """Drop the cached detail data and file listings of an execution, when it is redriven"""
+        if self.detail_cache:
+            self.detail_cache.forget(execution_arn)
+        with self._listings_lock:
+            for key in [key for key in self.s3_listings if key[2] == execution_arn]:
+                del self.s3_listings[key]
+
+    @coalesced
     def get_step_function_details(self, step_function_arn: str) -> dict:
         """Get details of a Step Function state machine"""
-        return self.sfn_client.describe_state_machine(stateMachineArn=step_function_arn)
+        return self.get_sfn_client(step_function_arn).describe_state_machine(stateMachineArn=step_function_arn)
+
+    def get_execution_index(self, step_function_arn: str) -> ExecutionIndex:
+        """Get the in-process execution index of a state machine, seeded from the execution store if enabled"""
+        if step_function_arn not in self.execution_indexes:
+            index = ExecutionIndex(step_function_arn)
+            if self.execution_store:
+                index.load(
+                    self.execution_store.load_executions(step_function_arn),
+                    self.execution_store.load_watermark(step_function_arn),
+                )
+                self.stored_versions[step_function_arn] = index.version
+            self.execution_indexes.setdefault(step_function_arn, index)
+        return self.execution_indexes[step_function_arn]
+
+    @coalesced
+    def sync_execution_index(self, step_function_arn: str) -> ExecutionIndex:
+        """Sync the execution index of a state machine with AWS and write its changes to the execution store"""
+        index = self.get_execution_index(step_function_arn)
+        index.sync(self.get_sfn_client(step_function_arn))
+
+        if self.execution_store:
+            self._store_index_changes(step_function_arn, index)
+        return index
+
+    def apply_execution_event(self, execution: dict) -> dict | None:
+        """
+        Apply an execution status change pushed by an event to the execution index, store and tracked history
 
-    def list_executions(self, step_function_arn: str, max_results: int = 20) -> list[dict]:
-        """List executions for a state machine"""
-        response = self.sfn_client.list_executions(stateMachineArn=step_function_arn, maxResults=max_results)
-        return response["executions"]
+        Only indexes and stores already built by a sync are updated: the next sync builds the others from AWS.
+
+        Args:
+            execution (dict): Execution as listed by list_executions
 
-    def get_states_info(self, step_function_arn: str, execution_id: str) -> tuple:
+        Returns:
+            dict | None: The execution merged with the indexed one, None if the event is older than the indexed status
         """
-        Gets state machine definition and states status with minimal API calls.
-        Returns state machine definition and current status of all states.
+        step_function_arn = execution["stateMachineArn"]
+        self.single_flight.clear()
+        stored = self.execution_store is not None and self.execution_store.is_synced(step_function_arn)
+        index = self.execution_indexes.get(step_function_arn)
+        if index:
+            execution = index.apply(execution)
+            if execution is None:
+                return None
+            if stored:
+                self._store_index_changes(step_function_arn, index)
+        elif stored:
+            self.execution_store.upsert_executions(
+                step_function_arn,
+                [execution],
+                SFC.get_config_name(step_function_arn),
+                SFC.get_environment(step_function_arn),
+            )
+
+        if execution["status"] == "RUNNING":
+            # Possibly redriven: resume tracking its history and forget its terminal map runs and detail data
+            self.forget_execution_detail(execution["executionArn"])
+            with self._histories_lock:
+                history = self.execution_histories.get(execution["executionArn"])
+            if history and history.terminal:
+                history.reopen()
+                self.forget_map_runs(execution["executionArn"])
+        return execution
+
+    def _store_index_changes(self, step_function_arn: str, index: ExecutionIndex) -> None:
+        """Write the executions changed in the index since the last write to the execution store"""
+        changed, version = index.changed_since(self.stored_versions.get(step_function_arn, 0))
+        if changed or not self.execution_store.is_synced(step_function_arn):
+            self.execution_store.upsert_executions(
+                step_function_arn,
+                changed,
+                SFC.get_config_name(step_function_arn),
+                SFC.get_environment(step_function_arn),
+            )
+        self.execution_store.set_watermark(step_function_arn, index.watermark)
+        self.stored_versions[step_function_arn] = version
+
+    def sync_execution_store(self, step_function_arn: str) -> None:
+        """Sync the stored executions of a state machine, then hash the inputs of the most recent unhashed ones"""
+        self.sync_execution_index(step_function_arn)
+        if not self.execution_store:
+            return
+
+        input_hashes = {}
+        for execution_arn in self.execution_store.list_missing_input_hashes(step_function_arn, self.INPUT_HASHES_PER_SYNC):
+            try:
+                # Not through the detail cache, which is only for the executions opened in the app
+                details = self.get_sfn_client(execution_arn).describe_execution(executionArn=execution_arn)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ExecutionDoesNotExist":
+                    raise
+                # Expired from Step Functions: its input can no longer be known
+                input_hashes[execution_arn] = ""
+                continue
+            input_hashes[execution_arn] = hash_input(details.get("input"))
+        self.execution_store.set_input_hashes(input_hashes)
+
+    @coalesced
+    def list_executions(self, step_function_arn: str, max_results: int = 20, refresh: bool = True) -> list[dict]:
         """
+        List the most recent executions for a state machine
 
-        # Get state machine details - single API call
-        step_function = self.get_step_function_details(step_function_arn=step_function_arn)
+        Args:
+            step_function_arn (str): ARN of the state machine
+            max_results (int): Maximum number of executions to return
+            refresh (bool): If True, sync the execution index with AWS before reading it
 
-        # Parse definition and initialize states status
-        definition_json = json.loads(step_function["definition"])
-        all_states = definition_json["States"]
-        states_status = {name: "NOT_STARTED" for name in all_states}
+        Returns:
+            list[dict]: Executions, newest first
+        """
+        index = self.sync_execution_index(step_function_arn) if refresh else self.get_execution_index(step_function_arn)
+        return index.latest(max_results)
 
-        # Get execution history and update status - paginated API calls
-        paginator = self.sfn_client.get_paginator("get_execution_history")
-        for page in paginator.paginate(executionArn=execution_id):
-            for event in page["events"]:
-                if "StateEntered" in event["type"]:
-                    states_status[event["stateEnteredEventDetails"]["name"]] = "RUNNING"
-                elif "StateExited" in event["type"]:
-                    states_status[event["stateExitedEventDetails"]["name"]] = "COMPLETED"
+    def select_executions(
+        self,
+        step_function_arn: str,
+        statuses: tuple[str, ...] | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        refresh: bool = True,
+        *,
+        name_contains: str | None = None,
+    ) -> list[dict]:
+        """
+        Select executions of a state machine from its execution index
 
-        return definition_json, states_status
+        Args:
+            step_function_arn (str): ARN of the state machine
+            statuses (tuple[str, ...] | None): If set, only select executions with one of these statuses
+            started_after (datetime | None): If set, only select executions started at or after this date
+            started_before (datetime | None): If set, only select executions started before this date
+            refresh (bool): If True, sync the execution index with AWS before reading it
+            name_contains (str | None): If set, only select executions whose name contains this text, ignoring case
+
+        Returns:
+            list[dict]: Matching executions, newest first
+        """
+        index = self.sync_execution_index(step_function_arn) if refresh else self.get_execution_index(step_function_arn)
+        return index.select(statuses, started_after, started_before, name_contains)
+
+    def get_execution_history(self, execution_arn: str) -> ExecutionHistory:
+        """Get the incrementally tracked history of an execution, restored from the detail cache once terminal"""
+        with self._histories_lock:
+            history = self.execution_histories.get(execution_arn)
+            if history is None:
+                cached = self.get_cached_detail(execution_arn, HISTORY)
+                history = ExecutionHistory.load(execution_arn, cached) if cached else ExecutionHistory(execution_arn)
+                self.execution_histories[execution_arn] = history
+                if len(self.execution_histories) > self.MAX_TRACKED_HISTORIES:
+                    self.execution_histories.popitem(last=False)
+            self.execution_histories.move_to_end(execution_arn)
+            return history
+
+    @coalesced
+    def list_executions_page(
+        self,
+        step_function_arn: str,
+        max_results: int = 100,
+        next_token: str | None = None,
+        *,
+        status_filter: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        List a page of executions for a state machine, newest first
+
+        Args:
+            step_function_arn (str): ARN of the state machine
+            max_results (int): Maximum number of executions in the page
+            next_token (str | None): Token returned with the previous page, the AWS token of the listed page and
+                the offset of the first execution not returned yet in it
+            status_filter (str | None): If set, only list executions with this status
+            started_after (datetime | None): If set, only list executions started at or after this date
+            started_before (datetime | None): If set, only list executions started before this date
+            name_contains (str | None): If set, only list executions whose name contains this text, ignoring case
+
+        Returns:
+            tuple[list[dict], str | None]: Executions and the token of the next page, None on the last page
+        """
+        params = {"stateMachineArn": step_function_arn}
+        if status_filter:
+            params["statusFilter"] = status_filter
+        filtered_locally = bool(started_after or started_before or name_contains)
+
+        offset, _, aws_token = next_token.partition(":") if next_token else ("0", "", "")
+        skip, next_token = int(offset), aws_token or None
+        sfn_client = self.get_sfn_client(step_function_arn)
+        executions = []
+        while len(executions) < max_results:
+            # Unfiltered pages only request the room left in the page. Filtered ones always request full pages,
+            # the same ones again when resumed from an offset, rather than shrinking requests down to one execution.
+            page_token = next_token
+            request = {
+                **params,
+                "maxResults": self.LIST_EXECUTIONS_PAGE_SIZE if filtered_locally else max_results - len(executions),
+            }
+            if page_token:
+                request["nextToken"] = page_token
+
+            response = sfn_client.list_executions(**request)
+            next_token = response.get("nextToken")
+            listed = response["executions"]
+            for position in range(skip, len(listed)):
+                execution = listed[position]
+                if started_after and execution["startDate"] < started_after:
+                    return executions, None
+                if started_before and execution["startDate"] >= started_before:
+                    continue
+                if name_contains and name_contains.lower() not in execution["name"].lower():
+                    continue
+                executions.append(execution)
+                if len(executions) == max_results and position + 1 < len(listed):
+                    return executions, f"{position + 1}:{page_token or ''}"
+            skip = 0
+
+            if not next_token:
+                break
+
+        return executions, f"0:{next_token}" if next_token else None
+
+    @coalesced
+    def search_executions(
+        self,
+        step_function_arn: str,
+        max_results: int = 100,
+        next_token: str | None = None,
+        *,
+        status_filter: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Search a page of executions in the execution store, newest first, or in AWS until the store is synced
+
+        The store is as fresh as the last sync of the execution index: call a refreshing method first, like
+        get_execution_counts, to include the executions started since.
+        """
+        filters = {
+            "status_filter": status_filter,
+            "started_after": started_after,
+            "started_before": started_before,
+            "name_contains": name_contains,
+        }
+        if self.execution_store and self.execution_store.is_synced(step_function_arn):
+            return self.execution_store.search(step_function_arn, max_results, next_token, **filters)
+        return self.list_executions_page(step_function_arn, max_results, next_token, **filters)
+
+    def get_execution_graph(self, step_function_arn: str, execution_arn: str) -> StateMachineGraph:
+        """Get the parsed definition revision an execution runs on, the most recently used ones cached by revision"""
+        sfn_client = self.get_sfn_client(execution_arn)
+        step_function = sfn_client.describe_state_machine_for_execution(executionArn=execution_arn)
+        revision_id = step_function.get("revisionId") or hashlib.sha256(step_function["definition"].encode()).hexdigest()
+
+        key = (step_function_arn, revision_id)
+        with self._graphs_lock:
+            graph = self.state_machine_graphs.get(key)
+            if graph is not None:
+                self.state_machine_graphs.move_to_end(key)
+                return graph
+
+        graph = StateMachineGraph.from_definition(step_function["definition"])
+        with self._graphs_lock:
+            self.state_machine_graphs[key] = graph
+            self.state_machine_graphs.move_to_end(key)
+            if len(self.state_machine_graphs) > self.MAX_CACHED_GRAPHS:
+                self.state_machine_graphs.popitem(last=False)
+        return graph
+
+    @coalesced
+    def get_states_info(self, step_function_arn: str, execution_id: str, execution_status: str | None = None) -> tuple:
+        """
+        Gets state machine graph, states status and state timings with minimal API calls.
+        Returns the parsed state machine definition, current status of all states and the timings of the
+        entered ones, computed in the same pass over the history events.
+
+        The definition revision the execution runs on is fetched once per execution, and only the history events
+        added since the previous call are fetched. The history of an execution that already reached a terminal
+        status is not fetched again; passing a non-terminal `execution_status` reopens the tracking of an
+        execution redriven elsewhere.
+        """
+
+        # Get the definition the execution runs on - single API call, on the first call for the execution only
+        history = self.get_execution_history(execution_id)
+        if history.graph is None:
+            history.graph = self.get_execution_graph(step_function_arn, execution_id)
+
+        # Apply new execution history events - paginated API calls, newest first
+        if history.terminal and execution_status and execution_status not in TERMINAL_STATUSES:
+            history.reopen()
+        terminal = history.terminal
+        history.sync(self.get_sfn_client(execution_id))
+        if self.detail_cache and history.terminal and not terminal:
+            self.detail_cache.put(execution_id, HISTORY, history.dump())
+
+        states_status = {**dict.fromkeys(history.graph.nodes, "NOT_STARTED"), **history.states_status}
+        return history.graph, states_status, history.timeline.snapshot()
 
     def start_execution(
         self,
@@ -70,16 +437,165 @@ class AWSManager:
         if execution_name:
             params["name"] = execution_name
 
-        return self.sfn_client.start_execution(**params)
+        response = self.get_sfn_client(step_function_arn).start_execution(**params)
+        self.single_flight.clear()
+        return response
 
     def stop_execution(self, execution_arn: str) -> dict:
         """Stop a running execution"""
-        return self.sfn_client.stop_execution(executionArn=execution_arn)
+        response = self.get_sfn_client(execution_arn).stop_execution(executionArn=execution_arn)
+        self.single_flight.clear()
+        return response
 
     def redrive_execution(self, execution_arn: str) -> dict:
         """Redrive a failed execution"""
-        return self.sfn_client.redrive_execution(executionArn=execution_arn)
+        response = self.get_sfn_client(execution_arn).redrive_execution(executionArn=execution_arn)
+        self.get_execution_history(execution_arn).reopen()
+        self.forget_map_runs(execution_arn)
+        self.forget_execution_detail(execution_arn)
+        self.single_flight.clear()
+        return response
+
+    @coalesced
+    def list_map_runs(self, execution_arn: str) -> list[dict]:
+        """List the Distributed Map runs started by an execution, oldest first"""
+        paginator = self.get_sfn_client(execution_arn).get_paginator("list_map_runs")
+        map_runs = [map_run for page in paginator.paginate(executionArn=execution_arn) for map_run in page["mapRuns"]]
+        return sorted(map_runs, key=lambda map_run: map_run["startDate"])
+
+    @coalesced
+    def describe_map_run(self, map_run_arn: str) -> dict:
+        """Describe a map run with its item and child execution counts; terminal map runs are served from the cache"""
+        with self._map_runs_lock:
+            previous = self.map_runs.get(map_run_arn)
+        if previous and previous["status"] in MAP_RUN_TERMINAL_STATUSES:
+            return previous
+
+        description = self.get_sfn_client(map_run_arn).describe_map_run(mapRunArn=map_run_arn)
+        with self._map_runs_lock:
+            self.map_runs[map_run_arn] = description
+            self.map_runs.move_to_end(map_run_arn)
+            if len(self.map_runs) > self.MAX_CACHED_MAP_RUNS:
+                self.map_runs.popitem(last=False)
+            if previous and previous["executionCounts"] != description["executionCounts"]:
+                # Child executions started or changed status since they were listed
+                self._drop_child_listings(map_run_arn)
+        return description
+
+    def list_map_run_executions(
+        self,
+        map_run_arn: str,
+        offset: int = 0,
+        limit: int = 100,
+        status_filter: str | None = None,
+    ) -> tuple[list[dict], bool]:
+        """
+        List a slice of the child executions of a map run, fetching their pages lazily and caching them
+
+        Listings are kept until describe_map_run sees the child execution counts of the map run change.
+
+        Args:
+            map_run_arn (str): ARN of the map run
+            offset (int): Number of child executions to skip
+            limit (int): Maximum number of child executions to return
+            status_filter (str | None): If set, only list child executions with this status
+
+        Returns:
+            tuple[list[dict], bool]: Child executions, newest first, and whether more are listed after them
+        """
+        key = (map_run_arn, status_filter)
+        with self._map_runs_lock:
+            listing = self.child_listings.get(key)
+            if listing is None:
+                listing = self.child_listings[key] = ChildExecutionListing()
+                if len(self.child_listings) > self.MAX_CACHED_LISTINGS:
+                    self.child_listings.popitem(last=False)
+            self.child_listings.move_to_end(key)
+
+        with listing.lock:
+            sfn_client = self.get_sfn_client(map_run_arn)
+            while len(listing.executions) < offset + limit and not listing.complete:
+                request = {"mapRunArn": map_run_arn, "maxResults": self.CHILD_EXECUTIONS_PAGE_SIZE}
+                if status_filter:
+                    request["statusFilter"] = status_filter
+                if listing.next_token:
+                    request["nextToken"] = listing.next_token
+
+                response = sfn_client.list_executions(**request)
+                listing.executions.extend(response["executions"])
+                listing.next_token = response.get("nextToken")
+                listing.complete = listing.next_token is None
+
+            has_more = len(listing.executions) > offset + limit or not listing.complete
+            return listing.executions[offset : offset + limit], has_more
+
+    def forget_map_runs(self, execution_arn: str) -> None:
+        """Drop the cached map runs of an execution and their child executions, when it is redriven"""
+        with self._map_runs_lock:
+            for map_run_arn in [arn for arn, map_run in self.map_runs.items() if map_run["executionArn"] == execution_arn]:
+                del self.map_runs[map_run_arn]
+                self._drop_child_listings(map_run_arn)
+
+    def _drop_child_listings(self, map_run_arn: str) -> None:
+        for key in [key for key in self.child_listings if key[0] == map_run_arn]:
+            del self.child_listings[key]
+
+    def iter_s3_object_pages(
+        self, bucket: str, prefix: str, terminal_execution_arn: str | None = None
+    ) -> Iterator[list[dict]]:
+        """
+        Iterate over the pages of objects in S3 bucket with given prefix, as they are fetched
+
+        Args:
+            bucket (str): Name of the S3 bucket
+            prefix (str): Prefix to filter objects
+            terminal_execution_arn (str | None): Terminal execution whose outputs are under the prefix, which can
+                no longer change. If set, serve the listing from the cache, in memory then in the detail cache of
+                the execution, or cache it there once fully fetched.
 
+        Yields:
+            list[dict]: Objects of each page, with their Key, Size and LastModified
+        """
+        key = (bucket, prefix, terminal_execution_arn)
+        cached = None
+        if terminal_execution_arn and not self.running_again(terminal_execution_arn):
+            cached = self._get_cached_listing(key)
+            files = self.get_cached_detail(terminal_execution_arn, FILES) if cached is None else None
+            if files and files["bucket"] == bucket and files["prefix"] == prefix:
+                cached = files["objects"]
+                self._cache_listing(key, cached)
+        if cached is not None:
+            yield cached
+            return
+
+        objects = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            contents = page.get("Contents", [])
+            objects.extend(contents)
+            yield contents
+
+        if terminal_execution_arn:
+            self._cache_listing(key, objects)
+            if self.detail_cache:
+                listed = [{field: obj[field] for field in ("Key", "Size", "LastModified")} for obj in objects]
+                self.detail_cache.put(terminal_execution_arn, FILES, {"bucket": bucket, "prefix": prefix, "objects": listed})
+
+    def _get_cached_listing(self, key: tuple[str, str, str]) -> list[dict] | None:
+        with self._listings_lock:
+            cached = self.s3_listings.get(key)
+            if cached is not None:
+                self.s3_listings.move_to_end(key)
+            return cached
+
+    def _cache_listing(self, key: tuple[str, str, str], objects: list[dict]) -> None:
+        with self._listings_lock:
+            self.s3_listings[key] = objects
+            self.s3_listings.move_to_end(key)
+            if len(self.s3_listings) > self.MAX_CACHED_LISTINGS:
+                self.s3_listings.popitem(last=False)
+
+    @coalesced
     def list_s3_objects(self, bucket: str, prefix: str, sort_by_date: bool = True) -> list[str]:
         """
         List objects in S3 bucket with given prefix
@@ -92,40 +608,52 @@ class AWSManager:
         Returns:
             list[str]: List of object keys
         """
-        response = self.s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-
-        if "Contents" not in response:
-            return []
+        objects = [obj for page in self.iter_s3_object_pages(bucket, prefix) for obj in page]
 
         if sort_by_date:
             # Sort objects by LastModified date, newest first
-            sorted_objects = sorted(response["Contents"], key=lambda x: x["LastModified"], reverse=True)
-            return [obj["Key"] for obj in sorted_objects]
-        return [obj["Key"] for obj in response["Contents"]]
-
-    def get_execution_counts(self, step_function_arn: str) -> dict[str, int]:
-        """Get counts of executions by status"""
-        counts = {
-            "RUNNING": 0,
-            "SUCCEEDED": 0,
-            "FAILED": 0,
-            "TIMED_OUT": 0,
-            "ABORTED": 0,
-        }
+            objects.sort(key=lambda x: x["LastModified"], reverse=True)
+        return [obj["Key"] for obj in objects]
 
+    @coalesced
+    def get_execution_counts(
+        self,
+        step_function_arn: str,
+        refresh: bool = True,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+    ) -> dict[str, int]:
+        """Get counts of executions by status, in a start date range only if the execution store is enabled"""
         try:
-            paginator = self.sfn_client.get_paginator("list_executions")
-            for page in paginator.paginate(stateMachineArn=step_function_arn):
-                for execution in page["executions"]:
-                    status = execution["status"]
-                    counts[status] = counts.get(status, 0) + 1
+            index = self.sync_execution_index(step_function_arn) if refresh else self.get_execution_index(step_function_arn)
 
         except (BotoCoreError, ClientError) as e:
             error_msg = f"Error fetching execution counts: {e}"
             raise ValueError(error_msg) from e
 
+        counts = index.get_counts()
+        if (started_after or started_before) and self.execution_store:
+            in_range = self.execution_store.get_counts(step_function_arn, started_after, started_before)
+            counts = {status: in_range.get(status, 0) for status in counts} | in_range
         return counts
 
+    def get_execution_stats(self, step_function_arn: str, window: str = "24h", refresh: bool = False) -> WindowStats:
+        """
+        Get duration and throughput stats of the executions of a state machine started in a rolling window
+
+        Args:
+            step_function_arn (str): ARN of the state machine
+            window (str): One of ANALYTICS_WINDOWS
+            refresh (bool): If True, sync the execution index with AWS before computing the stats
+
+        Returns:
+            WindowStats: Runs, failure rate, runs per hour and duration percentiles, in seconds
+        """
+        index = self.sync_execution_index(step_function_arn) if refresh else self.get_execution_index(step_function_arn)
+        if step_function_arn not in self.execution_analytics:
+            self.execution_analytics.setdefault(step_function_arn, ExecutionAnalytics(index))
+        return self.execution_analytics[step_function_arn].get_stats(window)
+
     def get_presigned_url(self, bucket_name: str, object_key: str, expiration: int = 5) -> bool:
         """Generate presigned URL for S3 object"""
 
@@ -142,14 +670,21 @@ class AWSManager:
         return f"https://{region}.console.aws.amazon.com/states/home?region={region}#/executions/details/{execution_arn}"
 
     @staticmethod
-    def get_execution_arn(
-        step_function_name: str,
-        execution_id: str,
-        region: str = os.environ.get("AWS_DEFAULT_REGION"),
-        account_id: str = os.environ.get("AWS_ACCOUNT_ID"),
-    ) -> str:
-        """Generate Step Function execution ARN given the required parameters."""
-        return f"arn:aws:states:{region}:{account_id}:execution:{step_function_name}:{execution_id}"
+    def get_execution_arn(step_function_arn: str, execution_id: str) -> str:
+        """Generate Step Function execution ARN given the state machine ARN and the execution ID."""
+        return f"{step_function_arn.replace(':stateMachine:', ':execution:', 1)}:{execution_id}"
+
+    @staticmethod
+    def get_state_machine_arn(arn: str) -> str:
+        """
+        Get the state machine ARN of an execution or map run ARN; state machine ARNs are returned unchanged.
+
+        Map runs and their child executions are named after their parent state machine, as "<name>/<map label>".
+        """
+        parts = arn.split(":")
+        if len(parts) > 7 and parts[5] in {"execution", "mapRun"}:  # noqa: PLR2004
+            return ":".join([*parts[:5], "stateMachine", parts[6].split("/", 1)[0]])
+        return arn
 
     def get_secret(self, secret_name: str, key_to_extract: str) -> str:
         """Get a secret value from AWS Secrets Manager."""
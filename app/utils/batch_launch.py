@@ -0,0 +1,118 @@
+import csv
+import io
+import itertools
+import json
+from typing import Any
+
+from utils.config_loader import Parameter, ParameterType
+
+BOOLEAN_VALUES = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}
+
+
+def parse_parameter_sets(filename: str, content: bytes) -> list[dict[str, Any]]:
+    """Parse parameter sets from a CSV file with a header row, or from a JSONL file with one object per line."""
+    text = content.decode("utf-8-sig")
+    if filename.lower().endswith(".csv"):
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        parameter_sets = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                parameter_set = json.loads(line)
+            except json.JSONDecodeError as e:
+                error_msg = f"Line {line_number}: invalid JSON ({e.msg})"
+                raise ValueError(error_msg) from e
+            if not isinstance(parameter_set, dict):
+                error_msg = f"Line {line_number}: expected a JSON object"
+                raise ValueError(error_msg)  # noqa: TRY004
+            parameter_sets.append(parameter_set)
+        return parameter_sets
+
+    error_msg = f"Unsupported file type: {filename}. Use a .csv or .jsonl file."
+    raise ValueError(error_msg)
+
+
+def sweep_parameter_sets(base: dict[str, Any], sweep: dict[str, list]) -> list[dict[str, Any]]:
+    """Build one parameter set per combination of the swept values, on top of the base values."""
+    names = list(sweep)
+    return [dict(base, **dict(zip(names, values, strict=True))) for values in itertools.product(*sweep.values())]
+
+
+def validate_parameter_value(name: str, parameter: Parameter, value: Any) -> Any:
+    """Coerce a value, as read from a form or a file, to the type of its parameter."""
+    if parameter.type in {ParameterType.string, ParameterType.text}:
+        return str(value)
+
+    if parameter.type == ParameterType.integer:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int | str):
+            error_msg = f"{name}: expected an integer, got {value!r}"
+            raise ValueError(error_msg)
+        try:
+            return int(value)
+        except ValueError as e:
+            error_msg = f"{name}: expected an integer, got {value!r}"
+            raise ValueError(error_msg) from e
+
+    if parameter.type == ParameterType.boolean:
+        if isinstance(value, bool):
+            return value
+        if str(value).strip().lower() not in BOOLEAN_VALUES:
+            error_msg = f"{name}: expected a boolean, got {value!r}"
+            raise ValueError(error_msg)
+        return BOOLEAN_VALUES[str(value).strip().lower()]
+
+    # Select: multiple values can be given as a list or as comma-separated values
+    values = value if isinstance(value, list) else [value]
+    if parameter.multiple and isinstance(value, str):
+        values = [item.strip() for item in value.split(",") if item.strip()]
+    if invalid := [item for item in values if item not in parameter.options]:
+        error_msg = f"{name}: {', '.join(map(str, invalid))} not in {', '.join(parameter.options)}"
+        raise ValueError(error_msg)
+    if parameter.multiple:
+        return values
+    if len(values) != 1:
+        error_msg = f"{name}: expected a single value, got {value!r}"
+        raise ValueError(error_msg)
+    return values[0]
+
+
+def validate_parameter_sets(
+    parameters: dict[str, dict[str, Any]], parameter_sets: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Validate parameter sets against the parameters of a step function config.
+
+    Missing or empty values are replaced by the parameter default, like in the new run form.
+
+    Args:
+        parameters (dict): Parameters of the step function config
+        parameter_sets (list[dict]): Parameter sets to validate
+
+    Returns:
+        tuple[list[dict], list[str]]: Valid parameter sets, with their values coerced, and the errors of the
+            invalid ones
+    """
+    schema = {name: Parameter(**config) for name, config in parameters.items()}
+    valid = []
+    errors = []
+    for number, parameter_set in enumerate(parameter_sets, start=1):
+        if unknown := parameter_set.keys() - schema.keys():
+            errors.append(f"Set {number}: unknown parameters {', '.join(sorted(unknown))}")
+            continue
+
+        try:
+            validated = {}
+            for name, parameter in schema.items():
+                value = parameter_set.get(name)
+                if value is None or value in ("", []):
+                    value = parameter.default
+                validated[name] = None if value is None else validate_parameter_value(name, parameter, value)
+            valid.append(validated)
+        except ValueError as e:
+            errors.append(f"Set {number}: {e!s}")
+    return valid, errors
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from utils.rate_limiter import background_priority
+
+BULK_ACTION_CONCURRENCY = int(os.environ.get("BULK_ACTION_CONCURRENCY", "5"))
+BULK_ACTION_RATE = float(os.environ.get("BULK_ACTION_RATE", "10"))
+
+# Statuses an execution must be in for each bulk action to apply to it
+BULK_ACTION_STATUSES = {
+    "stop": ("RUNNING",),
+    "redrive": ("FAILED", "TIMED_OUT", "ABORTED"),
+}
+
+
+class BulkItemSkipped(Exception):
+    """Raised by a bulk action when an item does not need to be processed"""
+
+
+class RateLimiter:
+    """Space out the start of async operations so that at most `rate` of them start per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait until the next operation is allowed to start"""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class BulkProgress:
+    """Progress of a bulk action, updated as each item completes"""
+
+    total: int
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: dict[str, str] = field(default_factory=dict)  # item -> error message
+    cancelled: bool = False
+
+    @property
+    def done(self) -> int:
+        return self.succeeded + self.failed + self.skipped
+
+    @property
+    def finished(self) -> bool:
+        return self.done == self.total
+
+
+class BulkActionRunner:
+    """
+    Run an async action over many items through a bounded number of concurrent workers and a rate limit.
+
+    A failing item is recorded in the progress instead of aborting the batch, and the progress callback is
+    called after each item so that a page can stream it live.
+    """
+
+    def __init__(self, concurrency: int = BULK_ACTION_CONCURRENCY, rate: float = BULK_ACTION_RATE):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.progress: BulkProgress | None = None
+
+    async def run(
+        self,
+        items: Iterable[str],
+        action: Callable[[str], Awaitable[Any]],
+        on_progress: Callable[[BulkProgress], Any] | None = None,
+        skip: Callable[[str], bool] | None = None,
+    ) -> BulkProgress:
+        """
+        Run the action on every item.
+
+        Args:
+            items (Iterable[str]): Items to process, e.g. execution ARNs
+            action (Callable): Async function called with each item
+            on_progress (Callable | None): Called with the progress after each item
+            skip (Callable | None): Tells whether an item is already processed, skipping it without waiting for
+                the rate limit
+
+        Returns:
+            BulkProgress: Final progress, with the error of each failed item
+        """
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        self.progress = progress = BulkProgress(total=queue.qsize())
+        limiter = RateLimiter(self.rate)
+
+        async def worker() -> None:
+            while not progress.cancelled:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                if skip and skip(item):
+                    progress.skipped += 1
+                    if on_progress:
+                        on_progress(progress)
+                    continue
+
+                await limiter.wait()
+                if progress.cancelled:
+                    return
+                try:
+                    await action(item)
+                    progress.succeeded += 1
+                except BulkItemSkipped:
+                    progress.skipped += 1
+                except Exception as e:
+                    progress.failed += 1
+                    progress.errors[item] = str(e)
+
+                if on_progress:
+                    on_progress(progress)
+
+        # Interactive calls of the other users go first
+        with background_priority():
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, progress.total))))
+        return progress
+
+    def cancel(self) -> None:
+        """Stop picking new items; the ones in flight still complete"""
+        if self.progress:
+            self.progress.cancelled = True
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import boto3
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session
+from loguru import logger as log
+from utils.metrics import record_api_call
+from utils.rate_limiter import CLIENT_CONFIG, api_rate_limiter
+
+# Every AWS thread pool worker can hold a connection of the same client
+MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", os.environ.get("AWS_MAX_WORKERS", "10")))
+
+ROLE_SESSION_NAME = "step-functions-manager"
+ROLE_SESSION_DURATION = 3600
+# botocore refreshes credentials in the request path 15 minutes before they expire; refresh them earlier
+BOTOCORE_REFRESH_MARGIN = timedelta(minutes=15)
+ROLE_REFRESH_MARGIN = timedelta(minutes=20)
+
+
+class AssumedRole:
+    """Credentials of an assumed role, renewed ahead of their expiry by the background refresh of the pool"""
+
+    def __init__(self, role_arn: str, sts_client):
+        self.role_arn = role_arn
+        self.sts_client = sts_client
+        self.metadata: dict[str, str] = {}
+        self.credentials = RefreshableCredentials.create_from_metadata(
+            metadata=self.refresh(),
+            refresh_using=self.get_metadata,
+            method="sts-assume-role",
+        )
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromisoformat(self.metadata["expiry_time"])
+
+    def needs_refresh(self, margin: timedelta) -> bool:
+        return self.expires_at - datetime.now(UTC) < margin
+
+    def refresh(self) -> dict[str, str]:
+        """Assume the role again and keep its credentials for the next botocore refresh"""
+        response = self.sts_client.assume_role(
+            RoleArn=self.role_arn,
+            RoleSessionName=ROLE_SESSION_NAME,
+            DurationSeconds=ROLE_SESSION_DURATION,
+        )
+        credentials = response["Credentials"]
+        self.metadata = {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+        return self.metadata
+
+    def get_metadata(self) -> dict[str, str]:
+        """Serve the credentials renewed in the background, only calling STS if the background refresh fell behind"""
+        if self.needs_refresh(BOTOCORE_REFRESH_MARGIN):
+            return self.refresh()
+        return self.metadata
+
+
+class ClientPool:
+    """
+    boto3 clients keyed by service, account, region and assumed role.
+
+    Clients are created once and reused, so their connection pools stay warm. Assumed-role credentials are
+    renewed by a background thread before botocore would refresh them in the request path.
+    """
+
+    def __init__(self, config: Config, refresh_interval: float = 60):
+        self.config = config
+        self.refresh_interval = refresh_interval
+        self.clients: dict[tuple[str, str | None, str | None, str | None], Any] = {}
+        self.roles: dict[str, AssumedRole] = {}
+        self._lock = threading.RLock()
+        self._refresh_thread: threading.Thread | None = None
+
+    def get_client(
+        self,
+        service_name: str,
+        account_id: str | None = None,
+        region_name: str | None = None,
+        role_arn: str | None = None,
+    ):
+        """
+        Get the client of a service for an account and region
+
+        Args:
+            service_name (str): Name of the AWS service
+            account_id (str | None): Account the client is used for, part of the pool key only
+            region_name (str | None): Region of the client, the default region if None
+            role_arn (str | None): Role to assume, the default credentials if None
+
+        Returns:
+            Client throttled by the process-wide API rate limiter
+        """
+        key = (service_name, account_id, region_name, role_arn)
+        with self._lock:
+            if key not in self.clients:
+                self.clients[key] = self._create_client(service_name, region_name, role_arn)
+            return self.clients[key]
+
+    def _create_client(self, service_name: str, region_name: str | None, role_arn: str | None):
+        botocore_session = get_session()
+        if role_arn:
+            # boto3 has no public way to give a session refreshable credentials
+            botocore_session._credentials = self._get_role(role_arn, region_name).credentials  # noqa: SLF001
+
+        session = boto3.Session(botocore_session=botocore_session, region_name=region_name)
+        client = session.client(service_name, config=self.config)
+        api_rate_limiter.register(client)
+        client.meta.events.register("after-call.*", record_api_call)
+        return client
+
+    def _get_role(self, role_arn: str, region_name: str | None) -> AssumedRole:
+        if role_arn not in self.roles:
+            self.roles[role_arn] = AssumedRole(role_arn, self.get_client("sts", region_name=region_name))
+            self._start_refresh_thread()
+        return self.roles[role_arn]
+
+    def _start_refresh_thread(self) -> None:
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(target=self._refresh_roles, name="aws-credentials", daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_roles(self) -> None:
+        while True:
+            time.sleep(self.refresh_interval)
+            for role in list(self.roles.values()):
+                if not role.needs_refresh(ROLE_REFRESH_MARGIN):
+                    continue
+                try:
+                    role.refresh()
+                except Exception as e:
+                    error_msg = f"Error refreshing credentials of {role.role_arn}: {e!s}"
+                    log.error(error_msg)
+
+
+client_pool = ClientPool(CLIENT_CONFIG.merge(Config(max_pool_connections=MAX_POOL_CONNECTIONS)))
@@ -1,5 +1,9 @@
 import os
 import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Literal
@@ -40,6 +44,22 @@ class Environments(BaseModel):
         return v
 
 
+class Roles(BaseModel):
+    production: str | None = None
+    development: str | None = None
+    staging: str | None = None
+
+    @field_validator("*")
+    def validate_arn(cls, v):
+        if v is None:
+            return v
+        arn_pattern = r"^arn:aws:iam::\d{12}:role/.+$"
+        if not re.match(arn_pattern, v):
+            error_msg = f"Invalid role ARN format. Got: {v}."
+            raise ValueError(error_msg)
+        return v
+
+
 class Parameter(BaseModel):
     description: str
     type: ParameterType
@@ -66,32 +86,116 @@ class Files(BaseModel):
 class StepFunctionYamlConfig(BaseModel):
     display_name: str
     environments: Environments
+    roles: Roles | None = None
     parameters: dict[str, Parameter]
     files: Files
 
 
-class StepFunctionConfig:
-    def __init__(self):
-        self.config_dir = "configs/"
-        self.configs = self._load_all_configs()
+@dataclass(frozen=True)
+class ConfigFile:
+    mtime_ns: int
+    config: dict[str, any] | None  # None when the file is not a valid config
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    files: dict[str, ConfigFile]
+    configs: dict[str, dict[str, any]]
+    names_per_environment: dict[str, list[str]]
+    names_per_arn: dict[str, str]
+    environments_per_arn: dict[str, str]
+    roles_per_arn: dict[str, str]
 
-    def _load_all_configs(self) -> dict[str, any]:
-        """Load all step function configurations from YAML files."""
+    @classmethod
+    def build(cls, files: dict[str, ConfigFile]) -> "ConfigSnapshot":
+        """Build the configs and their indexes from the parsed config files."""
         configs = {}
-        for filename in os.listdir(self.config_dir):
-            if filename.endswith(".yaml"):
-                file_path = Path(self.config_dir) / filename
-                try:
-                    with Path(file_path).open() as f:
-                        yaml_content = yaml.safe_load(f)
-                        # Validate the config using Pydantic
-                        config = StepFunctionYamlConfig(**yaml_content)
-                        configs[config.display_name] = yaml_content
-                except Exception as e:
-                    error_msg = f"Error loading config from {filename}: {e!s}"
-                    log.error(error_msg)
-                    continue
-        return configs
+        for filename in sorted(files):
+            config = files[filename].config
+            if config is not None:
+                configs[config["display_name"]] = config
+
+        names_per_environment = defaultdict(list)
+        names_per_arn = {}
+        environments_per_arn = {}
+        roles_per_arn = {}
+        for name, config in configs.items():
+            roles = config.get("roles") or {}
+            for environment, arn in config["environments"].items():
+                names_per_environment[environment].append(name)
+                if arn:
+                    names_per_arn[arn] = name
+                    environments_per_arn[arn] = environment
+                if arn and roles.get(environment):
+                    roles_per_arn[arn] = roles[environment]
+
+        return cls(
+            files=files,
+            configs=configs,
+            names_per_environment=dict(names_per_environment),
+            names_per_arn=names_per_arn,
+            environments_per_arn=environments_per_arn,
+            roles_per_arn=roles_per_arn,
+        )
+
+
+class StepFunctionConfig:
+    def __init__(self, reload_interval: float = 5.0):
+        self.config_dir = "configs/"
+        self.reload_interval = reload_interval
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self._snapshot = ConfigSnapshot.build(self._load_changed_configs({}))
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Get the current configs, reloading the files changed on disk at most once per reload interval."""
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+        return self._snapshot
+
+    @property
+    def configs(self) -> dict[str, dict[str, any]]:
+        return self.snapshot.configs
+
+    def reload(self) -> None:
+        """Re-parse the config files added or modified since the last load and swap in the new snapshot."""
+        with self._reload_lock:
+            self._checked_at = time.monotonic()
+            files = self._load_changed_configs(self._snapshot.files)
+            if files != self._snapshot.files:
+                self._snapshot = ConfigSnapshot.build(files)
+                log.info(f"Reloaded step function configs from {self.config_dir}")
+
+    def _load_changed_configs(self, previous_files: dict[str, ConfigFile]) -> dict[str, ConfigFile]:
+        """Load step function configurations from YAML files, reusing the unchanged ones."""
+        files = {}
+        for entry in os.scandir(self.config_dir):
+            if not entry.name.endswith(".yaml"):
+                continue
+
+            mtime_ns = entry.stat().st_mtime_ns
+            previous = previous_files.get(entry.name)
+            if previous and previous.mtime_ns == mtime_ns:
+                files[entry.name] = previous
+                continue
+
+            files[entry.name] = ConfigFile(mtime_ns=mtime_ns, config=self._load_config(entry.name))
+        return files
+
+    def _load_config(self, filename: str) -> dict[str, any] | None:
+        """Load and validate a single step function configuration."""
+        file_path = Path(self.config_dir) / filename
+        try:
+            with Path(file_path).open() as f:
+                yaml_content = yaml.safe_load(f)
+                # Validate the config using Pydantic
+                StepFunctionYamlConfig(**yaml_content)
+                return yaml_content
+        except Exception as e:
+            error_msg = f"Error loading config from {filename}: {e!s}"
+            log.error(error_msg)
+            return None
 
     def get_step_function_params(self, name: str) -> dict[str, any]:
         """Get parameters for a specific step function."""
@@ -105,9 +209,25 @@ class StepFunctionConfig:
         except Exception:
             return ""
 
+    def get_config_name(self, arn: str) -> str | None:
+        """Get the name of the step function config using a specific state machine ARN."""
+        return self.snapshot.names_per_arn.get(arn)
+
+    def get_environment(self, arn: str) -> str | None:
+        """Get the environment of the step function config using a specific state machine ARN."""
+        return self.snapshot.environments_per_arn.get(arn)
+
+    def get_role_arn(self, arn: str) -> str | None:
+        """Get the role to assume to access a specific state machine ARN, None for the default credentials."""
+        return self.snapshot.roles_per_arn.get(arn)
+
+    def list_state_machine_arns(self) -> list[str]:
+        """List the state machine ARNs of every step function and environment."""
+        return list(self.snapshot.names_per_arn)
+
     def list_step_functions_per_environment(self, environment: str) -> list[str]:
         """List all step functions available for a specific environment."""
-        return [k for k, v in self.configs.items() if environment in v["environments"]]
+        return list(self.snapshot.names_per_environment.get(environment, []))
 
     def get_files_prefix(self, name: str, execution_id: str) -> str:
         """Get the S3 prefix for a specific step function and execution ID."""
@@ -116,4 +236,4 @@ class StepFunctionConfig:
         return f"{output_directory}/{execution_id}/"
 
 
-SFC = StepFunctionConfig()
+SFC = StepFunctionConfig(reload_interval=float(os.environ.get("CONFIG_RELOAD_INTERVAL", "5")))
@@ -6,8 +6,12 @@ def format_duration(start_date: datetime, stop_date: datetime) -> str:
     if not start_date or not stop_date:
         return "-"
 
-    duration = stop_date - start_date
-    total_seconds = int(duration.total_seconds())
+    return format_seconds((stop_date - start_date).total_seconds())
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a number of seconds in a human-readable format"""
+    total_seconds = int(seconds)
 
     hours = total_seconds // 3600
     minutes = (total_seconds % 3600) // 60
@@ -18,3 +22,12 @@ def format_duration(start_date: datetime, stop_date: datetime) -> str:
     if minutes > 0:
         return f"{minutes}m {seconds}s"
     return f"{seconds}s"
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes in a human-readable format"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:  # noqa: PLR2004
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,150 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+from utils.execution_index import EXECUTION_STATUSES, ExecutionIndex
+
+# Rolling windows of the stats panel, None covers every indexed execution
+ANALYTICS_WINDOWS: dict[str, timedelta | None] = {
+    "24h": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "All": None,
+}
+# Windows move with the clock, so cached stats are recomputed at least once per this many seconds
+WINDOW_RESOLUTION = 60
+
+STATUS_CODES = {status: code for code, status in enumerate(EXECUTION_STATUSES)}
+UNKNOWN_STATUS_CODE = len(EXECUTION_STATUSES)
+RUNNING_CODE = STATUS_CODES["RUNNING"]
+FAILED_CODES = [STATUS_CODES[status] for status in ("FAILED", "TIMED_OUT", "ABORTED")]
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    runs: int
+    running: int
+    finished: int
+    failed: int
+    runs_per_hour: float
+    failure_rate: float | None
+    duration_p50: float | None  # seconds, of finished executions
+    duration_p90: float | None
+    duration_p99: float | None
+
+
+class ExecutionColumns:
+    """Start dates, stop dates and status codes of the executions of an index, as columnar arrays"""
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.version = 0
+        self.positions: dict[str, int] = {}
+        self.starts = np.empty(capacity, dtype=np.float64)  # epoch seconds
+        self.stops = np.empty(capacity, dtype=np.float64)  # epoch seconds, NaN while running
+        self.statuses = np.empty(capacity, dtype=np.int8)
+
+    def update(self, index: ExecutionIndex) -> None:
+        """Apply the executions added or changed in the index since the last update"""
+        if index.version == self.version:
+            return
+
+        changed, version = index.changed_since(self.version)
+        self._apply(changed)
+        if self.size != len(index.executions):
+            # Executions were removed from the index: rebuild the columns from scratch
+            self.size = 0
+            self.positions.clear()
+            changed, version = index.changed_since(0)
+            self._apply(changed)
+        self.version = version
+
+    def view(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.starts[: self.size], self.stops[: self.size], self.statuses[: self.size]
+
+    def _apply(self, executions: list[dict]) -> None:
+        for execution in executions:
+            position = self.positions.get(execution["executionArn"])
+            if position is None:
+                position = self.positions[execution["executionArn"]] = self.size
+                self.size += 1
+                if self.size > len(self.starts):
+                    self._grow()
+
+            stop_date = execution.get("stopDate")
+            self.starts[position] = execution["startDate"].timestamp()
+            self.stops[position] = stop_date.timestamp() if stop_date else np.nan
+            self.statuses[position] = STATUS_CODES.get(execution["status"], UNKNOWN_STATUS_CODE)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.starts)
+        self.starts = np.resize(self.starts, capacity)
+        self.stops = np.resize(self.stops, capacity)
+        self.statuses = np.resize(self.statuses, capacity)
+
+
+def compute_window_stats(
+    starts: np.ndarray,
+    stops: np.ndarray,
+    statuses: np.ndarray,
+    now: float,
+    window: timedelta | None,
+) -> WindowStats:
+    """Compute the stats of the executions started in the window ending now"""
+    in_window = starts >= now - window.total_seconds() if window else np.ones(len(starts), dtype=bool)
+    window_statuses = statuses[in_window]
+    finished = in_window & (statuses != RUNNING_CODE) & ~np.isnan(stops)
+    durations = stops[finished] - starts[finished]
+
+    runs = int(in_window.sum())
+    failed = int(np.isin(window_statuses, FAILED_CODES).sum())
+    if window:
+        hours = window.total_seconds() / 3600
+    elif runs:
+        hours = max((now - starts.min()) / 3600, 1)
+    else:
+        hours = 1
+
+    p50, p90, p99 = np.percentile(durations, [50, 90, 99]) if durations.size else (None, None, None)
+    return WindowStats(
+        runs=runs,
+        running=int((window_statuses == RUNNING_CODE).sum()),
+        finished=int(durations.size),
+        failed=failed,
+        runs_per_hour=float(runs / hours),
+        failure_rate=failed / durations.size if durations.size else None,
+        duration_p50=None if p50 is None else float(p50),
+        duration_p90=None if p90 is None else float(p90),
+        duration_p99=None if p99 is None else float(p99),
+    )
+
+
+class ExecutionAnalytics:
+    """
+    Duration and throughput stats of a state machine over rolling windows.
+
+    The executions of its index are kept as columnar arrays, updated with the index changes only, and the stats of
+    each window are cached until the index changes or the window moves by WINDOW_RESOLUTION seconds.
+    """
+
+    def __init__(self, index: ExecutionIndex):
+        self.index = index
+        self.columns = ExecutionColumns()
+        self._cache: dict[str, tuple[tuple[int, int], WindowStats]] = {}
+        self._lock = threading.Lock()
+
+    def get_stats(self, window: str) -> WindowStats:
+        """Get the stats of the executions started in one of the ANALYTICS_WINDOWS"""
+        now = time.time()
+        with self._lock:
+            self.columns.update(self.index)
+            key = (self.columns.version, int(now // WINDOW_RESOLUTION))
+            cached = self._cache.get(window)
+            if cached and cached[0] == key:
+                return cached[1]
+
+            stats = compute_window_stats(*self.columns.view(), now, ANALYTICS_WINDOWS[window])
+            self._cache[window] = (key, stats)
+            return stats
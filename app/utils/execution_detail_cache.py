@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+EXECUTION_DETAIL_CACHE_PATH = os.environ.get("EXECUTION_DETAIL_CACHE_PATH", ".nicegui/execution_details.sqlite3")
+# Maximum number of cached entries, up to three per execution; the least recently used ones are evicted
+EXECUTION_DETAIL_CACHE_SIZE = int(os.environ.get("EXECUTION_DETAIL_CACHE_SIZE", "30000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS execution_details (
+    execution_arn TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    content TEXT NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (execution_arn, kind)
+);
+CREATE INDEX IF NOT EXISTS execution_details_by_access ON execution_details (accessed_at);
+"""
+
+# Kinds of detail data cached per execution
+DETAILS = "details"  # describe_execution response
+HISTORY = "history"  # reduced history, with the definition revision the execution ran on
+FILES = "files"  # listing of the generated files
+
+
+def encode_datetime(value: Any) -> dict:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    error_msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(error_msg)
+
+
+def decode_datetime(value: dict) -> Any:
+    return datetime.fromisoformat(value["$datetime"]) if value.keys() == {"$datetime"} else value
+
+
+class ExecutionDetailCache:
+    """
+    Durable SQLite cache of the detail data of terminal executions, stored as JSON.
+
+    A terminal execution never changes until it is redriven, so once cached, opening its detail page again, even
+    after a restart, makes no AWS call. Entries are dropped when the execution is redriven, and the least recently
+    used ones once there are more than max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = EXECUTION_DETAIL_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(execution_details)")}
+        if columns and "accessed_at" not in columns:
+            # Cache written by a version without eviction: start over rather than migrate it
+            self._connection.execute("DROP TABLE execution_details")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, execution_arn: str, kind: str) -> Any:
+        """Get cached detail data of an execution, None if not cached"""
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT content FROM execution_details WHERE execution_arn = ? AND kind = ?",
+                (execution_arn, kind),
+            ).fetchone()
+            if row:
+                self._connection.execute(
+                    "UPDATE execution_details SET accessed_at = ? WHERE execution_arn = ? AND kind = ?",
+                    (time.time(), execution_arn, kind),
+                )
+        return json.loads(row[0], object_hook=decode_datetime) if row else None
+
+    def put(self, execution_arn: str, kind: str, content: Any) -> None:
+        """Cache detail data of a terminal execution"""
+        encoded = json.dumps(content, default=encode_datetime, separators=(",", ":"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO execution_details (execution_arn, kind, content, accessed_at) VALUES (?, ?, ?, ?)",
+                (execution_arn, kind, encoded, time.time()),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM execution_details WHERE rowid IN (
+                    SELECT rowid FROM execution_details ORDER BY accessed_at
+                    LIMIT max(0, (SELECT COUNT(*) FROM execution_details) - ?)
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def forget(self, execution_arn: str) -> None:
+        """Drop every cached detail data of an execution, e.g. when it is redriven"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM execution_details WHERE execution_arn = ?", (execution_arn,))
+
+
+def open_execution_detail_cache(path: str) -> ExecutionDetailCache | None:
+    """Open the execution detail cache, None if it is disabled with an empty path"""
+    return ExecutionDetailCache(path) if path else None
+
+
+execution_detail_cache = open_execution_detail_cache(EXECUTION_DETAIL_CACHE_PATH)
@@ -0,0 +1,111 @@
+import itertools
+import os
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+
+from loguru import logger as log
+from nicegui import Client
+
+# Token event senders must authenticate with in an "Authorization: Bearer <token>" header; events are rejected if unset
+EXECUTION_EVENTS_TOKEN = os.environ.get("EXECUTION_EVENTS_TOKEN", "")
+# Poll interval of open execution pages once status change events are received, to catch missed events
+EXECUTION_RECONCILE_INTERVAL = float(os.environ.get("EXECUTION_RECONCILE_INTERVAL", "60"))
+# Events are considered delivered until none is received for this many seconds, then polling speeds back up
+EXECUTION_EVENTS_LIVE_WINDOW = 2 * EXECUTION_RECONCILE_INTERVAL
+
+STATUS_CHANGE_DETAIL_TYPE = "Step Functions Execution Status Change"
+
+
+def parse_status_change_event(event: dict) -> dict | None:
+    """
+    Convert an EventBridge execution status change event to an execution as listed by list_executions
+
+    Args:
+        event (dict): EventBridge event, with the execution in its detail and dates in epoch milliseconds
+
+    Returns:
+        dict | None: The execution, None for events of another type
+    """
+    if event.get("detail-type") != STATUS_CHANGE_DETAIL_TYPE:
+        return None
+
+    detail = event["detail"]
+    execution = {
+        "executionArn": detail["executionArn"],
+        "stateMachineArn": detail["stateMachineArn"],
+        "name": detail["name"],
+        "status": detail["status"],
+        "startDate": datetime.fromtimestamp(detail["startDate"] / 1000, tz=UTC),
+    }
+    if detail.get("stopDate"):
+        execution["stopDate"] = datetime.fromtimestamp(detail["stopDate"] / 1000, tz=UTC)
+    if detail.get("redriveCount"):
+        execution["redriveCount"] = detail["redriveCount"]
+    return execution
+
+
+@dataclass
+class Subscription:
+    client: Client
+    callback: Callable[[dict], Awaitable[None]]
+
+
+class ExecutionEventHub:
+    """Pushes the executions changed by status change events to the clients showing their state machine"""
+
+    def __init__(self, live_window: float = EXECUTION_EVENTS_LIVE_WINDOW):
+        self.subscriptions: defaultdict[str, dict[int, Subscription]] = defaultdict(dict)
+        self.live_window = live_window
+        self.last_received_at: float | None = None  # time.monotonic() of the last event received
+        self._keys = itertools.count()
+
+    @property
+    def live(self) -> bool:
+        """Whether status change events are being delivered, so polling can drop to the reconciliation interval"""
+        return self.last_received_at is not None and time.monotonic() - self.last_received_at < self.live_window
+
+    def mark_received(self) -> None:
+        """Record that a status change event was received"""
+        self.last_received_at = time.monotonic()
+
+    def subscribe(
+        self,
+        step_function_arn: str,
+        client: Client,
+        callback: Callable[[dict], Awaitable[None]],
+    ) -> Callable[[], None]:
+        """Subscribe a client to the changed executions of a state machine and return the function that unsubscribes it"""
+        key = next(self._keys)
+        self.subscriptions[step_function_arn][key] = Subscription(client=client, callback=callback)
+        return partial(self.unsubscribe, step_function_arn, key)
+
+    def unsubscribe(self, step_function_arn: str, key: int) -> None:
+        subscriptions = self.subscriptions.get(step_function_arn)
+        if subscriptions is None:
+            return
+
+        subscriptions.pop(key, None)
+        if not subscriptions:
+            del self.subscriptions[step_function_arn]
+
+    async def publish(self, execution: dict) -> None:
+        """Push a changed execution to the subscribers of its state machine, dropping those of deleted clients"""
+        step_function_arn = execution["stateMachineArn"]
+        for key, subscription in list(self.subscriptions.get(step_function_arn, {}).items()):
+            if subscription.client.id not in Client.instances:
+                self.unsubscribe(step_function_arn, key)
+                continue
+
+            try:
+                with subscription.client:
+                    await subscription.callback(execution)
+            except Exception as e:
+                error_msg = f"Error pushing status change of {execution['executionArn']}: {e!s}"
+                log.error(error_msg)
+
+
+execution_events = ExecutionEventHub()
@@ -0,0 +1,89 @@
+import json
+import threading
+
+from utils.state_machine_graph import StateMachineGraph
+from utils.state_timeline import StateTimeline
+
+TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "TIMED_OUT", "ABORTED")
+TERMINAL_EVENT_TYPES = ("ExecutionSucceeded", "ExecutionFailed", "ExecutionTimedOut", "ExecutionAborted")
+
+
+class ExecutionHistory:
+    """
+    Reduced history of a single execution, kept up to date incrementally.
+
+    The id of the last applied event is used as a cursor: every sync walks the history newest first and
+    stops at the cursor, so only new events are downloaded. Once the execution reaches a terminal event
+    the history is never fetched again, unless it is reopened by a redrive.
+    """
+
+    def __init__(self, execution_arn: str):
+        self.execution_arn = execution_arn
+        self.last_event_id = 0
+        self.states_status: dict[str, str] = {}
+        self.timeline = StateTimeline()
+        self.terminal = False
+        self.graph: StateMachineGraph | None = None  # definition revision the execution runs on
+        self._lock = threading.Lock()
+
+    def sync(self, sfn_client) -> None:
+        """Fetch and apply the events added since the last sync"""
+        with self._lock:
+            if self.terminal:
+                return
+
+            for event in self._fetch_new_events(sfn_client):
+                self.apply(event)
+
+    def dump(self) -> dict:
+        """Get the reduced state of a terminal history and its definition revision as plain data, to persist them"""
+        with self._lock:
+            return {
+                "last_event_id": self.last_event_id,
+                "states_status": self.states_status,
+                "timeline": self.timeline.dump(),
+                "definition": json.dumps(self.graph.definition),
+            }
+
+    @classmethod
+    def load(cls, execution_arn: str, data: dict) -> "ExecutionHistory":
+        """Rebuild a terminal history from the data dumped by `dump`"""
+        history = cls(execution_arn)
+        history.last_event_id = data["last_event_id"]
+        history.states_status = data["states_status"]
+        history.timeline = StateTimeline.load(data["timeline"])
+        history.terminal = True
+        history.graph = StateMachineGraph.from_definition(data["definition"])
+        return history
+
+    def reopen(self) -> None:
+        """Resume tracking after the execution has been redriven"""
+        self.terminal = False
+
+    def apply(self, event: dict) -> None:
+        """Apply a single history event to the reduced state and to the state timings"""
+        event_type = event["type"]
+        if "StateEntered" in event_type:
+            self.states_status[event["stateEnteredEventDetails"]["name"]] = "RUNNING"
+        elif "StateExited" in event_type:
+            self.states_status[event["stateExitedEventDetails"]["name"]] = "COMPLETED"
+        elif event_type in TERMINAL_EVENT_TYPES:
+            self.terminal = True
+        elif event_type == "ExecutionRedriven":
+            self.terminal = False
+
+        self.timeline.apply(event)
+        if self.terminal:
+            self.timeline.compact()
+        self.last_event_id = event["id"]
+
+    def _fetch_new_events(self, sfn_client) -> list[dict]:
+        """Get the events newer than the cursor, oldest first"""
+        new_events = []
+        paginator = sfn_client.get_paginator("get_execution_history")
+        for page in paginator.paginate(executionArn=self.execution_arn, reverseOrder=True):
+            for event in page["events"]:
+                if event["id"] <= self.last_event_id:
+                    return new_events[::-1]
+                new_events.append(event)
+        return new_events[::-1]
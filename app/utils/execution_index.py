@@ -0,0 +1,229 @@
+import bisect
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+from botocore.exceptions import ClientError
+
+EXECUTION_STATUSES = ("RUNNING", "SUCCEEDED", "FAILED", "TIMED_OUT", "ABORTED")
+
+
+class ExecutionIndex:
+    """
+    In-process index of the executions of a single state machine.
+
+    The first sync walks the whole `list_executions` pagination once. Every following sync only fetches
+    executions started after the newest one already indexed (the startDate watermark) and re-checks the
+    executions that are still RUNNING, so counts and the latest executions are served from memory.
+
+    Syncs call AWS without holding the lock of the index, only taken to apply their changes, so reads from other
+    threads never wait for a pagination.
+    """
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, step_function_arn: str):
+        self.step_function_arn = step_function_arn
+        self.executions: dict[str, dict] = {}
+        self.watermark: datetime | None = None
+        self.version = 0
+        self._order: list[str] = []  # execution ARNs, oldest first
+        self._counts: Counter = Counter()
+        self._running: set[str] = set()
+        # Version of the last change of each execution, ordered by version so changes since one are at the end
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # one sync at a time
+
+    def load(self, executions: list[dict], watermark: datetime | None) -> None:
+        """
+        Seed an empty index with previously stored executions, oldest first, so the next sync is incremental
+
+        The watermark is the one of the last sync, not the newest stored execution, which may have been pushed by
+        a status change event: the executions started between the two were never listed yet. Without it, the next
+        sync walks every execution again.
+        """
+        with self._lock:
+            if self.executions or not executions:
+                return
+            for execution in executions:
+                self._order.append(execution["executionArn"])
+                self._upsert(execution)
+            self.watermark = watermark
+
+    def apply(self, execution: dict) -> dict | None:
+        """
+        Apply an execution pushed by a status change event and return it merged with the indexed one
+
+        Events may arrive out of order: one reporting a terminal execution as RUNNING again without a new redrive is
+        older than the indexed status and is ignored. The watermark is left as is, so the next sync still fetches the
+        executions started since, whose events may have been missed.
+
+        Args:
+            execution (dict): Execution as listed by list_executions
+
+        Returns:
+            dict | None: The merged execution, None if the event was ignored
+        """
+        with self._lock:
+            arn = execution["executionArn"]
+            previous = self.executions.get(arn)
+            if previous is None:
+                self._upsert(execution)
+                bisect.insort(self._order, arn, key=lambda indexed_arn: self.executions[indexed_arn]["startDate"])
+                return execution
+
+            redriven = execution.get("redriveCount", 0) > previous.get("redriveCount", 0)
+            if previous["status"] != "RUNNING" and execution["status"] == "RUNNING" and not redriven:
+                return None
+
+            merged = {**previous, **execution}
+            if execution["status"] == "RUNNING":
+                merged.pop("stopDate", None)
+            if merged != previous:
+                self._upsert(merged)
+            return merged
+
+    def sync(self, sfn_client) -> None:
+        """Bring the index up to date with the executions stored in AWS"""
+        with self._sync_lock:
+            self._fetch_new_executions(sfn_client)
+            self._recheck_running_executions(sfn_client)
+
+    def changed_since(self, version: int) -> tuple[list[dict], int]:
+        """Get the executions added or changed after a version of the index, oldest change first, and the current version"""
+        with self._lock:
+            changed = []
+            for arn, changed_at in reversed(self._versions.items()):
+                if changed_at <= version:
+                    break
+                changed.append(self.executions[arn])
+            changed.reverse()
+            return changed, self.version
+
+    def get(self, execution_arn: str) -> dict | None:
+        """Get an indexed execution, None if it is not indexed"""
+        with self._lock:
+            return self.executions.get(execution_arn)
+
+    def get_counts(self) -> dict[str, int]:
+        """Get counts of indexed executions by status"""
+        with self._lock:
+            counts = {status: self._counts.get(status, 0) for status in EXECUTION_STATUSES}
+            counts.update({status: count for status, count in self._counts.items() if status not in counts and count})
+        return counts
+
+    def latest(self, max_results: int) -> list[dict]:
+        """Get the most recent indexed executions, newest first"""
+        with self._lock:
+            return [self.executions[arn] for arn in reversed(self._order[-max_results:])]
+
+    def select(
+        self,
+        statuses: tuple[str, ...] | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+    ) -> list[dict]:
+        """Get the indexed executions matching the given statuses, start date range and name, newest first"""
+        name_contains = name_contains.lower() if name_contains else None
+        with self._lock:
+            return [
+                execution
+                for execution in (self.executions[arn] for arn in reversed(self._order))
+                if (statuses is None or execution["status"] in statuses)
+                and (started_after is None or execution["startDate"] >= started_after)
+                and (started_before is None or execution["startDate"] < started_before)
+                and (name_contains is None or name_contains in execution["name"].lower())
+            ]
+
+    def _fetch_new_executions(self, sfn_client) -> None:
+        """Fetch executions newer than the watermark; the API returns them newest first"""
+        new_executions = []
+        paginator = sfn_client.get_paginator("list_executions")
+        pages = paginator.paginate(
+            stateMachineArn=self.step_function_arn,
+            PaginationConfig={"PageSize": self.PAGE_SIZE},
+        )
+        for page in pages:
+            reached_watermark = False
+            for execution in page["executions"]:
+                if self.watermark and execution["startDate"] < self.watermark:
+                    reached_watermark = True
+                    break
+                if execution["executionArn"] not in self.executions:
+                    new_executions.append(execution)
+            if reached_watermark:
+                break
+
+        with self._lock:
+            self._add_new_executions(new_executions)
+
+    def _add_new_executions(self, new_executions: list[dict]) -> None:
+        """Index the executions listed by a sync, newest first, and move the watermark to the newest one"""
+        for execution in reversed(new_executions):
+            arn = execution["executionArn"]
+            self._upsert(execution)
+            if self._order and execution["startDate"] < self.executions[self._order[-1]]["startDate"]:
+                # Older than an execution pushed by a status change event
+                bisect.insort(self._order, arn, key=lambda indexed_arn: self.executions[indexed_arn]["startDate"])
+            else:
+                self._order.append(arn)
+
+        if new_executions:
+            self.watermark = new_executions[0]["startDate"]
+
+    def _recheck_running_executions(self, sfn_client) -> None:
+        """Refresh indexed executions that were RUNNING, or that are RUNNING again after a redrive"""
+        running_now = {}
+        paginator = sfn_client.get_paginator("list_executions")
+        for page in paginator.paginate(stateMachineArn=self.step_function_arn, statusFilter="RUNNING"):
+            for execution in page["executions"]:
+                running_now[execution["executionArn"]] = execution
+
+        with self._lock:
+            for arn, execution in running_now.items():
+                if arn in self.executions and self.executions[arn] != execution:
+                    self._upsert(execution)
+            no_longer_running = self._running - running_now.keys()
+
+        for arn in no_longer_running:
+            try:
+                details = sfn_client.describe_execution(executionArn=arn)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ExecutionDoesNotExist":
+                    raise
+                details = None
+
+            with self._lock:
+                if arn not in self.executions:
+                    continue
+                if details is None:
+                    self._remove(arn)
+                else:
+                    self._upsert({**self.executions[arn], "status": details["status"], "stopDate": details.get("stopDate")})
+
+    def _upsert(self, execution: dict) -> None:
+        arn = execution["executionArn"]
+        previous = self.executions.get(arn)
+        if previous:
+            self._counts[previous["status"]] -= 1
+
+        self.executions[arn] = execution
+        self._counts[execution["status"]] += 1
+
+        if execution["status"] == "RUNNING":
+            self._running.add(arn)
+        else:
+            self._running.discard(arn)
+        self.version += 1
+        self._versions[arn] = self.version
+        self._versions.move_to_end(arn)
+
+    def _remove(self, arn: str) -> None:
+        execution = self.executions.pop(arn)
+        self._counts[execution["status"]] -= 1
+        self._running.discard(arn)
+        self._versions.pop(arn, None)
+        self._order.remove(arn)
+        self.version += 1
@@ -0,0 +1,242 @@
+import asyncio
+import contextlib
+import itertools
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+
+from loguru import logger as log
+from nicegui import Client, background_tasks
+from utils.async_aws_manager import async_aws_manager
+from utils.execution_events import EXECUTION_RECONCILE_INTERVAL, execution_events
+from utils.execution_history import TERMINAL_STATUSES
+from utils.rate_limiter import BACKGROUND, call_priority
+from utils.state_machine_graph import StateMachineGraph
+from utils.state_timeline import StateTiming
+
+# Polls come every EXECUTION_POLL_MIN_INTERVAL seconds after a change, then back off exponentially from
+# EXECUTION_POLL_INTERVAL up to EXECUTION_POLL_MAX_INTERVAL while nothing changes
+EXECUTION_POLL_INTERVAL = float(os.environ.get("EXECUTION_POLL_INTERVAL", "5"))
+EXECUTION_POLL_MIN_INTERVAL = float(os.environ.get("EXECUTION_POLL_MIN_INTERVAL", "2"))
+EXECUTION_POLL_MAX_INTERVAL = float(os.environ.get("EXECUTION_POLL_MAX_INTERVAL", "30"))
+PAUSED_CHECK_INTERVAL = 300
+
+
+@dataclass
+class ExecutionSnapshot:
+    details: dict
+    graph: StateMachineGraph
+    states_status: dict
+    state_timings: tuple[StateTiming, ...] = ()
+
+    @property
+    def status(self) -> str | None:
+        return self.details.get("status")
+
+    def differs_from(self, other: "ExecutionSnapshot | None") -> bool:
+        """Check whether the execution or any of its states changed status or timing"""
+        return (
+            other is None
+            or self.status != other.status
+            or self.states_status != other.states_status
+            or self.state_timings != other.state_timings
+        )
+
+
+@dataclass
+class Subscription:
+    client: Client
+    callback: Callable[[ExecutionSnapshot], Awaitable[None]]
+    visible: bool = True  # whether the tab of the client is shown
+
+
+async def fetch_snapshot(execution_arn: str) -> ExecutionSnapshot:
+    """Fetch execution details and states status from AWS"""
+    details = await async_aws_manager.get_execution_details(execution_arn)
+    graph, states_status, state_timings = await async_aws_manager.get_states_info(
+        details["stateMachineArn"], details["executionArn"], details["status"]
+    )
+    return ExecutionSnapshot(details=details, graph=graph, states_status=states_status, state_timings=state_timings)
+
+
+class ExecutionWatcher:
+    """
+    Polls a single execution on an adaptive schedule and pushes changes to every subscribed client.
+
+    Polls come quickly after a change and back off exponentially while nothing changes. They pause while the
+    execution is terminal or every subscribed tab is hidden, until the watcher is woken up, e.g. by a redrive.
+    """
+
+    def __init__(self, execution_arn: str, poller: "ExecutionPoller"):
+        self.execution_arn = execution_arn
+        self.poller = poller
+        self.delay = poller.interval
+        self.snapshot: ExecutionSnapshot | None = None
+        self.subscriptions: dict[int, Subscription] = {}
+        self.task: asyncio.Task | None = None
+        self.wakeup = asyncio.Event()
+
+    @property
+    def terminal(self) -> bool:
+        return self.snapshot is not None and self.snapshot.status in TERMINAL_STATUSES
+
+    @property
+    def paused(self) -> bool:
+        """Whether the execution can no longer change, or no subscribed tab is visible"""
+        return self.terminal or not any(subscription.visible for subscription in self.subscriptions.values())
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = background_tasks.create(self.run(), name=f"watch {self.execution_arn}")
+
+    def wake(self) -> None:
+        """Poll now, even while paused, e.g. when a status change event was received or the execution was redriven"""
+        self.wakeup.set()
+
+    def prune(self) -> None:
+        """Drop subscriptions of clients that were deleted without a disconnect event"""
+        for key, subscription in list(self.subscriptions.items()):
+            if subscription.client.id not in Client.instances:
+                del self.subscriptions[key]
+
+    async def run(self) -> None:
+        call_priority.set(BACKGROUND)
+        while self.subscriptions:
+            # Paused watchers still time out now and then, to drop the subscriptions of deleted clients
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.wakeup.wait(), PAUSED_CHECK_INTERVAL if self.paused else self.delay)
+            woken = self.wakeup.is_set()
+            self.wakeup.clear()
+            self.prune()
+            if not self.subscriptions:
+                break
+            if self.paused and not woken:
+                continue
+
+            try:
+                snapshot = await fetch_snapshot(self.execution_arn)
+            except Exception as e:
+                error_msg = f"Error polling execution {self.execution_arn}: {e!s}"
+                log.error(error_msg)
+                self.delay = self.poller.next_delay(self.delay, changed=False)
+                continue
+
+            changed = snapshot.differs_from(self.snapshot)
+            self.snapshot = snapshot
+            self.delay = self.poller.next_delay(self.delay, changed=changed or woken)
+            if changed:
+                await self.publish(snapshot)
+
+        self.poller.drop_watcher(self)
+
+    async def publish(self, snapshot: ExecutionSnapshot) -> None:
+        for subscription in list(self.subscriptions.values()):
+            try:
+                await subscription.callback(snapshot)
+            except Exception as e:
+                error_msg = f"Error pushing update of {self.execution_arn}: {e!s}"
+                log.error(error_msg)
+
+
+class ExecutionPoller:
+    """
+    Shares one ExecutionWatcher per execution ARN between every open tab.
+
+    While status change events are received, watchers are woken up by them and back off up to the slower
+    reconciliation interval instead, only polling to pick up state transitions and any missed event.
+    """
+
+    def __init__(
+        self,
+        interval: float = EXECUTION_POLL_INTERVAL,
+        min_interval: float = EXECUTION_POLL_MIN_INTERVAL,
+        max_interval: float = EXECUTION_POLL_MAX_INTERVAL,
+        reconcile_interval: float = EXECUTION_RECONCILE_INTERVAL,
+    ):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.reconcile_interval = reconcile_interval
+        self.watchers: dict[str, ExecutionWatcher] = {}
+        self._keys = itertools.count()
+
+    def next_delay(self, delay: float, changed: bool) -> float:
+        """Get the delay before the next poll: short after a change, as transitions come in bursts, doubled otherwise"""
+        if changed:
+            return self.min_interval
+        max_interval = max(self.max_interval, self.reconcile_interval) if execution_events.live else self.max_interval
+        return min(max(2 * delay, self.interval), max_interval)
+
+    def notify(self, execution_arn: str) -> None:
+        """Make the watcher of an execution poll now, if the execution is watched"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher:
+            watcher.wake()
+
+    def invalidate(self, execution_arn: str) -> None:
+        """Drop the snapshot of an execution changed by this app, e.g. redriven, and poll it now"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher:
+            watcher.snapshot = None
+            watcher.wake()
+
+    def set_visible(self, execution_arn: str, client: Client, visible: bool) -> None:
+        """Pause or resume the polls for a client whose tab was hidden or shown; a shown tab is updated right away"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher is None:
+            return
+
+        for subscription in watcher.subscriptions.values():
+            if subscription.client is client:
+                subscription.visible = visible
+        if visible and not watcher.terminal:
+            watcher.wake()
+
+    async def get_snapshot(self, execution_arn: str) -> ExecutionSnapshot:
+        """Get the latest snapshot of an execution, reusing the one of an active watcher if any"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher and watcher.snapshot:
+            return watcher.snapshot
+        return await fetch_snapshot(execution_arn)
+
+    def subscribe(
+        self,
+        execution_arn: str,
+        client: Client,
+        callback: Callable[[ExecutionSnapshot], Awaitable[None]],
+        snapshot: ExecutionSnapshot | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe a client to the changes of an execution and return the function that unsubscribes it"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher is None:
+            watcher = self.watchers[execution_arn] = ExecutionWatcher(execution_arn, self)
+        elif watcher.paused and not watcher.terminal:
+            # The snapshot of a watcher paused by hidden tabs may be stale for the new tab
+            watcher.wake()
+        if watcher.snapshot is None:
+            watcher.snapshot = snapshot
+
+        key = next(self._keys)
+        watcher.subscriptions[key] = Subscription(client=client, callback=callback)
+        watcher.start()
+        return partial(self.unsubscribe, execution_arn, key)
+
+    def unsubscribe(self, execution_arn: str, key: int) -> None:
+        """Remove a subscription; the watcher is dropped together with its last subscriber"""
+        watcher = self.watchers.get(execution_arn)
+        if watcher is None:
+            return
+
+        watcher.subscriptions.pop(key, None)
+        if not watcher.subscriptions:
+            if watcher.task and watcher.task is not asyncio.current_task():
+                watcher.task.cancel()
+            self.drop_watcher(watcher)
+
+    def drop_watcher(self, watcher: ExecutionWatcher) -> None:
+        if self.watchers.get(watcher.execution_arn) is watcher:
+            del self.watchers[watcher.execution_arn]
+
+
+execution_poller = ExecutionPoller()
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+EXECUTION_STORE_PATH = os.environ.get("EXECUTION_STORE_PATH", ".nicegui/executions.sqlite3")
+EXECUTION_STORE_SYNC_INTERVAL = float(os.environ.get("EXECUTION_STORE_SYNC_INTERVAL", "60"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_arn TEXT PRIMARY KEY,
+    state_machine_arn TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_date REAL NOT NULL,
+    stop_date REAL,
+    input_hash TEXT,
+    config_name TEXT,
+    environment TEXT
+);
+CREATE INDEX IF NOT EXISTS executions_by_start_date ON executions (state_machine_arn, start_date DESC);
+CREATE INDEX IF NOT EXISTS executions_by_status ON executions (state_machine_arn, status, start_date DESC);
+CREATE INDEX IF NOT EXISTS executions_by_name ON executions (state_machine_arn, name);
+CREATE INDEX IF NOT EXISTS executions_by_input_hash ON executions (state_machine_arn, input_hash);
+CREATE TABLE IF NOT EXISTS synced_state_machines (
+    state_machine_arn TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    watermark REAL
+);
+"""
+
+COLUMNS = "execution_arn, state_machine_arn, name, status, start_date, stop_date, input_hash"
+
+
+def hash_input(input_data: str | None) -> str:
+    """Hash an execution input, ignoring key order and whitespace of JSON inputs"""
+    try:
+        canonical = json.dumps(json.loads(input_data or "null"), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        canonical = input_data
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def to_timestamp(value: datetime | None) -> float | None:
+    return value.timestamp() if value else None
+
+
+def to_execution(row: tuple) -> dict:
+    """Convert a row to the shape of the executions returned by list_executions"""
+    execution_arn, state_machine_arn, name, status, start_date, stop_date, input_hash = row
+    execution = {
+        "executionArn": execution_arn,
+        "stateMachineArn": state_machine_arn,
+        "name": name,
+        "status": status,
+        "startDate": datetime.fromtimestamp(start_date, UTC),
+    }
+    if stop_date is not None:
+        execution["stopDate"] = datetime.fromtimestamp(stop_date, UTC)
+    if input_hash is not None:
+        execution["inputHash"] = input_hash
+    return execution
+
+
+class ExecutionStore:
+    """
+    Durable SQLite store of execution metadata.
+
+    It is written from the execution indexes by the background sync and keeps executions past the 90 days
+    Step Functions retains them, so filters, name search and counts over any date range are indexed queries.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(synced_state_machines)")}
+        if "watermark" not in columns:
+            # Stores written before watermarks were kept: the next sync of each state machine walks every execution
+            self._connection.execute("ALTER TABLE synced_state_machines ADD COLUMN watermark REAL")
+        self._lock = threading.Lock()
+        self._synced = {row[0] for row in self._connection.execute("SELECT state_machine_arn FROM synced_state_machines")}
+
+    def is_synced(self, state_machine_arn: str) -> bool:
+        """Check whether the executions of a state machine have been stored at least once"""
+        return state_machine_arn in self._synced
+
+    def upsert_executions(
+        self,
+        state_machine_arn: str,
+        executions: list[dict],
+        config_name: str | None = None,
+        environment: str | None = None,
+    ) -> None:
+        """Insert new executions and update the status and stop date of the stored ones"""
+        rows = [
+            (
+                execution["executionArn"],
+                state_machine_arn,
+                execution["name"],
+                execution["status"],
+                to_timestamp(execution["startDate"]),
+                to_timestamp(execution.get("stopDate")),
+                config_name,
+                environment,
+            )
+            for execution in executions
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                """
+                INSERT INTO executions (
+                    execution_arn, state_machine_arn, name, status, start_date, stop_date, config_name, environment
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (execution_arn) DO UPDATE SET
+                    status = excluded.status,
+                    stop_date = excluded.stop_date,
+                    config_name = excluded.config_name,
+                    environment = excluded.environment
+                """,
+                rows,
+            )
+            self._connection.execute(
+                """
+                INSERT INTO synced_state_machines (state_machine_arn, synced_at) VALUES (?, ?)
+                ON CONFLICT (state_machine_arn) DO UPDATE SET synced_at = excluded.synced_at
+                """,
+                (state_machine_arn, datetime.now(UTC).timestamp()),
+            )
+            self._synced.add(state_machine_arn)
+
+    def set_watermark(self, state_machine_arn: str, watermark: datetime | None) -> None:
+        """
+        Store the start date of the newest execution listed by a sync of a stored state machine
+
+        It can be older than the newest stored execution, as executions pushed by status change events are stored
+        without listing the ones started before them.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE synced_state_machines SET watermark = ? WHERE state_machine_arn = ?",
+                (to_timestamp(watermark), state_machine_arn),
+            )
+
+    def load_watermark(self, state_machine_arn: str) -> datetime | None:
+        """Get the watermark stored by the last sync of a state machine, None if it is unknown"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark FROM synced_state_machines WHERE state_machine_arn = ?", (state_machine_arn,)
+            ).fetchone()
+        return datetime.fromtimestamp(row[0], UTC) if row and row[0] is not None else None
+
+    def set_input_hashes(self, input_hashes: dict[str, str]) -> None:
+        """Set the input hashes of stored executions, by execution ARN"""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE executions SET input_hash = ? WHERE execution_arn = ?",
+                [(input_hash, execution_arn) for execution_arn, input_hash in input_hashes.items()],
+            )
+
+    def list_missing_input_hashes(self, state_machine_arn: str, max_results: int) -> list[str]:
+        """List the ARNs of the most recent executions whose input has not been hashed yet"""
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT execution_arn FROM executions
+                WHERE state_machine_arn = ? AND input_hash IS NULL
+                ORDER BY start_date DESC LIMIT ?
+                """,
+                (state_machine_arn, max_results),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def load_executions(self, state_machine_arn: str) -> list[dict]:
+        """Get every stored execution of a state machine, oldest first"""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {COLUMNS} FROM executions WHERE state_machine_arn = ? ORDER BY start_date, execution_arn",  # noqa: S608
+                (state_machine_arn,),
+            ).fetchall()
+        return [to_execution(row) for row in rows]
+
+    def search(
+        self,
+        state_machine_arn: str,
+        max_results: int = 100,
+        next_token: str | None = None,
+        *,
+        status_filter: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        name_contains: str | None = None,
+        input_hash: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Search a page of stored executions, newest first
+
+        Args:
+            state_machine_arn (str): ARN of the state machine
+            max_results (int): Maximum number of executions in the page
+            next_token (str | None): Token returned with the previous page
+            status_filter (str | None): If set, only return executions with this status
+            started_after (datetime | None): If set, only return executions started at or after this date
+            started_before (datetime | None): If set, only return executions started before this date
+            name_contains (str | None): If set, only return executions whose name contains this text, ignoring case
+            input_hash (str | None): If set, only return executions started with the same input
+
+        Returns:
+            tuple[list[dict], str | None]: Executions and the token of the next page, None on the last page
+        """
+        conditions, params = ["state_machine_arn = ?"], [state_machine_arn]
+        if status_filter:
+            conditions.append("status = ?")
+            params.append(status_filter)
+        if started_after:
+            conditions.append("start_date >= ?")
+            params.append(started_after.timestamp())
+        if started_before:
+            conditions.append("start_date < ?")
+            params.append(started_before.timestamp())
+        if name_contains:
+            escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if input_hash:
+            conditions.append("input_hash = ?")
+            params.append(input_hash)
+        if next_token:
+            # Keyset pagination on (start_date, execution_arn), both descending
+            start_date, execution_arn = next_token.split("|", 1)
+            conditions.append("(start_date < ? OR (start_date = ? AND execution_arn < ?))")
+            params.extend([float(start_date), float(start_date), execution_arn])
+
+        query = (
+            f"SELECT {COLUMNS} FROM executions WHERE {' AND '.join(conditions)} "  # noqa: S608
+            "ORDER BY start_date DESC, execution_arn DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._connection.execute(query, [*params, max_results + 1]).fetchall()
+
+        if len(rows) <= max_results:
+            return [to_execution(row) for row in rows], None
+        last = rows[max_results - 1]
+        return [to_execution(row) for row in rows[:max_results]], f"{last[4]!r}|{last[0]}"
+
+    def get_counts(
+        self,
+        state_machine_arn: str,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+    ) -> dict[str, int]:
+        """Count stored executions by status, optionally in a start date range"""
+        conditions, params = ["state_machine_arn = ?"], [state_machine_arn]
+        if started_after:
+            conditions.append("start_date >= ?")
+            params.append(started_after.timestamp())
+        if started_before:
+            conditions.append("start_date < ?")
+            params.append(started_before.timestamp())
+
+        query = f"SELECT status, COUNT(*) FROM executions WHERE {' AND '.join(conditions)} GROUP BY status"  # noqa: S608
+        with self._lock:
+            return dict(self._connection.execute(query, params).fetchall())
+
+
+def open_execution_store(path: str) -> ExecutionStore | None:
+    """Open the execution store, None if it is disabled with an empty path"""
+    return ExecutionStore(path) if path else None
+
+
+execution_store = open_execution_store(EXECUTION_STORE_PATH)
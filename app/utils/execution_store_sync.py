@@ -0,0 +1,36 @@
+import asyncio
+
+from loguru import logger as log
+from nicegui import background_tasks
+from utils.async_aws_manager import async_aws_manager
+from utils.config_loader import SFC
+from utils.execution_store import EXECUTION_STORE_SYNC_INTERVAL
+from utils.rate_limiter import BACKGROUND, call_priority
+
+
+class ExecutionStoreSync:
+    """Periodically syncs the stored executions of every configured state machine, at background priority"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if async_aws_manager.manager.execution_store is None:
+            return
+        if self.task is None or self.task.done():
+            self.task = background_tasks.create(self.run(), name="execution store sync")
+
+    async def run(self) -> None:
+        call_priority.set(BACKGROUND)
+        while True:
+            for step_function_arn in SFC.list_state_machine_arns():
+                try:
+                    await async_aws_manager.sync_execution_store(step_function_arn)
+                except Exception as e:
+                    error_msg = f"Error syncing stored executions of {step_function_arn}: {e!s}"
+                    log.error(error_msg)
+            await asyncio.sleep(self.interval)
+
+
+execution_store_sync = ExecutionStoreSync(EXECUTION_STORE_SYNC_INTERVAL)
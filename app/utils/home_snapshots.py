@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from utils.execution_analytics import WindowStats
+
+
+@dataclass
+class HomeSnapshot:
+    """Data of the home page details panel of a state machine, as fetched by its last unfiltered refresh"""
+
+    step_function_details: dict
+    execution_counts: dict[str, int]
+    window_stats: WindowStats | None
+    analytics_window: str
+    executions: list[dict]
+    next_token: str | None
+    first_page_complete: bool
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was fetched"""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class HomeSnapshotCache:
+    """
+    Last snapshot of the details panel of each state machine, so the panel renders right away while it is revalidated.
+
+    Snapshots are shared by every user and never expire: they are only shown marked with their age, until the
+    revalidation that follows replaces them.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._snapshots: OrderedDict[str, HomeSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, step_function_arn: str) -> HomeSnapshot | None:
+        with self._lock:
+            snapshot = self._snapshots.get(step_function_arn)
+            if snapshot:
+                self._snapshots.move_to_end(step_function_arn)
+            return snapshot
+
+    def put(self, step_function_arn: str, snapshot: HomeSnapshot) -> None:
+        with self._lock:
+            self._snapshots[step_function_arn] = snapshot
+            self._snapshots.move_to_end(step_function_arn)
+            if len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+
+    def forget(self, step_function_arn: str) -> None:
+        with self._lock:
+            self._snapshots.pop(step_function_arn, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+
+home_snapshots = HomeSnapshotCache()
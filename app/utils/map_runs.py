@@ -0,0 +1,36 @@
+import threading
+from dataclasses import dataclass, field
+
+MAP_RUN_TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "ABORTED")
+
+# Keys of the item and child execution counts of DescribeMapRun, with the status filter of their child executions
+MAP_RUN_COUNT_STATUSES = {
+    "pending": None,
+    "running": "RUNNING",
+    "succeeded": "SUCCEEDED",
+    "failed": "FAILED",
+    "timedOut": "TIMED_OUT",
+    "aborted": "ABORTED",
+    "pendingRedrive": "PENDING_REDRIVE",
+}
+MAP_RUN_COUNT_KEYS = (*MAP_RUN_COUNT_STATUSES, "total")
+
+
+@dataclass
+class ChildExecutionListing:
+    """Child executions of a map run with one status, listed page by page as far as they are read"""
+
+    executions: list[dict] = field(default_factory=list)
+    next_token: str | None = None
+    complete: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def get_map_run_label(map_run_arn: str) -> str:
+    """Get the label of a map run, the name of its Map state unless the state sets a Label"""
+    return map_run_arn.split(":")[6].split("/", 1)[-1]
+
+
+def aggregate_counts(map_runs: list[dict], counts_key: str = "executionCounts") -> dict[str, int]:
+    """Sum the item or child execution counts of map runs, per status"""
+    return {key: sum(map_run.get(counts_key, {}).get(key, 0) for map_run in map_runs) for key in MAP_RUN_COUNT_KEYS}
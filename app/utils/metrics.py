@@ -0,0 +1,198 @@
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def format_labels(labelnames: tuple[str, ...], labelvalues: tuple[str, ...], **extra: str) -> str:
+    labels = {**dict(zip(labelnames, labelvalues, strict=True)), **extra}
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped, strict=True)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self.values[labelvalues] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self.values)
+        lines.extend(f"{self.name}{format_labels(self.labelnames, key)} {value}" for key, value in values.items())
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.counts: dict[tuple[str, ...], list[int]] = {}
+        self.sums: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            counts = self.counts.setdefault(labelvalues, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self.sums[labelvalues] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            counts = {key: list(value) for key, value in self.counts.items()}
+            sums = dict(self.sums)
+
+        for key, bucket_counts in counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), bucket_counts, strict=True):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, key, le=str(bound))} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, key)} {sums[key]}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback when the metrics are scraped"""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge", f"{self.name} {self.callback()}"]
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.metrics: dict[str, Counter | Histogram | Gauge] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.metrics.setdefault(name, Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> Gauge:
+        self.metrics[name] = Gauge(name, documentation, callback)
+        return self.metrics[name]
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics.values() for line in metric.render()) + "\n"
+
+
+metrics = MetricsRegistry()
+
+CALLS = metrics.counter("sfm_calls_total", "Calls of instrumented functions", ("kind", "name"))
+ERRORS = metrics.counter("sfm_errors_total", "Calls of instrumented functions that raised", ("kind", "name"))
+LATENCY = metrics.histogram("sfm_latency_seconds", "Latency of instrumented functions", ("kind", "name"))
+API_CALLS = metrics.counter(
+    "sfm_aws_api_calls_total", "AWS API calls, one per page of paginated operations", ("service", "operation")
+)
+API_ERRORS = metrics.counter("sfm_aws_api_errors_total", "AWS API calls that returned an error", ("service", "operation"))
+
+
+def timed(kind: str, name: str | None = None) -> Callable:
+    """Count the calls and errors of a function and record its latency; generators are timed until exhausted"""
+
+    def decorator(func: Callable) -> Callable:
+        labels = (kind, name or func.__name__)
+
+        def record(started_at: float, failed: bool) -> None:
+            CALLS.inc(*labels)
+            if failed:
+                ERRORS.inc(*labels)
+            LATENCY.observe(time.perf_counter() - started_at, *labels)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started_at, failed = time.perf_counter(), True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    record(started_at, failed)
+
+            return async_wrapper
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                started_at, failed = time.perf_counter(), True
+                try:
+                    yield from func(*args, **kwargs)
+                    failed = False
+                finally:
+                    record(started_at, failed)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started_at, failed = time.perf_counter(), True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(started_at, failed)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_methods(kind: str) -> Callable[[type], type]:
+    """Class decorator applying `timed` to every public instance method defined by the class"""
+
+    def decorator(cls: type) -> type:
+        for attribute_name, attribute in list(vars(cls).items()):
+            # Static methods are skipped: they only format ARNs and URLs, or hand out pooled clients
+            if not attribute_name.startswith("_") and inspect.isfunction(attribute):
+                setattr(cls, attribute_name, timed(kind, attribute_name)(attribute))
+        return cls
+
+    return decorator
+
+
+def record_api_call(model, http_response, parsed, **_kwargs) -> None:
+    """botocore `after-call` handler counting API calls and errors per operation"""
+    labels = (model.service_model.service_name, model.name)
+    API_CALLS.inc(*labels)
+    if http_response.status_code >= 400 or "Error" in parsed:  # noqa: PLR2004
+        API_ERRORS.inc(*labels)
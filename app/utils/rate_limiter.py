@@ -0,0 +1,105 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from botocore.config import Config
+from loguru import logger as log
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Priority of the AWS calls made in the current context; AsyncAWSManager copies it into its worker threads
+call_priority: ContextVar[str] = ContextVar("call_priority", default=INTERACTIVE)
+
+# Retries with exponential backoff and jitter, slowing down the client itself while it is being throttled
+CLIENT_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 8})
+
+# (refill rate per second, burst) per API action, kept below the account quotas shared by every user
+API_RATE_LIMITS = {
+    ("stepfunctions", "DescribeExecution"): (40, 200),
+    ("stepfunctions", "DescribeStateMachine"): (15, 150),
+    ("stepfunctions", "DescribeStateMachineForExecution"): (15, 150),
+    ("stepfunctions", "GetExecutionHistory"): (15, 300),
+    ("stepfunctions", "ListExecutions"): (4, 80),
+    ("stepfunctions", "StartExecution"): (100, 600),
+    ("stepfunctions", "StopExecution"): (20, 400),
+    ("stepfunctions", "RedriveExecution"): (20, 400),
+}
+DEFAULT_RATE_LIMIT = (50, 200)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Mark the AWS calls made in this context, and in the tasks it creates, as background calls"""
+    token = call_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        call_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Background calls leave a reserve of tokens untouched, so interactive calls still go through right away
+    while pollers and bulk actions use up the rest of the quota. Waits sleep in the calling thread: background
+    calls run in their own thread pool of AsyncAWSManager, so their waits never delay interactive calls.
+    """
+
+    def __init__(self, rate: float, capacity: float, reserve: float = 0.2):
+        self.rate = rate
+        self.capacity = capacity
+        self.reserve = capacity * reserve
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: str = INTERACTIVE) -> float:
+        """Take a token, blocking until one is available, and return the time waited"""
+        floor = self.reserve if priority == BACKGROUND else 0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens - floor >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (floor + 1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class ApiRateLimiter:
+    """Process-wide token buckets per API action, applied to boto3 clients through their `before-call` event"""
+
+    def __init__(self, limits: dict[tuple[str, str], tuple[float, float]], default: tuple[float, float]):
+        self.limits = limits
+        self.default = default
+        self.buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, service_name: str, operation_name: str) -> TokenBucket:
+        key = (service_name, operation_name)
+        with self._lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(*self.limits.get(key, self.default))
+            return self.buckets[key]
+
+    def register(self, client) -> None:
+        """Throttle every call made with the client"""
+        client.meta.events.register("before-call.*", self._before_call)
+
+    def _before_call(self, model, **_kwargs) -> None:
+        service_name = model.service_model.service_name
+        waited = self.get_bucket(service_name, model.name).acquire(call_priority.get())
+        if waited:
+            log.debug(f"Throttled {service_name}.{model.name} for {waited:.2f}s ({call_priority.get()} call)")
+
+
+api_rate_limiter = ApiRateLimiter(API_RATE_LIMITS, DEFAULT_RATE_LIMIT)
@@ -0,0 +1,81 @@
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RowChanges:
+    added: list[dict] = field(default_factory=list)
+    updated: list[dict] = field(default_factory=list)
+    removed: list[dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def as_transaction(self, add_index: int | None = None) -> dict:
+        """Format the changes as an AG Grid row transaction"""
+        transaction = {"add": self.added, "update": self.updated, "remove": self.removed}
+        if add_index is not None:
+            transaction["addIndex"] = add_index
+        return transaction
+
+
+class KeyedRowModel:
+    """Rows of a table keyed by ID, diffed against fresh data so that only the changes are sent to the browser"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.rows: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, row_id: str) -> bool:
+        return row_id in self.rows
+
+    def values(self) -> list[dict]:
+        return list(self.rows.values())
+
+    def reset(self, rows: list[dict]) -> None:
+        """Replace every row of the model"""
+        self.rows = {row[self.key]: row for row in rows}
+
+    def extend(self, rows: list[dict]) -> list[dict]:
+        """Add rows not in the model yet and return them"""
+        added = [row for row in rows if row[self.key] not in self.rows]
+        self.rows.update({row[self.key]: row for row in added})
+        return added
+
+    def remove(self, row_id: str) -> dict | None:
+        """Remove a row from the model and return it, None if it was not in the model"""
+        return self.rows.pop(row_id, None)
+
+    def apply(self, rows: list[dict], in_window: Callable[[dict], bool] | None = None) -> RowChanges:
+        """
+        Merge fresh rows into the model and return what changed.
+
+        Args:
+            rows (list[dict]): Fresh rows
+            in_window (Callable | None): Tells whether a row of the model is covered by the fresh rows, so that its
+                absence means it was removed. If None, rows of the model are never removed.
+
+        Returns:
+            RowChanges: Inserted, changed and removed rows
+        """
+        changes = RowChanges()
+        fresh_ids = set()
+        for row in rows:
+            row_id = row[self.key]
+            fresh_ids.add(row_id)
+            previous = self.rows.get(row_id)
+            if previous is None:
+                changes.added.append(row)
+            elif previous != row:
+                changes.updated.append(row)
+            self.rows[row_id] = row
+
+        if in_window:
+            for row_id, row in list(self.rows.items()):
+                if row_id not in fresh_ids and in_window(row):
+                    changes.removed.append(self.rows.pop(row_id))
+
+        return changes
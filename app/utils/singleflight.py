@@ -0,0 +1,98 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+from utils.metrics import metrics
+
+# Seconds the result of a coalesced call is reused by identical calls, 0 to only share in-flight calls
+AWS_CALL_CACHE_TTL = float(os.environ.get("AWS_CALL_CACHE_TTL", "2"))
+
+COALESCED_CALLS = metrics.counter(
+    "sfm_coalesced_calls_total",
+    "Calls served by an identical in-flight call or by its cached result, instead of calling AWS",
+    ("name", "source"),
+)
+
+
+class SingleFlight:
+    """
+    Makes concurrent identical calls share one in-flight call, from any thread, then reuses its result for ttl seconds.
+
+    Errors are shared with the calls waiting on the failed one, but never cached. Results are shared between callers,
+    which must not mutate them.
+    """
+
+    def __init__(self, ttl: float = AWS_CALL_CACHE_TTL, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: dict[Hashable, Future] = {}
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()  # key -> (expiry, result)
+        self._generation = 0  # bumped by clear, so calls in flight meanwhile don't cache outdated results
+        self._lock = threading.Lock()
+
+    def call(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        name = key[0] if isinstance(key, tuple) else str(key)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and cached[0] > time.monotonic():
+                COALESCED_CALLS.inc(name, "cache")
+                return cached[1]
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+
+        if not leader:
+            COALESCED_CALLS.inc(name, "inflight")
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Cached before leaving the flight, so that no identical call starts in between
+            if self.ttl > 0 and generation == self._generation:
+                self._results[key] = (time.monotonic() + self.ttl, result)
+                self._results.move_to_end(key)
+                if len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Forget the cached results, e.g. after a write made them outdated"""
+        with self._lock:
+            self._results.clear()
+            self._generation += 1
+
+
+def coalesced(func: Callable) -> Callable:
+    """
+    Method decorator routing calls through the SingleFlight of the instance, in its `single_flight` attribute.
+
+    Calls are identical when they bind the same argument values, whether passed by position or keyword.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, *tuple(bound.arguments.items())[1:])
+        return self.single_flight.call(key, func, self, *args, **kwargs)
+
+    return wrapper
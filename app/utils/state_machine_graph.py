@@ -0,0 +1,115 @@
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+
+MERMAID_HEADER = [
+    "graph TD",
+    "    %% Node and edge styling",
+    "    linkStyle default stroke:#333,stroke-width:2px;",
+    "    %% Graph configuration",
+    "    classDef default fill:#f9f9f9,stroke:#333,stroke-width:2px;",
+    "    classDef running fill:#fff7e6,stroke:#ffab00,stroke-width:2px;",
+    "    classDef completed fill:#e6f4ea,stroke:#34a853,stroke-width:2px;",
+    "    classDef failed fill:#fce8e6,stroke:#ea4335,stroke-width:2px;",
+    "    classDef notStarted fill:#f8f9fa,stroke:#dadce0,stroke-width:2px;",
+    "    classDef aborted fill:#e0e0e0,stroke:#666666,stroke-width:2px;",
+]
+
+# Define status to class mapping
+STATUS_CLASS_MAP = {
+    "NOT_STARTED": "notStarted",
+    "RUNNING": "running",
+    "COMPLETED": "completed",
+    "FAILED": "failed",
+    "ABORTED": "aborted",
+}
+
+
+def find_distributed_maps(states: dict) -> tuple[str, ...]:
+    """Get the names of the Distributed Map states, including those nested in Parallel and Map states"""
+    names = []
+    for state_name, state_data in states.items():
+        if state_data["Type"] == "Map":
+            processor = state_data.get("ItemProcessor") or state_data.get("Iterator") or {}
+            if processor.get("ProcessorConfig", {}).get("Mode") == "DISTRIBUTED":
+                names.append(state_name)
+            names.extend(find_distributed_maps(processor.get("States", {})))
+        elif state_data["Type"] == "Parallel":
+            for branch in state_data.get("Branches", []):
+                names.extend(find_distributed_maps(branch.get("States", {})))
+    return tuple(names)
+
+
+def create_node_id(state_name: str) -> str:
+    """Create a Mermaid node ID from a state name"""
+    return state_name.replace(" ", "_").replace("-", "_").replace(")", "").replace("(", "")
+
+
+@dataclass(frozen=True)
+class StateMachineGraph:
+    """
+    Parsed state machine definition with its topology and the static part of its Mermaid source.
+
+    The definition of a state machine only changes on deploy, so instances are cached by state machine
+    ARN and revision; rendering a status update only computes the per-node class assignments.
+    """
+
+    definition: dict
+    nodes: dict[str, str]  # state name -> node ID
+    edges: tuple[tuple[str, str], ...]
+    static_source: str
+    distributed_maps: tuple[str, ...] = ()  # names of the Map states running their items as child executions
+
+    @classmethod
+    def from_definition(cls, definition: str) -> "StateMachineGraph":
+        definition_json = json.loads(definition)
+        nodes = {}
+        edges = []
+        lines = list(MERMAID_HEADER)
+
+        # Process each state
+        for state_name, state_data in definition_json["States"].items():
+            node_id = nodes[state_name] = create_node_id(state_name)
+
+            if state_data["Type"] == "Choice":
+                # Diamond shape for Choice states
+                lines.append(f'    {node_id}{{"{state_name}"}}')
+            else:
+                # Rounded rectangle for all other states
+                lines.append(f'    {node_id}("{state_name}")')
+
+            # Handle transitions
+            targets = []
+            if state_data["Type"] == "Choice":
+                targets.extend(choice["Next"] for choice in state_data.get("Choices", []) if "Next" in choice)
+                if "Default" in state_data:
+                    targets.append(state_data["Default"])
+
+            if "Next" in state_data:
+                targets.append(state_data["Next"])
+
+            for target in targets:
+                edges.append((node_id, create_node_id(target)))
+                lines.append(f"    {node_id} --> {edges[-1][1]}")
+
+        return cls(
+            definition=definition_json,
+            nodes=nodes,
+            edges=tuple(edges),
+            static_source="\n".join(lines),
+            distributed_maps=find_distributed_maps(definition_json["States"]),
+        )
+
+    def render(self, states_status: dict[str, str], execution_status: str | None) -> str:
+        """Render the Mermaid source, assigning each node the class of its state status"""
+        node_ids_per_class = defaultdict(list)
+        for state_name, node_id in self.nodes.items():
+            node_class = STATUS_CLASS_MAP.get(states_status.get(state_name, "NOT_STARTED"), "notStarted")
+            if execution_status in ["TIMED_OUT", "ABORTED"] and node_class == "running":
+                node_class = "aborted"
+            node_ids_per_class[node_class].append(node_id)
+
+        class_lines = [
+            f"    class {','.join(node_ids)} {node_class};" for node_class, node_ids in node_ids_per_class.items()
+        ]
+        return "\n".join([self.static_source, *class_lines])
@@ -0,0 +1,209 @@
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+# Task-level events closing an attempt with an error; Execution* events belong to no state
+FAILURE_EVENT_SUFFIXES = ("Failed", "TimedOut", "Aborted")
+MAX_FAILURES_PER_STATE = 10
+MAX_CAUSE_LENGTH = 500
+
+GANTT_TAGS = {"RUNNING": "active", "COMPLETED": "done", "FAILED": "crit"}
+
+
+@dataclass(frozen=True)
+class FailureEvent:
+    event_type: str
+    timestamp: datetime
+    error: str | None
+    cause: str | None
+
+
+@dataclass(frozen=True)
+class StateTiming:
+    name: str
+    state_type: str
+    status: str  # RUNNING, COMPLETED or FAILED
+    entered_at: datetime
+    exited_at: datetime | None  # last exit, None while an entry is still open
+    last_event_at: datetime
+    duration: float  # seconds spent in the state, summed over its entries
+    entries: int
+    retries: int
+    failures: tuple[FailureEvent, ...]
+
+
+@dataclass
+class StateTracker:
+    """Mutable timing of a single state, updated by every event of the state"""
+
+    name: str
+    state_type: str
+    entered_at: datetime
+    last_event_at: datetime
+    exited_at: datetime | None = None
+    open_entries: list[datetime] = field(default_factory=list)  # enter times of entries not exited yet
+    closed_duration: float = 0.0
+    entries: int = 0
+    scheduled: int = 0
+    failed_since_scheduled: bool = False
+    failures: list[FailureEvent] = field(default_factory=list)
+
+    def enter(self, timestamp: datetime) -> None:
+        self.open_entries.append(timestamp)
+        self.entries += 1
+        self.failed_since_scheduled = False
+
+    def exit(self, timestamp: datetime) -> None:
+        if self.open_entries:
+            self.closed_duration += (timestamp - self.open_entries.pop(0)).total_seconds()
+        self.exited_at = timestamp
+        self.failed_since_scheduled = False
+
+    def close_open_entries(self) -> None:
+        """Close the entries left open by a failure, when the execution is redriven"""
+        for entered_at in self.open_entries:
+            self.closed_duration += (self.last_event_at - entered_at).total_seconds()
+        self.open_entries.clear()
+
+    def fail(self, event: dict) -> None:
+        details = next((value for key, value in event.items() if key.endswith("EventDetails")), None) or {}
+        cause = details.get("cause")
+        self.failures.append(
+            FailureEvent(
+                event_type=event["type"],
+                timestamp=event["timestamp"],
+                error=details.get("error"),
+                cause=cause[:MAX_CAUSE_LENGTH] if cause else None,
+            )
+        )
+        del self.failures[:-MAX_FAILURES_PER_STATE]
+        self.failed_since_scheduled = True
+
+    def snapshot(self) -> StateTiming:
+        open_duration = sum((self.last_event_at - entered_at).total_seconds() for entered_at in self.open_entries)
+        if not self.open_entries:
+            status = "COMPLETED"
+        elif self.failed_since_scheduled:
+            status = "FAILED"
+        else:
+            status = "RUNNING"
+
+        return StateTiming(
+            name=self.name,
+            state_type=self.state_type,
+            status=status,
+            entered_at=self.entered_at,
+            exited_at=None if self.open_entries else self.exited_at,
+            last_event_at=self.last_event_at,
+            duration=self.closed_duration + open_duration,
+            entries=self.entries,
+            retries=max(0, self.scheduled - self.entries),
+            failures=tuple(self.failures),
+        )
+
+
+class StateTimeline:
+    """
+    Per-state timings of an execution, built in the same single pass over history events as the states status.
+
+    Events inside a state (task scheduled, started, failed...) are attributed to it through their previousEventId,
+    which also works for states running concurrently in Parallel and Map states.
+    """
+
+    def __init__(self):
+        self.states: dict[str, StateTracker] = {}
+        self._owners: dict[int, str] = {}  # event ID -> name of the state the event belongs to
+
+    def apply(self, event: dict) -> None:
+        event_type = event["type"]
+        timestamp = event["timestamp"]
+
+        if event_type.endswith("StateEntered"):
+            name = event["stateEnteredEventDetails"]["name"]
+            state = self.states.get(name)
+            if state is None:
+                state_type = event_type.removesuffix("StateEntered")
+                state = self.states[name] = StateTracker(name, state_type, timestamp, timestamp)
+            state.enter(timestamp)
+            state.last_event_at = timestamp
+            self._owners[event["id"]] = name
+            return
+
+        if event_type.endswith("StateExited"):
+            state = self.states.get(event["stateExitedEventDetails"]["name"])
+            if state:
+                state.exit(timestamp)
+                state.last_event_at = timestamp
+            return
+
+        if event_type == "ExecutionRedriven":
+            for state in self.states.values():
+                state.close_open_entries()
+            return
+
+        name = self._owners.get(event.get("previousEventId"))
+        if name is None or event_type.startswith("Execution"):
+            return
+
+        self._owners[event["id"]] = name
+        state = self.states[name]
+        state.last_event_at = timestamp
+        if event_type.endswith("Scheduled"):
+            state.scheduled += 1
+            state.failed_since_scheduled = False
+        elif event_type.endswith(FAILURE_EVENT_SUFFIXES):
+            state.fail(event)
+
+    def compact(self) -> None:
+        """Drop the event ownership kept to attribute future events, once the execution reached a terminal status"""
+        self._owners.clear()
+
+    def dump(self) -> list[dict]:
+        """Get the trackers of a compacted timeline as plain data, to persist them"""
+        return [asdict(state) for state in self.states.values()]
+
+    @classmethod
+    def load(cls, states: list[dict]) -> "StateTimeline":
+        """Rebuild a compacted timeline from the trackers dumped by `dump`"""
+        timeline = cls()
+        for state in states:
+            failures = [FailureEvent(**failure) for failure in state["failures"]]
+            timeline.states[state["name"]] = StateTracker(**{**state, "failures": failures})
+        return timeline
+
+    def snapshot(self) -> tuple[StateTiming, ...]:
+        """Get the timings of every entered state, in the order they were first entered"""
+        return tuple(sorted((state.snapshot() for state in self.states.values()), key=lambda timing: timing.entered_at))
+
+
+def create_task_name(state_name: str) -> str:
+    """Create a Mermaid Gantt task name, without the characters delimiting task fields"""
+    return re.sub(r"[:;#]", " ", state_name).strip() or "state"
+
+
+def render_gantt(timings: tuple[StateTiming, ...], end: datetime) -> str:
+    """
+    Render the Mermaid source of a Gantt chart of the state timings
+
+    Args:
+        timings (tuple[StateTiming, ...]): Timings of the entered states
+        end (datetime): End of the states still open: now while the execution runs, its stop date afterwards
+
+    Returns:
+        str: Mermaid source, one bar per state from its first entry to its last exit
+    """
+    span = (max([end, *(timing.last_event_at for timing in timings)]) - timings[0].entered_at).total_seconds()
+    lines = [
+        "gantt",
+        "    dateFormat x",
+        f"    axisFormat {'%m-%d %H:%M' if span > 86400 else '%H:%M:%S'}",  # noqa: PLR2004
+        "    todayMarker off",
+    ]
+    for timing in timings:
+        start_ms = int(timing.entered_at.timestamp() * 1000)
+        end_ms = max(int((timing.exited_at or end).timestamp() * 1000), start_ms + 1)
+        name = create_task_name(timing.name)
+        if timing.retries:
+            name += f" ({timing.retries} retries)"
+        lines.append(f"    {name} :{GANTT_TAGS[timing.status]}, {start_ms}, {end_ms}")
+    return "\n".join(lines)
@@ -0,0 +1,277 @@
+"""
+In-process stand-ins for the Step Functions and S3 clients used by AWSManager.
+
+Executions, history events and objects are synthetic and computed from their position on demand, so a state
+machine with a million executions or a prefix with 50k objects costs no memory until it is paged through.
+"""
+
+import json
+import threading
+from bisect import bisect_right
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from botocore.exceptions import ClientError
+
+BASE_DATE = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Status of execution `i` is STATUS_PATTERN[i % 100]: 1% RUNNING, 5% FAILED, 2% ABORTED, 2% TIMED_OUT
+STATUS_PATTERN = ["RUNNING"] + ["FAILED"] * 5 + ["ABORTED"] * 2 + ["TIMED_OUT"] * 2 + ["SUCCEEDED"] * 90
+STATUS_RESIDUES = {
+    status: [i for i, pattern_status in enumerate(STATUS_PATTERN) if pattern_status == status]
+    for status in set(STATUS_PATTERN)
+}
+
+
+def previous_pattern_match(i: int, residues: list[int]) -> int:
+    """Get the largest index at or before `i` whose position in the status pattern is one of the residues"""
+    if not residues or i < 0:
+        return -1
+    block, offset = divmod(i, len(STATUS_PATTERN))
+    position = bisect_right(residues, offset)
+    if position:
+        return block * len(STATUS_PATTERN) + residues[position - 1]
+    return max(-1, (block - 1) * len(STATUS_PATTERN) + residues[-1])
+
+
+def create_definition(n_states: int = 20) -> str:
+    """Create a chain of Task states with a Choice state in the middle"""
+    states = {}
+    for i in range(n_states):
+        name = f"Step {i}"
+        next_state = f"Step {i + 1}" if i + 1 < n_states else None
+        if i == n_states // 2:
+            states[name] = {"Type": "Choice", "Choices": [{"Next": next_state}], "Default": "Fail"}
+        else:
+            states[name] = {"Type": "Task", **({"Next": next_state} if next_state else {"End": True})}
+    states["Fail"] = {"Type": "Fail"}
+    return json.dumps({"StartAt": "Step 0", "States": states})
+
+
+def client_error(code: str, operation_name: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation_name)
+
+
+class Paginator:
+    """Minimal botocore paginator over a fake operation"""
+
+    def __init__(self, operation, token_param: str, next_token_key: str, page_size_param: str):
+        self.operation = operation
+        self.token_param = token_param
+        self.next_token_key = next_token_key
+        self.page_size_param = page_size_param
+
+    def paginate(self, PaginationConfig=None, **kwargs):
+        if PaginationConfig and "PageSize" in PaginationConfig:
+            kwargs[self.page_size_param] = PaginationConfig["PageSize"]
+        while True:
+            page = self.operation(**kwargs)
+            yield page
+            if not page.get(self.next_token_key):
+                return
+            kwargs[self.token_param] = page[self.next_token_key]
+
+
+class FakeStepFunctions:
+    """
+    Step Functions client for a single state machine with `n_executions` synthetic executions.
+
+    Execution `i` (0 is the oldest) starts `i` minutes after BASE_DATE. Every execution has a history of
+    `n_events` events; running executions can be given more with `append_events`.
+    """
+
+    def __init__(self, state_machine_arn: str, n_executions: int, n_events: int, n_states: int = 20):
+        self.state_machine_arn = state_machine_arn
+        self.execution_prefix = state_machine_arn.replace(":stateMachine:", ":execution:", 1)
+        self.n_executions = n_executions
+        self.n_events = n_events
+        self.definition = create_definition(n_states)
+        self.state_names = [name for name in json.loads(self.definition)["States"] if name != "Fail"]
+        self.status_overrides: dict[int, str] = {}
+        self.extra_events: Counter = Counter()
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, operation_name: str) -> None:
+        with self._lock:
+            self.calls[operation_name] += 1
+
+    # Synthetic data
+
+    def execution_id(self, arn: str) -> int:
+        try:
+            return int(arn.rsplit(":exec-", 1)[1])
+        except (IndexError, ValueError):
+            return -1
+
+    def status(self, i: int) -> str:
+        return self.status_overrides.get(i, STATUS_PATTERN[i % len(STATUS_PATTERN)])
+
+    def execution(self, i: int) -> dict:
+        status = self.status(i)
+        start_date = BASE_DATE + timedelta(minutes=i)
+        execution = {
+            "executionArn": f"{self.execution_prefix}:exec-{i}",
+            "stateMachineArn": self.state_machine_arn,
+            "name": f"exec-{i}",
+            "status": status,
+            "startDate": start_date,
+        }
+        if status != "RUNNING":
+            execution["stopDate"] = start_date + timedelta(seconds=30 + i % 600)
+        return execution
+
+    def previous_match(self, i: int, status: str | None) -> int:
+        """Get the newest execution at or before `i` matching the status filter, -1 if there is none"""
+        if status is None:
+            return i
+
+        residues = STATUS_RESIDUES.get(status, [])
+        while i >= 0:
+            j = previous_pattern_match(i, residues)
+            overridden = max((k for k, s in self.status_overrides.items() if s == status and k <= i), default=-1)
+            if overridden > j:
+                return overridden
+            if j < 0 or self.status(j) == status:
+                return j
+            i = j - 1
+        return -1
+
+    def add_executions(self, count: int) -> None:
+        """Start `count` new executions"""
+        self.n_executions += count
+
+    def append_events(self, execution_arn: str, count: int) -> None:
+        """Add events to the history of a running execution"""
+        self.extra_events[execution_arn] += count
+
+    def events_count(self, execution_arn: str) -> int:
+        return self.n_events + self.extra_events[execution_arn]
+
+    def event(self, execution_arn: str, event_id: int, terminal: bool) -> dict:
+        timestamp = BASE_DATE + timedelta(seconds=event_id)
+        if event_id == 1:
+            return {"id": 1, "type": "ExecutionStarted", "timestamp": timestamp}
+        if terminal and event_id == self.events_count(execution_arn):
+            return {"id": event_id, "type": "ExecutionSucceeded", "timestamp": timestamp, "previousEventId": event_id - 1}
+
+        transition, exited = divmod(event_id - 2, 2)
+        state_name = self.state_names[transition % len(self.state_names)]
+        if exited:
+            details = {"stateExitedEventDetails": {"name": state_name}}
+            event_type = "TaskStateExited"
+        else:
+            details = {"stateEnteredEventDetails": {"name": state_name}}
+            event_type = "TaskStateEntered"
+        return {"id": event_id, "type": event_type, "timestamp": timestamp, "previousEventId": event_id - 1, **details}
+
+    # Client API
+
+    def get_paginator(self, operation_name: str) -> Paginator:
+        return Paginator(getattr(self, operation_name), "nextToken", "nextToken", "maxResults")
+
+    def describe_state_machine(self, stateMachineArn: str) -> dict:
+        self.count("DescribeStateMachine")
+        return {
+            "stateMachineArn": stateMachineArn,
+            "name": stateMachineArn.rsplit(":", maxsplit=1)[-1],
+            "definition": self.definition,
+            "revisionId": "1",
+        }
+
+    def describe_state_machine_for_execution(self, executionArn: str) -> dict:  # noqa: ARG002
+        self.count("DescribeStateMachineForExecution")
+        return {
+            "stateMachineArn": self.state_machine_arn,
+            "name": self.state_machine_arn.rsplit(":", maxsplit=1)[-1],
+            "definition": self.definition,
+            "revisionId": "1",
+        }
+
+    def list_executions(
+        self,
+        stateMachineArn: str,  # noqa: ARG002
+        maxResults: int = 100,
+        nextToken: str | None = None,
+        statusFilter: str | None = None,
+    ) -> dict:
+        self.count("ListExecutions")
+        i = int(nextToken) if nextToken else self.n_executions - 1
+        executions = []
+        while len(executions) < min(maxResults, 1000):
+            i = self.previous_match(i, statusFilter)
+            if i < 0:
+                return {"executions": executions}
+            executions.append(self.execution(i))
+            i -= 1
+        return {"executions": executions, **({"nextToken": str(i)} if i >= 0 else {})}
+
+    def describe_execution(self, executionArn: str) -> dict:
+        self.count("DescribeExecution")
+        i = self.execution_id(executionArn)
+        if not 0 <= i < self.n_executions:
+            code = "ExecutionDoesNotExist"
+            raise client_error(code, "DescribeExecution")
+        return {**self.execution(i), "input": json.dumps({"product_ids": str(i), "language": "en"})}
+
+    def get_execution_history(
+        self,
+        executionArn: str,
+        maxResults: int = 100,
+        nextToken: str | None = None,
+        reverseOrder: bool = False,
+    ) -> dict:
+        self.count("GetExecutionHistory")
+        terminal = self.status(self.execution_id(executionArn)) != "RUNNING"
+        total = self.events_count(executionArn)
+        position = int(nextToken) if nextToken else 0
+        end = min(position + min(maxResults, 1000), total)
+        ids = range(total - position, total - end, -1) if reverseOrder else range(position + 1, end + 1)
+        events = [self.event(executionArn, event_id, terminal) for event_id in ids]
+        return {"events": events, **({"nextToken": str(end)} if end < total else {})}
+
+    def start_execution(self, stateMachineArn: str, input: str, name: str | None = None) -> dict:  # noqa: A002, ARG002
+        self.count("StartExecution")
+        self.add_executions(1)
+        return {"executionArn": f"{self.execution_prefix}:exec-{self.n_executions - 1}", "startDate": datetime.now(UTC)}
+
+    def stop_execution(self, executionArn: str) -> dict:
+        self.count("StopExecution")
+        self.status_overrides[self.execution_id(executionArn)] = "ABORTED"
+        return {"stopDate": datetime.now(UTC)}
+
+    def redrive_execution(self, executionArn: str) -> dict:
+        self.count("RedriveExecution")
+        self.status_overrides[self.execution_id(executionArn)] = "RUNNING"
+        return {"redriveDate": datetime.now(UTC)}
+
+
+class FakeS3:
+    """S3 client where every prefix holds `n_objects` synthetic objects"""
+
+    def __init__(self, n_objects: int):
+        self.n_objects = n_objects
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation_name: str) -> Paginator:
+        return Paginator(getattr(self, operation_name), "ContinuationToken", "NextContinuationToken", "MaxKeys")
+
+    def list_objects_v2(self, Bucket: str, Prefix: str, MaxKeys: int = 1000, ContinuationToken: str | None = None) -> dict:  # noqa: ARG002
+        with self._lock:
+            self.calls["ListObjectsV2"] += 1
+        start = int(ContinuationToken) if ContinuationToken else 0
+        end = min(start + min(MaxKeys, 1000), self.n_objects)
+        contents = [
+            {"Key": f"{Prefix}part-{i:06d}.json", "Size": 1024 + i, "LastModified": BASE_DATE + timedelta(seconds=i)}
+            for i in range(start, end)
+        ]
+        page = {"Contents": contents, "KeyCount": len(contents), "IsTruncated": end < self.n_objects}
+        if end < self.n_objects:
+            page["NextContinuationToken"] = str(end)
+        return page
+
+    def generate_presigned_url(self, ClientMethod: str, Params: dict, ExpiresIn: int) -> str:  # noqa: ARG002
+        with self._lock:
+            self.calls["GeneratePresignedUrl"] += 1
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}"
@@ -0,0 +1,184 @@
+"""
+Run the real pages of the app in-process against the fake AWS backend.
+
+Pages are opened with NiceGUI's simulated `User`, over an ASGI transport, so a page load goes through the same
+handlers, AWSManager caches and thread pool as in production, without a browser or a network.
+"""
+
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("EXECUTION_STORE_PATH", ":memory:")
+os.environ.setdefault("EXECUTION_DETAIL_CACHE_PATH", ":memory:")
+sys.path.insert(0, str(ROOT / "app"))
+os.chdir(ROOT)
+
+import detail_executions  # noqa: E402
+import home  # noqa: E402
+import httpx  # noqa: E402
+import manager  # noqa: E402
+import nicegui.storage  # noqa: E402
+from fake_aws import FakeS3, FakeStepFunctions  # noqa: E402
+from nicegui import Client, background_tasks, core  # noqa: E402
+from nicegui.testing.user import User  # noqa: E402
+from utils import async_aws_manager as async_aws_manager_module  # noqa: E402
+from utils import aws_manager as aws_manager_module  # noqa: E402
+from utils.config_loader import SFC  # noqa: E402
+from utils.execution_detail_cache import ExecutionDetailCache  # noqa: E402
+from utils.execution_poller import execution_poller  # noqa: E402
+from utils.execution_store import ExecutionStore  # noqa: E402
+from utils.home_snapshots import home_snapshots  # noqa: E402
+
+ENVIRONMENT = "production"
+CONFIG_NAME = "Benchmark"
+STATE_MACHINE_ARN = "arn:aws:states:eu-west-1:123456789012:stateMachine:production-benchmark"
+STEP_FUNCTION_NAME = STATE_MACHINE_ARN.rsplit(":", maxsplit=1)[-1]
+
+CONFIG = f"""
+display_name: {CONFIG_NAME}
+environments:
+  production: {STATE_MACHINE_ARN}
+parameters:
+  product_ids:
+    description: Product IDs
+    type: string
+  language:
+    description: Language
+    type: select
+    default: en
+    options: [en, it]
+files:
+  output_directory: benchmark/executions
+"""
+
+
+class Backend:
+    """Fake AWS clients wired into a fresh AWSManager, so every scenario can start from cold caches"""
+
+    def __init__(self, n_executions: int, n_events: int, n_objects: int):
+        self.sfn = FakeStepFunctions(STATE_MACHINE_ARN, n_executions, n_events)
+        self.s3 = FakeS3(n_objects)
+        self.reset()
+
+    def reset(self, detail_cache: ExecutionDetailCache | None = None, call_cache_ttl: float = 0) -> None:
+        """
+        Replace the AWSManager with one that has empty caches and an empty execution store, as after a restart
+
+        The detail cache of terminal executions is persistent: pass the one of the previous AWSManager to keep it.
+        By default every run of a scenario must reach the backend, so only identical calls made concurrently are
+        coalesced: pass the AWS_CALL_CACHE_TTL of the app as call_cache_ttl to also reuse their results.
+        """
+        detail_cache = detail_cache or ExecutionDetailCache(":memory:")
+        aws_manager = aws_manager_module.AWSManager(store=ExecutionStore(":memory:"), detail_cache=detail_cache)
+        aws_manager.get_sfn_client = lambda _arn: self.sfn
+        aws_manager.s3_client = self.s3
+        aws_manager.single_flight.ttl = call_cache_ttl
+        async_aws_manager_module.async_aws_manager.manager = aws_manager
+        self.aws_manager = aws_manager
+
+        home_snapshots.clear()
+
+        # Snapshots kept by the watchers of previously opened detail pages would hide the cold fetch
+        for watcher in execution_poller.watchers.values():
+            if watcher.task:
+                watcher.task.cancel()
+        execution_poller.watchers.clear()
+
+    def api_calls(self) -> Counter:
+        return self.sfn.calls + self.s3.calls
+
+    def execution_arn(self, i: int) -> str:
+        return self.sfn.execution(i)["executionArn"]
+
+
+def select_step_function() -> None:
+    """Make every page see the benchmark state machine as the one selected by the user"""
+    for module in (manager, detail_executions, home):
+        if hasattr(module, "get_selected_environment"):
+            module.get_selected_environment = lambda: ENVIRONMENT
+        if hasattr(module, "get_selected_step_function_config_name"):
+            module.get_selected_step_function_config_name = lambda: CONFIG_NAME
+        if hasattr(module, "get_selected_step_function_arn"):
+            module.get_selected_step_function_arn = lambda: STATE_MACHINE_ARN
+
+
+def load_config() -> None:
+    """Point the step function configs to a directory holding only the benchmark config"""
+    config_dir = Path(tempfile.mkdtemp(prefix="sfm-benchmark-"))
+    (config_dir / "benchmark.yaml").write_text(CONFIG)
+    SFC.config_dir = f"{config_dir}/"
+    SFC.reload()
+
+
+@asynccontextmanager
+async def running_app():
+    """Start the NiceGUI app in-process and yield a function creating simulated users"""
+    core.app.config.add_run_config(
+        reload=False,
+        title="Step Functions Manager",
+        viewport="width=device-width, initial-scale=1",
+        favicon=None,
+        dark=False,
+        language="en-US",
+        binding_refresh_interval=0.1,
+        reconnect_timeout=3.0,
+        tailwind=True,
+        prod_js=True,
+        show_welcome_message=False,
+    )
+    nicegui.storage.set_storage_secret("benchmark")
+    load_config()
+    select_step_function()
+
+    async with core.app.router.lifespan_context(core.app):
+        clients: list[httpx.AsyncClient] = []
+
+        def create_user() -> User:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=core.app), base_url="http://benchmark")
+            clients.append(client)
+            return User(client)
+
+        try:
+            yield create_user
+        finally:
+            for client in clients:
+                await client.aclose()
+            for client in list(Client.instances.values()):
+                if not client.shared:
+                    client.delete()
+
+
+async def wait_for_background_tasks(prefix: str, max_wait: float = 300) -> None:
+    """Wait for the background tasks whose name starts with the prefix, e.g. the file listing of a detail page"""
+    deadline = time.monotonic() + max_wait
+    while tasks := [task for task in background_tasks.running_tasks if task.get_name().startswith(prefix)]:
+        await asyncio.wait(tasks, timeout=max(0, deadline - time.monotonic()))
+        if time.monotonic() >= deadline:
+            break
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, `q` between 0 and 100"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def find_viewer(user: User, cls: type):
+    """Get the page object of a given class created for the user's client"""
+    for element in user.client.elements.values():
+        for handler in getattr(element, "_event_listeners", {}).values():
+            owner = getattr(getattr(handler, "handler", None), "__self__", None)
+            if isinstance(owner, cls):
+                return owner
+    return None
@@ -0,0 +1,234 @@
+"""
+Simulate concurrent browser sessions opening the home page and execution detail pages against the fake AWS
+backend, reporting page latency, event loop lag, memory per session and AWS API calls per second.
+
+Every session opens `/`, then keeps the detail page of one of the most recent executions open for the think
+time (so its execution watcher keeps polling) before navigating again, until the duration is over.
+
+    python benchmarks/load_test.py --sessions 30 --duration 120 --json load.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from harness import STEP_FUNCTION_NAME, Backend, percentile, running_app
+from nicegui import Client
+from utils.execution_poller import execution_poller
+
+
+def rss_bytes() -> int:
+    """Resident memory of the process, the peak one where /proc is not available"""
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a task sleeping for a fixed interval"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.lags_ms: list[float] = []
+        self.task: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags_ms.append(max(0.0, time.perf_counter() - started_at - self.interval) * 1000)
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+
+
+class Session:
+    """A browser tab navigating between the home page and execution detail pages"""
+
+    def __init__(self, create_user, execution_ids: list[str], think_time: float, rng: random.Random):
+        self.user = create_user()
+        self.execution_ids = execution_ids
+        self.think_time = think_time
+        self.rng = rng
+        self.latencies_ms: dict[str, list[float]] = defaultdict(list)
+        self.errors = 0
+
+    async def open(self, page: str, path: str) -> None:
+        # Leaving a page closes its client, like navigating away in a browser
+        if self.user.client is not None:
+            self.user.client.delete()
+
+        started_at = time.perf_counter()
+        try:
+            await self.user.open(path)
+        except Exception:
+            self.errors += 1
+            return
+        self.latencies_ms[page].append((time.perf_counter() - started_at) * 1000)
+
+    async def run(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            await self.open("home", "/")
+            execution_id = self.rng.choice(self.execution_ids)
+            await self.open("detail", f"/execution/{STEP_FUNCTION_NAME}/{execution_id}")
+            await asyncio.sleep(min(self.rng.uniform(0.5, 1.5) * self.think_time, max(0, deadline - time.monotonic())))
+
+
+async def progress_running_executions(backend: Backend, execution_arns: list[str], events_per_second: int) -> None:
+    """Keep adding history events to the running executions, so that polling them finds changes"""
+    while True:
+        await asyncio.sleep(1)
+        for execution_arn in execution_arns:
+            backend.sfn.append_events(execution_arn, events_per_second)
+
+
+async def run_load_test(args: argparse.Namespace) -> dict:
+    backend = Backend(args.executions, args.events, args.objects)
+    execution_poller.interval = args.poll_interval
+    rng = random.Random(args.seed)  # noqa: S311
+
+    recent = range(args.executions - 1, max(-1, args.executions - 1 - args.recent_executions), -1)
+    execution_arns = [backend.execution_arn(i) for i in recent]
+    execution_ids = [arn.rsplit(":", maxsplit=1)[-1] for arn in execution_arns]
+    running_arns = [arn for i, arn in zip(recent, execution_arns, strict=True) if backend.sfn.status(i) == "RUNNING"]
+
+    async with running_app() as create_user:
+        gc.collect()
+        rss_before = rss_bytes()
+        calls_before = backend.api_calls()
+        monitor = LoopLagMonitor()
+        monitor.start()
+        progress = asyncio.create_task(progress_running_executions(backend, running_arns, args.events_per_second))
+
+        started_at = time.monotonic()
+        deadline = started_at + args.ramp_up + args.duration
+        sessions = [
+            Session(create_user, execution_ids, args.think_time, random.Random(rng.random()))  # noqa: S311
+            for _ in range(args.sessions)
+        ]
+
+        async def start_session(session: Session, delay: float) -> None:
+            await asyncio.sleep(delay)
+            await session.run(deadline)
+
+        peak_rss = rss_before
+        runs = asyncio.gather(
+            *(start_session(session, args.ramp_up * i / max(1, args.sessions)) for i, session in enumerate(sessions))
+        )
+        while not runs.done():
+            await asyncio.wait([runs], timeout=1)
+            peak_rss = max(peak_rss, rss_bytes())
+        await runs
+
+        elapsed = time.monotonic() - started_at
+        api_calls = backend.api_calls() - calls_before
+        gc.collect()
+        rss_after = rss_bytes()
+        open_clients = sum(1 for client in Client.instances.values() if not client.shared)
+        watchers = len(execution_poller.watchers)
+        progress.cancel()
+        monitor.stop()
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    for session in sessions:
+        for page, values in session.latencies_ms.items():
+            latencies[page].extend(values)
+
+    return {
+        "pages": {
+            page: {
+                "loads": len(values),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(max(values), 2),
+            }
+            for page, values in sorted(latencies.items())
+        },
+        "errors": sum(session.errors for session in sessions),
+        "event_loop_lag": {
+            "p50_ms": round(percentile(monitor.lags_ms, 50), 2),
+            "p99_ms": round(percentile(monitor.lags_ms, 99), 2),
+            "max_ms": round(max(monitor.lags_ms), 2),
+        },
+        "memory": {
+            "rss_before_mb": round(rss_before / 2**20, 1),
+            "rss_peak_mb": round(peak_rss / 2**20, 1),
+            "rss_after_mb": round(rss_after / 2**20, 1),
+            "per_session_mb": round((rss_after - rss_before) / 2**20 / args.sessions, 2),
+            "open_clients": open_clients,
+            "execution_watchers": watchers,
+        },
+        "aws": {
+            "calls_per_second": round(sum(api_calls.values()) / elapsed, 2),
+            "per_operation": {operation: round(count / elapsed, 2) for operation, count in sorted(api_calls.items())},
+        },
+        "elapsed_s": round(elapsed, 1),
+    }
+
+
+def print_report(report: dict) -> None:
+    lines = [f"{'page':<10}{'loads':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    lines.extend(
+        f"{page:<10}{result['loads']:>8}{result['p50_ms']:>10}{result['p99_ms']:>10}{result['max_ms']:>10}"
+        for page, result in report["pages"].items()
+    )
+    lag, memory, aws = report["event_loop_lag"], report["memory"], report["aws"]
+    lines += [
+        f"errors: {report['errors']}",
+        f"event loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms",
+        (
+            f"memory: {memory['rss_before_mb']} MB before, {memory['rss_peak_mb']} MB peak, "
+            f"{memory['per_session_mb']} MB per session ({memory['open_clients']} clients, "
+            f"{memory['execution_watchers']} execution watchers)"
+        ),
+        (
+            f"AWS calls per second: {aws['calls_per_second']} "
+            f"({', '.join(f'{operation}={rate}' for operation, rate in aws['per_operation'].items())})"
+        ),
+    ]
+    print("\n".join(lines))  # noqa: T201
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=30, help="Concurrent browser sessions")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of load once every session started")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Seconds over which the sessions are started")
+    parser.add_argument("--think-time", type=float, default=15, help="Average seconds a detail page stays open")
+    parser.add_argument("--poll-interval", type=float, default=execution_poller.interval, help="Base seconds between polls")
+    parser.add_argument("--recent-executions", type=int, default=200, help="Executions the sessions pick from")
+    parser.add_argument("--events-per-second", type=int, default=2, help="Events added to running executions")
+    parser.add_argument("--executions", type=int, default=10_000, help="Executions of the state machine")
+    parser.add_argument("--events", type=int, default=2_000, help="History events of each execution")
+    parser.add_argument("--objects", type=int, default=1_000, help="Objects generated by each execution")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the sessions' random choices")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:  # noqa: PTH123
+            json.dump({"parameters": vars(args), **report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
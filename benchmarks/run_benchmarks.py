@@ -0,0 +1,208 @@
+"""
+Benchmark the home page, its refresh, the execution detail page and the execution poller against the fake
+AWS backend, reporting latency and AWS API calls per scenario.
+
+    python benchmarks/run_benchmarks.py --executions 100000 --events 25000 --objects 50000 --json results.json
+    python benchmarks/run_benchmarks.py --baseline results.json  # exits with 1 on regression
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from harness import STEP_FUNCTION_NAME, Backend, find_viewer, percentile, running_app, wait_for_background_tasks
+from home import StepFunctionViewer
+from utils.execution_poller import execution_poller, fetch_snapshot
+from utils.singleflight import AWS_CALL_CACHE_TTL
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    api_calls: dict[str, int] = field(default_factory=dict)  # per run, from the last run
+
+    @property
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "min_ms": round(latencies[0], 2),
+            "median_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "runs": len(latencies),
+            "api_calls": self.api_calls,
+            "api_calls_total": sum(self.api_calls.values()),
+        }
+
+
+async def measure(
+    name: str,
+    backend: Backend,
+    run: Callable[[], Awaitable[None]],
+    repeat: int,
+    setup: Callable[[], Awaitable[None] | None] | None = None,
+) -> ScenarioResult:
+    """Run a scenario `repeat` times, recording the latency and the API calls of each run"""
+    result = ScenarioResult(name)
+    for _ in range(repeat):
+        if setup:
+            prepared = setup()
+            if asyncio.iscoroutine(prepared):
+                await prepared
+        calls_before = backend.api_calls()
+        started_at = time.perf_counter()
+        await run()
+        result.latencies_ms.append((time.perf_counter() - started_at) * 1000)
+        result.api_calls = dict(sorted((backend.api_calls() - calls_before).items()))
+    return result
+
+
+async def run_scenarios(args: argparse.Namespace) -> dict[str, dict]:
+    backend = Backend(args.executions, args.events, args.objects)
+    # Poll ticks are measured explicitly; keep the watchers of the opened detail pages quiet
+    execution_poller.interval = execution_poller.min_interval = execution_poller.max_interval = 3600
+
+    newest = args.executions - 1
+    terminal_execution = next(i for i in range(newest, -1, -1) if backend.sfn.status(i) == "SUCCEEDED")
+    running_execution = next(i for i in range(newest, -1, -1) if backend.sfn.status(i) == "RUNNING")
+    results: list[ScenarioResult] = []
+
+    async with running_app() as create_user:
+        user = create_user()
+
+        async def open_home() -> None:
+            await user.open("/")
+            await wait_for_background_tasks("revalidate ")
+
+        async def render_home() -> None:
+            await user.open("/")
+
+        async def settle() -> None:
+            await wait_for_background_tasks("revalidate ")
+
+        async def settle_and_reset() -> None:
+            await settle()
+            # Concurrent users share the calls to AWS for the call cache TTL of the app, as in production
+            backend.reset(call_cache_ttl=AWS_CALL_CACHE_TTL)
+
+        results.append(await measure("home_load_cold", backend, open_home, args.repeat, setup=backend.reset))
+        results.append(await measure("home_load_warm", backend, open_home, args.repeat))
+        # Time to render the cached snapshot, before its revalidation
+        results.append(await measure("home_render_cached", backend, render_home, args.repeat, setup=settle))
+
+        concurrent_users = [create_user() for _ in range(args.concurrent_users)]
+
+        async def open_home_concurrently() -> None:
+            await asyncio.gather(*(concurrent_user.open("/") for concurrent_user in concurrent_users))
+
+        results.append(
+            await measure("home_load_concurrent", backend, open_home_concurrently, args.repeat, setup=settle_and_reset)
+        )
+        await settle()
+        backend.aws_manager.single_flight.ttl = 0
+        backend.aws_manager.single_flight.clear()
+
+        viewer = find_viewer(user, StepFunctionViewer)
+
+        async def refresh() -> None:
+            await viewer.refresh_all()
+
+        def add_executions() -> None:
+            backend.sfn.add_executions(args.new_executions)
+
+        results.append(await measure("home_refresh_idle", backend, refresh, args.repeat))
+        results.append(await measure("home_refresh_new_executions", backend, refresh, args.repeat, add_executions))
+
+        async def open_detail() -> None:
+            execution_id = backend.execution_arn(terminal_execution).split(":")[-1]
+            await user.open(f"/execution/{STEP_FUNCTION_NAME}/{execution_id}")
+            await wait_for_background_tasks("files ")
+
+        results.append(await measure("detail_load_cold", backend, open_detail, args.repeat, setup=backend.reset))
+        results.append(await measure("detail_load_warm", backend, open_detail, args.repeat))
+
+        def restart() -> None:
+            backend.reset(backend.aws_manager.detail_cache)
+
+        results.append(await measure("detail_load_restarted", backend, open_detail, args.repeat, setup=restart))
+
+        running_arn = backend.execution_arn(running_execution)
+
+        async def poll_tick() -> None:
+            await fetch_snapshot(running_arn)
+
+        def append_events() -> None:
+            backend.sfn.append_events(running_arn, args.new_events)
+
+        await fetch_snapshot(running_arn)
+        results.append(await measure("poll_tick_idle", backend, poll_tick, args.repeat))
+        results.append(await measure("poll_tick_new_events", backend, poll_tick, args.repeat, append_events))
+
+    return {result.name: result.summary for result in results}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """List the scenarios slower than the baseline by more than the tolerance, or making more API calls"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: median {previous['median_ms']} ms -> {result['median_ms']} ms")
+        if result["api_calls_total"] > previous["api_calls_total"]:
+            regressions.append(f"{name}: API calls {previous['api_calls_total']} -> {result['api_calls_total']}")
+    return regressions
+
+
+def print_table(results: dict[str, dict]) -> None:
+    print(f"{'scenario':<30}{'min ms':>10}{'median ms':>12}{'p95 ms':>10}{'API calls':>11}  calls per operation")  # noqa: T201
+    for name, result in results.items():
+        operations = ", ".join(f"{operation}={count}" for operation, count in result["api_calls"].items())
+        print(  # noqa: T201
+            f"{name:<30}{result['min_ms']:>10}{result['median_ms']:>12}{result['p95_ms']:>10}"
+            f"{result['api_calls_total']:>11}  {operations}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--executions", type=int, default=10_000, help="Executions of the state machine")
+    parser.add_argument("--events", type=int, default=25_000, help="History events of each execution")
+    parser.add_argument("--objects", type=int, default=50_000, help="Objects generated by each execution")
+    parser.add_argument("--new-executions", type=int, default=5, help="Executions started before each refresh")
+    parser.add_argument("--new-events", type=int, default=20, help="Events added before each poll tick")
+    parser.add_argument("--concurrent-users", type=int, default=10, help="Users opening the home page at once")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each scenario")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare the results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed median latency increase")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results = asyncio.run(run_scenarios(args))
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:  # noqa: PTH123
+            json.dump({"parameters": vars(args), "scenarios": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:  # noqa: PTH123
+            baseline = json.load(f)["scenarios"]
+        if regressions := compare(results, baseline, args.tolerance):
+            print("\nRegressions against the baseline:")  # noqa: T201
+            print("\n".join(f"  {regression}" for regression in regressions))  # noqa: T201
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())